@@ -0,0 +1,72 @@
+from saport.integer.branching import (FirstFractionalBranching, MostFractionalBranching, PseudoCostBranching,
+                                      StrongBranching)
+from saport.integer.model import Model
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.integer_linear_relaxation import IntegerLinearRelaxationSolver
+from typing import Callable, Dict, List
+import os
+import time
+
+# branching rules: name -> factory
+BRANCHINGS: Dict[str, Callable] = {
+    "first fractional": FirstFractionalBranching,
+    "most fractional": MostFractionalBranching,
+    "pseudo-cost": PseudoCostBranching,
+    "strong": StrongBranching,
+}
+
+
+class BranchingBenchmark:
+    """
+        Compares the branching rules of the branch and bound on the integer programs derived from the knapsack problems.
+        Reports the node counts, the simplex pivots (including the ones spent by the probes),
+        the number of the probes and the time.
+    """
+    def __init__(self,
+                 problems: List[str],
+                 branchings: Dict[str, Callable] = BRANCHINGS,
+                 timelimit: int = 60,
+                 print_function: Callable = print,
+                 problems_dir: str = "knapsack_problems"):
+        self.problems = problems
+        self.branchings = branchings
+        self.timelimit = timelimit
+        self.print_function = print_function
+        self.problems_dir = problems_dir
+
+    def print_table(self, table_to_print):
+        def cell(x, w):
+            return '{0: >{1}}'.format(x, w)
+
+        longest_value = max([len(s) for row in table_to_print for s in row])
+        formatted_table_to_print = [[cell(v, longest_value) for v in row] for row in table_to_print]
+
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+        for row in formatted_table_to_print:
+            self.print_function(" | ".join(row))
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+
+    def knapsack_model(self, problem_name: str) -> Model:
+        problem = Problem.from_path(os.path.join(self.problems_dir, problem_name))
+        return IntegerLinearRelaxationSolver(problem, self.timelimit)._create_model()
+
+    def run(self):
+        results = [["<problem>", "<branching>", "value", "nodes", "pivots", "probes", "time"]]
+        for p in self.problems:
+            self.print_function(f"* going for {p}", end='\r')
+            model = self.knapsack_model(p)
+            for (name, branching) in self.branchings.items():
+                rule = branching()
+                solver = LinearRelaxationSolver(branching=rule)
+                start = time.perf_counter()
+                solution = solver.solve(model, self.timelimit)
+                elapsed = time.perf_counter() - start
+                value = f'{"*" if solution.is_optimal else ""}{solution.objective_value()}'
+                results.append([p, name, value, str(solver.nodes), str(solver.lp_pivots),
+                                str(getattr(rule, "probes", 0)), f"{elapsed:.4f}s"])
+        self.print_table(results)
+
+
+if __name__ == "__main__":
+    BranchingBenchmark(["ks_4_0", "ks_19_0", "ks_lecture_dp_1", "ks_lecture_dp_2"]).run()
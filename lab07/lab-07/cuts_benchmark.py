@@ -0,0 +1,91 @@
+from saport.integer.model import Model
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.integer_implicit_enumeration import IntegerImplicitEnumerationSolver
+from saport.knapsack.solvers.integer_linear_relaxation import IntegerLinearRelaxationSolver
+from typing import Callable, Dict, List
+import os
+import time
+
+# solver configurations: name -> (root rounds, node rounds)
+CONFIGURATIONS: Dict[str, tuple] = {
+    "branching": (0, 0),
+    "root cuts": (10, 0),
+    "branch and cut": (10, 2),
+}
+
+
+class CutsBenchmark:
+    """
+        Compares the plain branch and bound with the cuts at the root and at the nodes
+        on the integer programs derived from the knapsack problems.
+        Reports the root bound after every round of the cuts,
+        the fraction of the root integrality gap closed by the cuts
+        and the node count reduction of every configuration.
+        With `boolean` the problems are stated as the boolean models,
+        so the lifted cover inequalities are generated too.
+    """
+    def __init__(self,
+                 problems: List[str],
+                 configurations: Dict[str, tuple] = CONFIGURATIONS,
+                 timelimit: int = 60,
+                 print_function: Callable = print,
+                 problems_dir: str = "knapsack_problems",
+                 boolean: bool = False):
+        self.problems = problems
+        self.configurations = configurations
+        self.boolean = boolean
+        self.timelimit = timelimit
+        self.print_function = print_function
+        self.problems_dir = problems_dir
+
+    def print_table(self, table_to_print):
+        def cell(x, w):
+            return '{0: >{1}}'.format(x, w)
+
+        longest_value = max([len(s) for row in table_to_print for s in row])
+        formatted_table_to_print = [[cell(v, longest_value) for v in row] for row in table_to_print]
+
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+        for row in formatted_table_to_print:
+            self.print_function(" | ".join(row))
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+
+    def knapsack_model(self, problem_name: str) -> Model:
+        problem = Problem.from_path(os.path.join(self.problems_dir, problem_name))
+        if self.boolean:
+            return IntegerImplicitEnumerationSolver(problem, self.timelimit)._create_model()
+        return IntegerLinearRelaxationSolver(problem, self.timelimit)._create_model()
+
+    def run(self):
+        results = [["<problem>", "<config>", "value", "nodes", "reduction", "gap closed", "time"]]
+        rounds = [["<problem>", "<round>", "bound", "improvement", "cuts", "covers", "removed"]]
+        for p in self.problems:
+            self.print_function(f"* going for {p}", end='\r')
+            model = self.knapsack_model(p)
+            baseline_nodes = None
+            for (name, (cut_rounds, node_cut_rounds)) in self.configurations.items():
+                solver = LinearRelaxationSolver(cut_rounds=cut_rounds, node_cut_rounds=node_cut_rounds)
+                start = time.perf_counter()
+                solution = solver.solve(model, self.timelimit)
+                elapsed = time.perf_counter() - start
+                baseline_nodes = solver.nodes if baseline_nodes is None else baseline_nodes
+                closed = solver.root_gap_closed()
+                value = f'{"*" if solution.is_optimal else ""}{solution.objective_value()}'
+                results.append([p, name, value, str(solver.nodes), f"{1 - solver.nodes / baseline_nodes:.0%}",
+                                "--" if closed is None else f"{closed:.0%}", f"{elapsed:.4f}s"])
+                if cut_rounds > 0 and node_cut_rounds == 0:
+                    # the knapsack models are maximized,
+                    # so the first round lowers the relaxation bound by its improvement
+                    first = solver.cut_statistics[0]
+                    rounds.append([p, "0", f"{first.bound + first.improvement:.2f}", "--", "--", "--", "--"])
+                    rounds += [[p, str(i + 1), f"{r.bound:.2f}", f"{r.improvement:.2f}",
+                                str(r.added), str(r.covers), str(r.removed)]
+                               for (i, r) in enumerate(solver.cut_statistics)]
+        self.print_table(rounds)
+        self.print_table(results)
+
+
+if __name__ == "__main__":
+    CutsBenchmark(["ks_4_0", "ks_19_0", "ks_lecture_dp_1", "ks_lecture_dp_2"]).run()
+    CutsBenchmark(["ks_4_0", "ks_19_0", "ks_lecture_dp_1", "ks_lecture_dp_2"], boolean=True).run()
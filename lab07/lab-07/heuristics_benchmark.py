@@ -0,0 +1,77 @@
+from saport.integer.heuristics import default_heuristics
+from saport.integer.model import Model
+from saport.integer.nodes import BestBoundSelection, DepthFirstSelection
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.integer_linear_relaxation import IntegerLinearRelaxationSolver
+from typing import Callable, Dict, List
+import os
+import time
+
+# node selection rules: name -> factory
+SELECTIONS: Dict[str, Callable] = {
+    "depth first": DepthFirstSelection,
+    "best bound": BestBoundSelection,
+}
+
+
+class HeuristicsBenchmark:
+    """
+        Compares the branch and bound with and without the primal heuristics
+        on the integer programs derived from the knapsack problems.
+        Reports when the first incumbent was found, the node counts and, for every heuristic,
+        how many incumbents it has found and how many nodes were pruned by them.
+    """
+    def __init__(self,
+                 problems: List[str],
+                 selections: Dict[str, Callable] = SELECTIONS,
+                 timelimit: int = 60,
+                 print_function: Callable = print,
+                 problems_dir: str = "knapsack_problems"):
+        self.problems = problems
+        self.selections = selections
+        self.timelimit = timelimit
+        self.print_function = print_function
+        self.problems_dir = problems_dir
+
+    def print_table(self, table_to_print):
+        def cell(x, w):
+            return '{0: >{1}}'.format(x, w)
+
+        longest_value = max([len(s) for row in table_to_print for s in row])
+        formatted_table_to_print = [[cell(v, longest_value) for v in row] for row in table_to_print]
+
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+        for row in formatted_table_to_print:
+            self.print_function(" | ".join(row))
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+
+    def knapsack_model(self, problem_name: str) -> Model:
+        problem = Problem.from_path(os.path.join(self.problems_dir, problem_name))
+        return IntegerLinearRelaxationSolver(problem, self.timelimit)._create_model()
+
+    def run(self):
+        results = [["<problem>", "<selection>", "heuristics", "value", "first found", "nodes", "time"]]
+        statistics = [["<problem>", "<selection>", "<heuristic>", "calls", "found", "incumbents", "pruned", "time"]]
+        for p in self.problems:
+            self.print_function(f"* going for {p}", end='\r')
+            model = self.knapsack_model(p)
+            for (name, selection) in self.selections.items():
+                for heuristics in [None, default_heuristics()]:
+                    solver = LinearRelaxationSolver(selection(), heuristics=heuristics)
+                    start = time.perf_counter()
+                    solution = solver.solve(model, self.timelimit)
+                    elapsed = time.perf_counter() - start
+                    first = solver.incumbents[0] if len(solver.incumbents) > 0 else None
+                    value = f'{"*" if solution.is_optimal else ""}{solution.objective_value()}'
+                    results.append([p, name, "yes" if heuristics else "no", value,
+                                    "--" if first is None else f"{first.node} ({first.source})", str(solver.nodes),
+                                    f"{elapsed:.4f}s"])
+                    statistics += [[p, name, h, str(s.calls), str(s.solutions), str(s.incumbents), str(s.pruned),
+                                    f"{s.time:.4f}s"] for (h, s) in solver.heuristic_statistics.items()]
+        self.print_table(statistics)
+        self.print_table(results)
+
+
+if __name__ == "__main__":
+    HeuristicsBenchmark(["ks_4_0", "ks_19_0", "ks_lecture_dp_1", "ks_lecture_dp_2"]).run()
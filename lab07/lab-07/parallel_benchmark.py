@@ -0,0 +1,74 @@
+from saport.integer.model import Model
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.integer.solvers.parallel_linear_relaxation import ParallelLinearRelaxationSolver
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.integer_linear_relaxation import IntegerLinearRelaxationSolver
+from typing import Callable, List
+import os
+import time
+
+
+class ParallelBenchmark:
+    """
+        Compares the sequential branch and bound with the parallel one (for every number of workers)
+        on the integer programs derived from the knapsack problems.
+        The speedup is the ratio of the sequential wall time to the parallel one,
+        it depends on the number of the available CPUs and on the cost of a node relaxation,
+        for the tiny models the communication with the workers dominates.
+    """
+    def __init__(self,
+                 problems: List[str],
+                 workers: List[int] = [1, 2, 4],
+                 deterministic: bool = False,
+                 timelimit: int = 60,
+                 print_function: Callable = print,
+                 problems_dir: str = "knapsack_problems"):
+        self.problems = problems
+        self.workers = workers
+        self.deterministic = deterministic
+        self.timelimit = timelimit
+        self.print_function = print_function
+        self.problems_dir = problems_dir
+
+    def print_table(self, table_to_print):
+        def cell(x, w):
+            return '{0: >{1}}'.format(x, w)
+
+        longest_value = max([len(s) for row in table_to_print for s in row])
+        formatted_table_to_print = [[cell(v, longest_value) for v in row] for row in table_to_print]
+
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+        for row in formatted_table_to_print:
+            self.print_function(" | ".join(row))
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+
+    def knapsack_model(self, problem_name: str) -> Model:
+        problem = Problem.from_path(os.path.join(self.problems_dir, problem_name))
+        return IntegerLinearRelaxationSolver(problem, self.timelimit)._create_model()
+
+    def run(self):
+        header = ["<problem>", "<workers>", "value", "nodes", "time", "speedup"]
+        table_to_print = [header]
+        for p in self.problems:
+            self.print_function(f"* going for {p}", end='\r')
+            model = self.knapsack_model(p)
+            sequential = LinearRelaxationSolver()
+            start = time.perf_counter()
+            solution = sequential.solve(model, self.timelimit)
+            sequential_time = time.perf_counter() - start
+            value = f'{"*" if solution.is_optimal else ""}{solution.objective_value()}'
+            table_to_print.append([p, "--", value, str(sequential.nodes), f"{sequential_time:.4f}s", "1.00"])
+
+            for workers in self.workers:
+                parallel = ParallelLinearRelaxationSolver(workers, self.deterministic)
+                start = time.perf_counter()
+                solution = parallel.solve(model, self.timelimit)
+                parallel_time = time.perf_counter() - start
+                value = f'{"*" if solution.is_optimal else ""}{solution.objective_value()}'
+                table_to_print.append([p, str(workers), value, str(parallel.nodes), f"{parallel_time:.4f}s",
+                                       f"{sequential_time / parallel_time:.2f}"])
+        self.print_table(table_to_print)
+
+
+if __name__ == "__main__":
+    ParallelBenchmark(["ks_4_0", "ks_19_0", "ks_lecture_dp_1", "ks_lecture_dp_2"]).run()
@@ -0,0 +1,81 @@
+from saport.simplex import generators
+from saport.simplex.model import Model
+from saport.simplex.solver import Solver
+from saport.simplex.tableau import Tableau
+from typing import Callable, List, Tuple
+import numpy as np
+import time
+
+
+class PrecisionBenchmark:
+    """
+        Compares the throughput and the accuracy of the simplex solver working in different precisions.
+        Every dtype is benchmarked on the random dense LPs of the given sizes (constraints, variables):
+        the raw pivot throughput on the tableau of that size, the full solve time,
+        the number of pivots and the error of the objective value before the float64 refinement.
+    """
+    def __init__(self,
+                 sizes: List[Tuple[int, int]],
+                 dtypes: List[np.dtype] = [np.float64, np.float32],
+                 pivots: int = 200,
+                 seed: int = 0,
+                 print_function: Callable = print):
+        self.sizes = sizes
+        self.dtypes = [np.dtype(d) for d in dtypes]
+        self.pivots = pivots
+        self.seed = seed
+        self.print_function = print_function
+
+    def print_table(self, table_to_print):
+        def cell(x, w):
+            return '{0: >{1}}'.format(x, w)
+
+        longest_value = max([len(s) for row in table_to_print for s in row])
+        formatted_table_to_print = [[cell(v, longest_value) for v in row] for row in table_to_print]
+
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+        for row in formatted_table_to_print:
+            self.print_function(" | ".join(row))
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+
+    def dense_model(self, constraints_n: int, variables_n: int) -> Model:
+        return generators.dense_lp(constraints_n, variables_n, self.seed)
+
+    def pivot_throughput(self, constraints_n: int, variables_n: int, dtype: np.dtype) -> float:
+        rng = np.random.default_rng(self.seed)
+        table = rng.uniform(1.0, 2.0, (constraints_n + 1, variables_n + constraints_n + 1)).astype(dtype)
+        tableau = Tableau(None, table)
+        start = time.perf_counter()
+        for i in range(self.pivots):
+            tableau.pivot(1 + i % constraints_n, i % (variables_n + constraints_n))
+        return self.pivots / (time.perf_counter() - start)
+
+    def run(self):
+        header = ["<size>", "<dtype>", "pivots/s", "solve time", "pivots", "refinement", "error"]
+        table_to_print = [header]
+        for (constraints_n, variables_n) in self.sizes:
+            self.print_function(f"* going for {constraints_n}x{variables_n}", end='\r')
+            reference = None
+            for dtype in self.dtypes:
+                throughput = self.pivot_throughput(constraints_n, variables_n, dtype)
+                solver = Solver(dtype=dtype)
+                model = self.dense_model(constraints_n, variables_n)
+                start = time.perf_counter()
+                solution = solver.solve(model)
+                solve_time = time.perf_counter() - start
+                if reference is None:
+                    reference = Solver().solve(model).objective_value()
+
+                # the error of the low precision solve, i.e. the objective value of its basis before the refinement
+                low_precision = Solver(dtype=dtype, refine=False)
+                error = abs(low_precision.solve(model).objective_value() - reference)
+                table_to_print.append([
+                    f"{constraints_n}x{variables_n}", dtype.name, f"{throughput:.0f}", f"{solve_time:.4f}s",
+                    str(solver.pivots),
+                    str(solver.refinement_pivots), f"{error:.2e}"
+                ])
+        self.print_table(table_to_print)
+
+
+if __name__ == "__main__":
+    PrecisionBenchmark([(50, 30), (200, 100), (800, 200)]).run()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List
+import time
+
+import numpy as np
+
+import saport.simplex.matrix as ssmat
+import saport.simplex.model as ssmod
+import saport.simplex.solver as ssslv
+import saport.simplex.solution as sssol
+import saport.simplex.tableau as sstab
+import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.objective as sseobj
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    A dataclass representing a column of the master problem.
+
+    Attributes
+    ----------
+    cost : float
+        objective coefficient of the column
+    coefficients : List[float]
+        coefficients of the column, one per master constraint (in the master constraints order)
+    name : str
+        optional name of the variable created for the column
+    """
+    cost: float
+    coefficients: List[float]
+    name: str = None
+
+
+class PricingOracle(ABC):
+    """
+    A pricing problem of the column generation.
+
+    Methods:
+    --------
+    __call__(duals : np.ndarray) -> List[Column]:
+        given the dual prices of the master constraints returns candidate columns,
+        the driver keeps only those with an improving reduced cost
+    """
+
+    @abstractmethod
+    def __call__(self, duals: np.ndarray) -> List[Column]:
+        '''Override this method, it should return the most promising columns for the given duals'''
+
+
+class ColumnGenerationSolver:
+    """
+        A column generation driver for linear programs with too many columns to enumerate.
+
+        The restricted master is solved once with the simplex solver, then the improving columns
+        are appended to its final tableau and the primal simplex continues from the previous basis.
+
+        Attributes
+        ----------
+        master : Model
+            restricted master problem, every generated column is added to it as a new variable
+        oracle : PricingOracle
+            pricing problem returning new columns for the given duals
+        max_iterations : int
+            maximal number of the master iterations
+        iterations : int
+            how many times the master has been (re)optimized
+        generated : List[Variable]
+            master variables created for the generated columns
+        master_time : float
+            how long it took to solve the master problems
+        pricing_time : float
+            how long it took to solve the pricing problems
+        total_time : float
+            how long it took to solve the problem
+
+        Methods
+        -------
+        __init__(master: Model, oracle: PricingOracle, max_iterations: int = 1000) -> ColumnGenerationSolver:
+            constructs a new driver for the given restricted master and pricing oracle
+        solve() -> Solution:
+            generates columns until none of them has an improving reduced cost and returns the master solution
+        duals() -> np.ndarray:
+            returns dual prices of the master constraints for the current basis,
+            for a minimization master column improves the solution iff `cost - duals @ coefficients < 0`
+    """
+    master: ssmod.Model
+    oracle: PricingOracle
+    generated: List[sseexp.Variable]
+
+    def __init__(self, master: ssmod.Model, oracle: PricingOracle, max_iterations: int = 1000):
+        self.master = master
+        self.oracle = oracle
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.generated = []
+        self.master_time = 0.0
+        self.pricing_time = 0.0
+        self.total_time = None
+
+    def solve(self) -> sssol.Solution:
+        start_time = time.time()
+        solution = self._solve_initial_master()
+        if solution.has_assignment():
+            solution = self._generate_columns(solution)
+        self.total_time = time.time() - start_time
+        return solution
+
+    def duals(self) -> np.ndarray:
+        basis = self._tableau.extract_basis()
+        basis_matrix, artificial = ssmat.basis_matrix(self._matrix, basis)
+        # the redundant master constraints get a zero price
+        basic_costs = np.where(artificial, 0.0, self._costs[basis])
+        max_duals = np.linalg.solve(basis_matrix.T, basic_costs)
+        return max_duals * self._row_signs * self._objective_sign
+
+    def _solve_initial_master(self) -> sssol.Solution:
+        start_time = time.time()
+        self.master.simplify()
+        self._lpsolver = ssslv.Solver()
+        solution = self._lpsolver.solve(self.master)
+        self.iterations = 1
+        self.master_time += time.time() - start_time
+
+        self._initial_tableau = solution.initial_tableau
+        self._tableau = solution.tableau
+        augmented_model = self._tableau.model
+        self._matrix = np.array([c.expression.coefficients(augmented_model) for c in augmented_model.constraints])
+        self._costs = np.array(augmented_model.objective.expression.coefficients(augmented_model))
+        self._row_signs = np.array([-1.0 if c.bound < 0 else 1.0 for c in self.master.constraints])
+        self._objective_sign = -1.0 if self.master.objective.type == sseobj.ObjectiveType.MIN else 1.0
+        self._columns = list(range(len(self.master.variables)))
+        return solution
+
+    def _generate_columns(self, solution: sssol.Solution) -> sssol.Solution:
+        while self.iterations < self.max_iterations:
+            duals = self.duals()
+            start_time = time.time()
+            candidates = self.oracle(duals)
+            self.pricing_time += time.time() - start_time
+
+            start_time = time.time()
+            added = [c for c in candidates if self._append_column(c, duals)]
+            if len(added) == 0:
+                self.master_time += time.time() - start_time
+                break
+
+            bounded = self._lpsolver._optimize(self._tableau)
+            self.iterations += 1
+            self.master_time += time.time() - start_time
+            if not bounded:
+                return sssol.Solution.unbounded(self.master, self._initial_tableau, self._tableau)
+
+        return self._master_solution()
+
+    def _append_column(self, column: Column, duals: np.ndarray) -> bool:
+        """
+            _append_column(column: Column, duals: np.ndarray) -> bool:
+                adds the column to the master and its tableau if it has an improving reduced cost
+                appending a column doesn't change the basis, so the duals stay valid for the whole pricing round
+        """
+        augmented_column = np.array(column.coefficients, dtype=float) * self._row_signs
+        augmented_cost = column.cost * self._objective_sign
+        reduced_cost = self._objective_sign * (column.cost - duals @ np.array(column.coefficients, dtype=float))
+        if reduced_cost <= sstab.eps:
+            return False
+
+        basis_matrix, _ = ssmat.basis_matrix(self._matrix, self._tableau.extract_basis())
+        tableau_column = np.linalg.solve(basis_matrix, augmented_column)
+        table = self._tableau.table
+        self._tableau.table = np.insert(table, table.shape[1] - 1, [-reduced_cost] + list(tableau_column), axis=1)
+        self._matrix = np.column_stack([self._matrix, augmented_column])
+        self._costs = np.append(self._costs, augmented_cost)
+
+        name = column.name if column.name is not None else f"c{len(self.generated)}"
+        var = self.master.create_variable(name)
+        self._add_variable_to_model(self.master, var, column.cost, column.coefficients)
+        augmented_model = self._tableau.model
+        augmented_var = augmented_model.create_variable(name)
+        self._add_variable_to_model(augmented_model, augmented_var, augmented_cost, augmented_column)
+
+        self._columns.append(augmented_var.index)
+        self.generated.append(var)
+        return True
+
+    def _add_variable_to_model(self, model: ssmod.Model, var: sseexp.Variable, cost: float, coefficients: List[float]):
+        model.objective.expression = model.objective.expression + cost * var
+        for constraint, coeff in zip(model.constraints, coefficients):
+            if coeff != 0:
+                constraint.expression = constraint.expression + coeff * var
+
+    def _master_solution(self) -> sssol.Solution:
+        tableau_assignment = self._tableau.extract_assignment()
+        assignment = [tableau_assignment[c] for c in self._columns]
+        return sssol.Solution.with_assignment(self.master, assignment, self._initial_tableau, self._tableau)
@@ -0,0 +1,305 @@
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Tuple
+import time
+
+import numpy as np
+
+import saport.simplex.model as ssmod
+import saport.simplex.solution as sssol
+import saport.simplex.expressions.constraint as ssecon
+import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.objective as sseobj
+from saport.decomposition.column_generation import Column, ColumnGenerationSolver, PricingOracle
+from saport.simplex.tableau import eps
+
+
+class UnboundedBlockError(Exception):
+
+    def __init__(self, block: int) -> None:
+        super().__init__(
+            f"Block {block} is unbounded, only bounded blocks are supported by the Dantzig-Wolfe decomposition.")
+        self.block = block
+
+
+class Block:
+    """
+        A class to represent an independent block of the block-angular linear program.
+
+        Attributes
+        ----------
+        index : int
+            index of the block
+        variables : List[int]
+            indexes of the original model variables belonging to the block
+        model : Model
+            subproblem containing only the block variables and constraints, objective is set during pricing
+        costs : np.ndarray
+            original objective coefficients of the block variables
+        linking : np.ndarray
+            coefficients of the block variables in the linking constraints
+    """
+    index: int
+    variables: List[int]
+    model: ssmod.Model
+
+    def __init__(self, index: int, variables: List[int], model: ssmod.Model, costs: np.ndarray, linking: np.ndarray):
+        self.index = index
+        self.variables = variables
+        self.model = model
+        self.costs = costs
+        self.linking = linking
+
+
+def detect_blocks(model: ssmod.Model) -> List[ssecon.Constraint]:
+    """
+        Returns the linking constraints of the model.
+        Constraints are greedily marked as linking (the one splitting the model the most, then the densest one),
+        until the rest splits into at least two blocks. If it doesn't happen before half of the constraints is marked,
+        the model is treated as a single block.
+    """
+    supports = [{a.var.index for a in c.expression.atoms if a.coefficient != 0} for c in model.constraints]
+    variables_n = len(model.variables)
+    linking = set()
+    while len(_components(supports, linking, variables_n)) < 2:
+        if 2 * (len(linking) + 1) > len(model.constraints):
+            return []
+        candidates = [i for i in range(len(supports)) if i not in linking]
+        linking.add(
+            max(candidates, key=lambda i: (len(_components(supports, linking | {i}, variables_n)), len(supports[i]))))
+    return [model.constraints[i] for i in sorted(linking)]
+
+
+def _components(supports: List[set], linking: set, variables_n: int) -> List[List[int]]:
+    parent = list(range(variables_n))
+
+    def find(v: int) -> int:
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    used = set()
+    for (i, support) in enumerate(supports):
+        if i in linking or len(support) == 0:
+            continue
+        first, *rest = support
+        used |= support
+        for v in rest:
+            parent[find(v)] = find(first)
+
+    components: Dict[int, List[int]] = dict()
+    for v in sorted(used):
+        components.setdefault(find(v), []).append(v)
+    return list(components.values())
+
+
+def _price_block(block_model: ssmod.Model, costs: List[float],
+                 objective_type: sseobj.ObjectiveType) -> Tuple[bool, bool, List[float]]:
+    """
+        Solves the block subproblem with the given objective, it has to be a module function to run in a process pool.
+        Returns (is_feasible, is_bounded, assignment).
+    """
+    block_model.objective = sseobj.Objective(sseexp.Expression.from_vectors(block_model.variables, costs),
+                                             objective_type)
+    solution = block_model.solve()
+    return (solution.is_feasible, solution.is_bounded, solution.assignment() if solution.has_assignment() else None)
+
+
+class DantzigWolfePricingOracle(PricingOracle):
+    """
+        Prices all the blocks of the Dantzig-Wolfe master, one extreme point per block.
+
+        Attributes
+        ----------
+        blocks : List[Block]
+            blocks of the decomposed model
+        executor : Executor
+            executor used to solve the subproblems, if None they are solved sequentially
+        points : Dict[str, Tuple[int, List[float]]]
+            maps master column names to the block and its extreme point
+    """
+    blocks: List[Block]
+    points: Dict[str, Tuple[int, List[float]]]
+
+    def __init__(self, blocks: List[Block], objective_type: sseobj.ObjectiveType, executor: Executor = None):
+        self.blocks = blocks
+        self.objective_type = objective_type
+        self.executor = executor
+        self.points = dict()
+
+    def __call__(self, duals: np.ndarray) -> List[Column]:
+        linking_duals = duals[:-len(self.blocks)]
+        costs = [b.costs - linking_duals @ b.linking for b in self.blocks]
+        return self.columns(costs)
+
+    def columns(self, costs: List[np.ndarray]) -> List[Column]:
+        args = ([b.model for b in self.blocks], [list(c) for c in costs], [self.objective_type] * len(self.blocks))
+        results = list(
+            self.executor.map(_price_block, *args) if self.executor is not None else map(_price_block, *args))
+
+        columns = []
+        for (block, (is_feasible, is_bounded, point)) in zip(self.blocks, results):
+            if not is_bounded:
+                raise UnboundedBlockError(block.index)
+            if not is_feasible:
+                return None
+            columns.append(self._column(block, np.array(point)))
+        return columns
+
+    def _column(self, block: Block, point: np.ndarray) -> Column:
+        name = f"l{block.index}_{len(self.points)}"
+        self.points[name] = (block.index, point)
+        convexity = [1.0 if b is block else 0.0 for b in self.blocks]
+        return Column(cost=float(block.costs @ point), coefficients=list(block.linking @ point) + convexity, name=name)
+
+
+class DantzigWolfeSolver:
+    """
+        Dantzig-Wolfe decomposition of the block-angular linear programs.
+
+        Blocks are solved independently (in a process pool), while the master problem
+        (solved with the column generation) coordinates them through the linking constraints.
+        Infeasibility of the linking constraints is handled with penalized artificial columns (big-M).
+
+        Attributes
+        ----------
+        model : Model
+            original model to be solved
+        linking : List[Constraint]
+            linking constraints, detected with `detect_blocks` if not given
+        blocks : List[Block]
+            independent blocks of the model
+        processes : int
+            number of the worker processes used to solve the blocks, 1 solves them in the current process
+        penalty : float
+            cost of the artificial columns in the master
+        column_generation : ColumnGenerationSolver
+            driver used to solve the master, contains iterations and timing statistics
+        total_time : float
+            how long it took to solve the problem
+
+        Methods
+        -------
+        __init__(model: Model, linking: List[Constraint] = None, processes: int = None,
+                 penalty: float = 1e6) -> DantzigWolfeSolver:
+            prepares the decomposition of the given model
+        solve() -> Solution:
+            solves the model and returns the solution expressed in the original variables
+    """
+    model: ssmod.Model
+    linking: List[ssecon.Constraint]
+    blocks: List[Block]
+
+    def __init__(self,
+                 model: ssmod.Model,
+                 linking: List[ssecon.Constraint] = None,
+                 processes: int = None,
+                 penalty: float = 1e6):
+        self.model = model
+        self.model.simplify()
+        self.linking = detect_blocks(model) if linking is None else linking
+        self.processes = processes
+        self.penalty = penalty
+        self.column_generation = None
+        self.total_time = None
+        self._decompose()
+
+    def solve(self) -> sssol.Solution:
+        start_time = time.time()
+        if self.processes == 1:
+            solution = self._solve(None)
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                solution = self._solve(executor)
+        self.total_time = time.time() - start_time
+        return solution
+
+    def _decompose(self):
+        matrix = np.array([c.expression.coefficients(self.model) for c in self.model.constraints])
+        self._objective = np.array(self.model.objective.expression.coefficients(self.model))
+        linking_indexes = {c.index for c in self.linking}
+        supports = [set(np.nonzero(row)[0]) for row in matrix]
+        self._linking_matrix = np.zeros((0, len(self.model.variables)))
+        if len(linking_indexes) > 0:
+            self._linking_matrix = matrix[sorted(linking_indexes)]
+
+        self.blocks = []
+        for variables in _components(supports, linking_indexes, len(self.model.variables)):
+            block_model = ssmod.Model(f"{self.model.name}[{len(self.blocks)}]")
+            block_vars = [block_model.create_variable(self.model.variables[v].name) for v in variables]
+            for constraint in self.model.constraints:
+                if constraint.index in linking_indexes or not supports[constraint.index] & set(variables):
+                    continue
+                expression = sseexp.Expression.from_vectors(block_vars, matrix[constraint.index, variables])
+                block_model.add_constraint(ssecon.Constraint(expression, constraint.bound, constraint.type))
+            self.blocks.append(Block(len(self.blocks), variables, block_model, self._objective[variables],
+                                     self._linking_matrix[:, variables]))
+
+        in_blocks = {v for b in self.blocks for v in b.variables}
+        self._master_variables = [v for v in range(len(self.model.variables)) if v not in in_blocks]
+
+    def _solve(self, executor: Executor) -> sssol.Solution:
+        oracle = DantzigWolfePricingOracle(self.blocks, self.model.objective.type, executor)
+        initial_columns = oracle.columns([b.costs for b in self.blocks])
+        if initial_columns is None:
+            return sssol.Solution.infeasible(self.model, None, None)
+
+        master, artificial = self._master(initial_columns)
+        self.column_generation = ColumnGenerationSolver(master, oracle)
+        master_solution = self.column_generation.solve()
+        if not master_solution.is_bounded:
+            return sssol.Solution.unbounded(self.model, master_solution.initial_tableau, master_solution.tableau)
+        if any(master_solution.value(v) > eps for v in artificial):
+            return sssol.Solution.infeasible(self.model, master_solution.initial_tableau, master_solution.tableau)
+
+        assignment = [0.0 for _ in self.model.variables]
+        for var in master.variables:
+            value = master_solution.value(var)
+            if var.name in oracle.points:
+                block_index, point = oracle.points[var.name]
+                for (v, x) in zip(self.blocks[block_index].variables, point):
+                    assignment[v] += value * x
+            elif var not in artificial:
+                assignment[self._master_variables[var.index - len(initial_columns)]] = value
+        return sssol.Solution.with_assignment(self.model, assignment, master_solution.initial_tableau,
+                                              master_solution.tableau)
+
+    def _master(self, initial_columns: List[Column]) -> Tuple[ssmod.Model, List[sseexp.Variable]]:
+        master = ssmod.Model(f"{self.model.name}[master]")
+        blocks_n = len(self.blocks)
+        convexity = [0.0] * blocks_n
+        penalty = self.penalty if self.model.objective.type == sseobj.ObjectiveType.MIN else -self.penalty
+
+        columns = list(initial_columns)
+        columns += [
+            Column(self._objective[v],
+                   list(self._linking_matrix[:, v]) + convexity, self.model.variables[v].name)
+            for v in self._master_variables
+        ]
+        artificial_columns = []
+        for (row, constraint) in enumerate(self.linking):
+            signs = {
+                ssecon.ConstraintType.LE: [-1.0],
+                ssecon.ConstraintType.GE: [1.0],
+                ssecon.ConstraintType.EQ: [1.0, -1.0]
+            }
+            for sign in signs[constraint.type]:
+                coefficients = [sign if r == row else 0.0 for r in range(len(self.linking))] + convexity
+                artificial_columns.append(Column(penalty, coefficients, f"a{len(artificial_columns)}"))
+
+        all_columns = columns + artificial_columns
+        vars = [master.create_variable(c.name) for c in all_columns]
+        for (row, constraint) in enumerate(self.linking):
+            expression = sseexp.Expression.from_vectors(vars, [c.coefficients[row] for c in all_columns])
+            master.add_constraint(ssecon.Constraint(expression, constraint.bound, constraint.type))
+        for k in range(blocks_n):
+            expression = sseexp.Expression.from_vectors(vars,
+                                                        [c.coefficients[len(self.linking) + k] for c in all_columns])
+            master.add_constraint(expression == 1)
+        objective = sseexp.Expression.from_vectors(vars, [c.cost for c in all_columns])
+        if self.model.objective.type == sseobj.ObjectiveType.MIN:
+            master.minimize(objective)
+        else:
+            master.maximize(objective)
+        return (master, vars[len(columns):])
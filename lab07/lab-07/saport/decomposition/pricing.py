@@ -0,0 +1,51 @@
+from typing import Callable, List
+
+import numpy as np
+
+from saport.decomposition.column_generation import Column, PricingOracle
+from saport.knapsack.model import Item, Problem
+from saport.knapsack.solver import Solver
+from saport.knapsack.solvers.dfs import DFSSolver
+from saport.simplex.tableau import eps
+
+
+class CuttingStockPricingOracle(PricingOracle):
+    """
+    Pricing problem of the cutting stock master (min number of rolls s.t. every demand is met).
+    The most valuable cutting pattern for the given duals is found by a knapsack solver,
+    each width is repeated as many times as it fits into the roll, so the 0-1 knapsack solvers can be used.
+
+    Attributes:
+    ----------
+    widths: List[int]
+        widths of the ordered pieces, in the master constraints order
+    roll_width: int
+        width of the stock roll
+    knapsack_solver: Callable[[Problem, int], Solver]
+        creates a knapsack solver for the given problem and timelimit
+    timelimit: int
+        timelimit of a single pricing problem
+    """
+
+    def __init__(self,
+                 widths: List[int],
+                 roll_width: int,
+                 knapsack_solver: Callable[[Problem, int], Solver] = DFSSolver,
+                 timelimit: int = 60):
+        self.widths = widths
+        self.roll_width = roll_width
+        self.knapsack_solver = knapsack_solver
+        self.timelimit = timelimit
+
+    def __call__(self, duals: np.ndarray) -> List[Column]:
+        pieces = [i for (i, w) in enumerate(self.widths) for _ in range(self.roll_width // w) if duals[i] > eps]
+        if len(pieces) == 0:
+            return []
+
+        items = [Item(index=j, value=duals[i], weight=self.widths[i]) for (j, i) in enumerate(pieces)]
+        solution = self.knapsack_solver(Problem(items=items, capacity=self.roll_width), self.timelimit).solve()
+
+        pattern = [0] * len(self.widths)
+        for item in solution.items:
+            pattern[pieces[item.index]] += 1
+        return [Column(cost=1.0, coefficients=pattern)]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from concurrent.futures import Executor
+import asyncio
+
+from saport.integer.model import Model
+from saport.integer.solution import Solution
+from saport.integer.solver import IntegerProgrammingSolver
+from saport.simplex.async_solve import run_cancellable
+from saport.simplex.cancellation import CancellationToken
+
+
+def _solve(model: Model, solver: IntegerProgrammingSolver, token: CancellationToken) -> Solution:
+    return solver.solve(model, float('inf'), token)
+
+
+async def solve_async(model: Model,
+                      solver: IntegerProgrammingSolver,
+                      timeout: float = None,
+                      executor: Executor = None,
+                      limiter: asyncio.Semaphore = None) -> Solution:
+    """
+        Solves the integer programming model with the given solver in the executor (see `saport.simplex.async_solve`).
+        After the timeout the best solution found so far is returned, with `is_optimal` set to False.
+        With a process executor the solver object is copied to the worker, so its statistics are not updated.
+    """
+    return await run_cancellable(_solve, model, solver, timeout=timeout, executor=executor, limiter=limiter)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Tuple
+import math
+
+from saport.integer.nodes import Node
+from saport.simplex import solution as lpsolution
+
+if TYPE_CHECKING:
+    from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+
+
+class BranchingRule(ABC):
+    """
+        A rule choosing the branching variable among the fractional variables of a node relaxation.
+        The rule is notified about the bounds of the processed nodes, so it can learn from the previous branchings.
+
+        Attributes
+        ----------
+        name : str
+            name of the rule used in the reports
+
+        Methods
+        -------
+        reset():
+            forgets everything learned in the previous solve
+        select(solver: LinearRelaxationSolver, node: Node, solution: Solution, candidates: List[int]) -> int:
+            returns the branching variable for the node, `candidates` are the fractional variables (in the index order)
+        observe(node: Node, bound: float):
+            notifies the rule about the relaxation bound of a processed node
+            (in the maximization sense, `-inf` if infeasible)
+    """
+    name: str
+
+    def reset(self):
+        pass
+
+    @abstractmethod
+    def select(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+               candidates: List[int]) -> int:
+        pass
+
+    def observe(self, node: Node, bound: float):
+        pass
+
+
+class FirstFractionalBranching(BranchingRule):
+    """ Branches on the fractional variable with the lowest index. """
+    name = "first fractional"
+
+    def select(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+               candidates: List[int]) -> int:
+        return candidates[0]
+
+
+class MostFractionalBranching(BranchingRule):
+    """ Branches on the variable with the fractional part closest to 0.5 (the lowest index on a tie). """
+    name = "most fractional"
+
+    def select(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+               candidates: List[int]) -> int:
+        assignment = solution.assignment(solver.model)
+        return max(candidates, key=lambda j: (_fractionality(assignment[j]), -j))
+
+
+class StrongBranching(BranchingRule):
+    """
+        Probes both branches of the most fractional candidates with a few dual simplex pivots
+        from the node's optimal tableau and branches on the variable degrading the bound the most
+        (the product of the degradations of both branches), a variable with an infeasible branch is chosen at once.
+        A single candidate is chosen without probing.
+
+        Attributes
+        ----------
+        candidates : int
+            maximal number of the probed variables
+        max_pivots : int
+            maximal number of the dual simplex pivots of a single probe
+        probes : int
+            number of the probed branches in the last solve
+    """
+    name = "strong"
+    candidates: int
+    max_pivots: int
+    probes: int
+
+    def __init__(self, candidates: int = 8, max_pivots: int = 5):
+        self.candidates = candidates
+        self.max_pivots = max_pivots
+        self.probes = 0
+
+    def reset(self):
+        self.probes = 0
+
+    def select(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+               candidates: List[int]) -> int:
+        if len(candidates) == 1:
+            return candidates[0]
+        assignment = solution.assignment(solver.model)
+        candidates = sorted(candidates, key=lambda j: (-_fractionality(assignment[j]), j))[:self.candidates]
+        best, best_score = candidates[0], -math.inf
+        for j in candidates:
+            self.probes += 2
+            down, up = _probe(solver, solution, j, assignment[j], self.max_pivots)
+            if math.isinf(down) or math.isinf(up):
+                return j
+            score = _score(down, up)
+            if score > best_score:
+                best, best_score = j, score
+        return best
+
+
+class PseudoCostBranching(BranchingRule):
+    """
+        Branches on the variable with the highest estimated degradation of the bound (the product of both branches),
+        estimated with the pseudo-costs, i.e. the average degradations per unit of the fractional part,
+        observed in the children of the previous branchings on the variable.
+
+        A variable is reliable once both of its pseudo-costs have been observed `reliability` times.
+        The unreliable candidates (at most `candidates` of them per node, the most fractional first) are initialized
+        with the strong branching probes (see `StrongBranching`),
+        the others use the average pseudo-costs of all the variables.
+
+        Attributes
+        ----------
+        reliability : int
+            number of the observations after which the pseudo-costs of a variable are trusted
+        candidates : int
+            maximal number of the unreliable variables probed at a node
+        max_pivots : int
+            maximal number of the dual simplex pivots of a single probe
+        probes : int
+            number of the probed branches in the last solve
+    """
+    name = "pseudo-cost"
+    reliability: int
+    candidates: int
+    max_pivots: int
+    probes: int
+
+    def __init__(self, reliability: int = 4, candidates: int = 8, max_pivots: int = 5):
+        self.reliability = reliability
+        self.candidates = candidates
+        self.max_pivots = max_pivots
+        self.reset()
+
+    def reset(self):
+        self.probes = 0
+        # variable -> [sum of the down costs, down observations, sum of the up costs, up observations]
+        self._costs: Dict[int, List[float]] = dict()
+        # branched node -> (variable, fractional part, bound, children left to observe)
+        self._pending: Dict[Node, List] = dict()
+
+    def select(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+               candidates: List[int]) -> int:
+        assignment = solution.assignment(solver.model)
+        if len(candidates) == 1:
+            # the children still update the pseudo-costs
+            return self._branched(node, candidates[0], assignment[candidates[0]], solution)
+        order = sorted(candidates, key=lambda j: (-_fractionality(assignment[j]), j))
+        unreliable = [j for j in order if not self._is_reliable(j)]
+        for j in unreliable[:self.candidates]:
+            self.probes += 2
+            down, up = _probe(solver, solution, j, assignment[j], self.max_pivots)
+            if math.isinf(down) or math.isinf(up):
+                return self._branched(node, j, assignment[j], solution)
+            fraction = assignment[j] - math.floor(assignment[j])
+            self._record(j, True, down / fraction)
+            self._record(j, False, up / (1 - fraction))
+
+        average_down, average_up = self._average(True), self._average(False)
+        best, best_score = candidates[0], -math.inf
+        for j in candidates:
+            fraction = assignment[j] - math.floor(assignment[j])
+            down, up = self._pseudo_cost(j, True, average_down), self._pseudo_cost(j, False, average_up)
+            score = _score(down * fraction, up * (1 - fraction))
+            if score > best_score:
+                best, best_score = j, score
+        return self._branched(node, best, assignment[best], solution)
+
+    def observe(self, node: Node, bound: float):
+        entry = self._pending.get(node.parent)
+        if entry is None or node.change is None or node.change.variable != entry[0]:
+            return
+        (j, fraction, parent_bound, _) = entry
+        entry[3] -= 1
+        if entry[3] == 0:
+            del self._pending[node.parent]
+        if math.isinf(bound):
+            return
+        is_down = node.change.is_upper
+        self._record(j, is_down, max(parent_bound - bound, 0.0) / (fraction if is_down else 1 - fraction))
+
+    def _branched(self, node: Node, j: int, value: float, solution: lpsolution.Solution) -> int:
+        bound = float(solution.tableau.objective_value())
+        self._pending[node] = [j, value - math.floor(value), bound, 2]
+        return j
+
+    def _is_reliable(self, j: int) -> bool:
+        costs = self._costs.get(j)
+        return costs is not None and min(costs[1], costs[3]) >= self.reliability
+
+    def _record(self, j: int, is_down: bool, cost: float):
+        costs = self._costs.setdefault(j, [0.0, 0, 0.0, 0])
+        offset = 0 if is_down else 2
+        costs[offset] += cost
+        costs[offset + 1] += 1
+
+    def _pseudo_cost(self, j: int, is_down: bool, default: float) -> float:
+        costs = self._costs.get(j)
+        offset = 0 if is_down else 2
+        if costs is None or costs[offset + 1] == 0:
+            return default
+        return costs[offset] / costs[offset + 1]
+
+    def _average(self, is_down: bool) -> float:
+        offset = 0 if is_down else 2
+        observed = [c[offset] / c[offset + 1] for c in self._costs.values() if c[offset + 1] > 0]
+        return sum(observed) / len(observed) if len(observed) > 0 else 1.0
+
+
+def _fractionality(value: float) -> float:
+    return min(value - math.floor(value), math.ceil(value) - value)
+
+
+def _score(down: float, up: float, epsilon: float = 1e-6) -> float:
+    """
+        _score(down: float, up: float, epsilon: float = 1e-6) -> float:
+            the product score of the degradations, it prefers the variables improving both branches
+    """
+    return max(down, epsilon) * max(up, epsilon)
+
+
+def _probe(solver: LinearRelaxationSolver, solution: lpsolution.Solution, j: int, value: float,
+           max_pivots: int) -> Tuple[float, float]:
+    """
+        _probe(solver: LinearRelaxationSolver, solution: Solution, j: int, value: float,
+               max_pivots: int) -> Tuple[float, float]:
+            returns the degradations of the bound in the down and up branches of the variable,
+            `inf` for an infeasible branch
+    """
+    return (_degradation(solver, solution, j, True, math.floor(value), max_pivots),
+            _degradation(solver, solution, j, False, math.ceil(value), max_pivots))
+
+
+def _degradation(solver: LinearRelaxationSolver, solution: lpsolution.Solution, j: int, is_upper: bool, value: float,
+                 max_pivots: int) -> float:
+    """
+        _degradation(solver: LinearRelaxationSolver, solution: Solution, j: int, is_upper: bool, value: float,
+                     max_pivots: int) -> float:
+            returns how much the bound of the node drops (at least) with the bound on the variable,
+            `inf` if it's infeasible
+    """
+    lp_solver = solver._lp_solver()
+    probe = lp_solver.probe_bound(solution.tableau, j, is_upper, value, max_pivots)
+    solver.lp_pivots += lp_solver.pivots
+    if math.isinf(probe):
+        return math.inf
+    return max(float(solution.tableau.objective_value()) - probe, 0.0)
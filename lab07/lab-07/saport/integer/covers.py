@@ -0,0 +1,146 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List
+import numpy as np
+
+from saport.integer.cuts import Cut
+from saport.integer.model import BooleanModel
+from saport.simplex.expressions import constraint as ssecon
+
+
+@dataclass(frozen=True)
+class KnapsackRow:
+    """
+    A dataclass representing a `<=` row of a boolean model as a knapsack constraint `weights @ y <= capacity`
+    with positive weights, where `y_j` is `x_j` or its complement `1 - x_j` (for the negative factors).
+
+    Attributes
+    ----------
+    variables : numpy.Array
+        indices of the variables in the row
+    weights : numpy.Array
+        positive weights of the (possibly complemented) variables
+    capacity : float
+        capacity of the knapsack
+    complemented : numpy.Array
+        mask of the complemented variables
+    """
+    variables: np.ndarray
+    weights: np.ndarray
+    capacity: float
+    complemented: np.ndarray
+
+    @staticmethod
+    def from_constraint(model: BooleanModel, constraint: ssecon.Constraint, sign: float = 1.0) -> KnapsackRow:
+        factors = sign * np.array(constraint.expression.coefficients(model))
+        variables = np.flatnonzero(factors)
+        complemented = factors[variables] < 0
+        weights = np.abs(factors[variables])
+        capacity = sign * constraint.bound + weights[complemented].sum()
+        return KnapsackRow(variables, weights, float(capacity), complemented)
+
+    def values(self, assignment: np.ndarray) -> np.ndarray:
+        """ Returns the values of the (possibly complemented) variables of the row in the given assignment. """
+        values = assignment[self.variables]
+        return np.where(self.complemented, 1.0 - values, values)
+
+
+def knapsack_rows(model: BooleanModel) -> List[KnapsackRow]:
+    """
+        Returns the knapsack rows of the model: its `<=` constraints, the `>=` ones multiplied by -1
+        and both sides of the equalities,
+        skipping the rows which can't be violated by any boolean assignment (there is no cover for them).
+    """
+    rows = []
+    for constraint in model.constraints:
+        signs = {
+            ssecon.ConstraintType.LE: [1.0],
+            ssecon.ConstraintType.GE: [-1.0],
+            ssecon.ConstraintType.EQ: [1.0, -1.0]
+        }[constraint.type]
+        for sign in signs:
+            row = KnapsackRow.from_constraint(model, constraint, sign)
+            if row.capacity >= 0 and row.weights.sum() > row.capacity:
+                rows.append(row)
+    return rows
+
+
+def separate_cover(row: KnapsackRow, assignment: np.ndarray, tolerance: float = 1e-6) -> Cut:
+    """
+        Returns a lifted minimal cover inequality of the row violated by the assignment (over the model variables),
+        or None.
+
+        The cover is chosen greedily by the ratio `(1 - y_j) / weight_j`
+        (a heuristic for the separation knapsack problem),
+        then reduced to a minimal one, dropping the items with the lowest values first.
+        The remaining variables are lifted sequentially (the highest values first) with the exact lifting coefficients,
+        computed by a dynamic programming over the (small, integer) coefficients of the inequality.
+    """
+    values = row.values(assignment)
+    if row.weights.sum() <= row.capacity:
+        return None
+
+    order = np.argsort((1.0 - values) / row.weights, kind="stable")
+    cover, weight = [], 0.0
+    for j in order:
+        cover.append(j)
+        weight += row.weights[j]
+        if weight > row.capacity:
+            break
+    for j in sorted(cover, key=lambda j: values[j]):
+        if weight - row.weights[j] > row.capacity:
+            cover.remove(j)
+            weight -= row.weights[j]
+
+    # sum(y_j for j in cover) <= |cover| - 1
+    if values[cover].sum() <= len(cover) - 1 + tolerance:
+        return None
+
+    rhs = len(cover) - 1
+    coefficients = np.zeros(len(row.weights), dtype=int)
+    coefficients[cover] = 1
+    lifted = list(cover)
+    rest = sorted(set(range(len(row.weights))) - set(cover), key=lambda j: -values[j])
+    for j in rest:
+        best = _max_profit(row.weights[lifted], coefficients[lifted], row.capacity - row.weights[j], rhs)
+        coefficients[j] = rhs - best
+        if coefficients[j] > 0:
+            lifted.append(j)
+
+    if coefficients @ values <= rhs + tolerance:
+        return None
+    return _to_cut(row, coefficients, rhs, len(assignment))
+
+
+def cover_cuts(rows: List[KnapsackRow], assignment: np.ndarray, max_cuts: int, tolerance: float = 1e-6) -> List[Cut]:
+    """ Returns the violated lifted cover inequalities of the rows (at most one per row), the most violated first. """
+    assignment = np.asarray(assignment, dtype=float)
+    cuts = [cut for cut in (separate_cover(row, assignment, tolerance) for row in rows) if cut is not None]
+    cuts.sort(key=lambda cut: cut.bound - cut.coefficients @ assignment)
+    return cuts[:max_cuts]
+
+
+def _max_profit(weights: np.ndarray, profits: np.ndarray, capacity: float, limit: int) -> int:
+    """
+        _max_profit(weights: array, profits: array, capacity: float, limit: int) -> int:
+            returns the highest total profit (capped at the limit) of the items fitting into the capacity,
+            `min_weight[p]` is the lowest weight of the items with the total profit `p`
+    """
+    if capacity < 0:
+        # the lifted variable alone doesn't fit, so its coefficient may be as high as the right hand side
+        return 0
+    min_weight = np.full(limit + 1, np.inf)
+    min_weight[0] = 0.0
+    for (w, p) in zip(weights, profits):
+        for total in range(limit, 0, -1):
+            previous = max(total - p, 0)
+            min_weight[total] = min(min_weight[total], min_weight[previous] + w)
+    return int(max(p for p in range(limit + 1) if min_weight[p] <= capacity))
+
+
+def _to_cut(row: KnapsackRow, coefficients: np.ndarray, rhs: int, variables_n: int) -> Cut:
+    # the complemented variables: a * (1 - x) = a - a * x
+    factors = np.where(row.complemented, -coefficients, coefficients).astype(float)
+    dense = np.zeros(variables_n)
+    dense[row.variables] = factors
+    return Cut(dense, float(rhs - coefficients[row.complemented].sum()))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Tuple
+import math
+import numpy as np
+
+from saport.integer.model import Model
+from saport.simplex import model as ssmod
+from saport.simplex import tableau as sstab
+
+
+@dataclass(frozen=True)
+class Cut:
+    """
+    A dataclass representing a cut `coefficients @ x <= bound` over the columns of a tableau.
+
+    Attributes
+    ----------
+    coefficients : numpy.Array
+        factors of the tableau columns (without the right hand side)
+    bound : float
+        right hand side of the cut
+    """
+    coefficients: np.ndarray
+    bound: float
+
+
+@dataclass(frozen=True)
+class CutRound:
+    """
+    A dataclass representing the statistics of a single round of the cut generation.
+
+    Attributes
+    ----------
+    depth : int
+        depth of the node the round was run at (0 for the root)
+    bound : float
+        objective value of the relaxation after the round (in the sense of the model)
+    improvement : float
+        how much the round has tightened the bound
+    added : int
+        number of the cuts added in the round
+    removed : int
+        number of the aged cuts removed after the round
+    active : int
+        number of the cuts in the pool after the round
+    covers : int
+        number of the cover inequalities among the added cuts
+    """
+    depth: int
+    bound: float
+    improvement: float
+    added: int
+    removed: int
+    active: int
+    covers: int = 0
+
+
+def integer_columns(model: Model, tableau: sstab.Tableau) -> np.ndarray:
+    """
+        Returns a mask of the tableau columns taking only the integer values: the model variables
+        and the slacks of the constraints with the integer factors and bound.
+        The columns unknown to the tableau's model (e.g. the slacks of the cuts) are considered continuous.
+    """
+    mask = np.zeros(tableau.table.shape[1] - 1, dtype=bool)
+    variables_n = len(model.variables)
+    mask[:variables_n] = True
+    if not isinstance(tableau.model, ssmod.Model):
+        return mask
+
+    def is_integer(x: float) -> bool:
+        return float(x).is_integer()
+
+    for constraint in tableau.model.constraints:
+        slacks = [a for a in constraint.expression.atoms if a.var.index >= variables_n]
+        structural = [a for a in constraint.expression.atoms if a.var.index < variables_n]
+        integral = is_integer(constraint.bound) and all(is_integer(a.coefficient) for a in structural)
+        for atom in slacks:
+            if atom.var.index < len(mask):
+                mask[atom.var.index] = integral and abs(atom.coefficient) == 1
+    return mask
+
+
+def gomory_cuts(tableau: sstab.Tableau, integer: np.ndarray, max_cuts: int, tolerance: float = 1e-6) -> List[Cut]:
+    """
+        Returns Gomory mixed integer cuts derived from the rows of the (optimal) tableau
+        with a fractional integer basic variable, the most fractional rows first.
+        The cuts are expressed in the nonbasic columns, so they cut off the current basic solution.
+    """
+    basis = tableau.extract_basis()
+    values = np.asarray(tableau.table[1:, -1], dtype=float)
+    fractions = values - np.floor(values)
+    rows = [r for (r, col) in enumerate(basis)
+            if col >= 0 and integer[col] and tolerance < fractions[r] < 1 - tolerance]
+    rows.sort(key=lambda r: abs(fractions[r] - 0.5))
+
+    basic = np.zeros(len(integer), dtype=bool)
+    basic[[col for col in basis if col >= 0]] = True
+    cuts = []
+    for r in rows[:max_cuts]:
+        factors = np.asarray(tableau.table[r + 1, :-1], dtype=float)
+        f0 = fractions[r]
+        f = factors - np.floor(factors)
+        coefficients = np.where(integer,
+                                np.where(f <= f0, f / f0, (1 - f) / (1 - f0)),
+                                np.where(factors >= 0, factors / f0, -factors / (1 - f0)))
+        coefficients[basic | (np.abs(coefficients) < tolerance)] = 0.0
+        nonzero = np.abs(coefficients[coefficients != 0])
+        # the cuts with a huge dynamism are numerically unsafe
+        if len(nonzero) == 0 or nonzero.max() / nonzero.min() > 1e6:
+            continue
+        # sum(coefficients * x) >= 1, i.e. -sum(coefficients * x) <= -1
+        cuts.append(Cut(-coefficients, -1.0))
+    return cuts
+
+
+class CutPool:
+    """
+        A pool of the cuts added to a tableau during the rounds of the cut generation.
+
+        A cut is a duplicate if its normalized factors of the stable columns (existing before the first round) are equal
+        to the ones of a cut already in the pool. A cut whose slack is basic and positive (the cut is not binding)
+        ages with every round, and it is removed from the tableau once its age exceeds the limit,
+        which is always valid, since dropping a non-binding constraint keeps the basis optimal.
+
+        Attributes
+        ----------
+        columns : int
+            number of the stable columns
+        age_limit : int
+            number of the rounds a cut may stay inactive
+
+        Methods
+        -------
+        __init__(columns: int, age_limit: int) -> CutPool:
+            constructs an empty pool for a tableau with the given number of columns
+        filter(cuts: List[Cut]) -> List[Cut]:
+            returns the cuts, which are not duplicates of the pool cuts or of each other
+        add(cuts: List[Cut], first_column: int):
+            adds the cuts to the pool, their slacks are the consecutive columns starting at the given one
+        age(tableau: Tableau) -> Tuple[List[int], List[int]]:
+            ages the inactive cuts, returns the rows and the columns of the ones to remove, and forgets them
+    """
+    columns: int
+    age_limit: int
+
+    def __init__(self, columns: int, age_limit: int):
+        self.columns = columns
+        self.age_limit = age_limit
+        self._keys = set()
+        self._cuts = []
+
+    def filter(self, cuts: List[Cut]) -> List[Cut]:
+        filtered = []
+        for cut in cuts:
+            key = self._key(cut)
+            if key not in self._keys:
+                self._keys.add(key)
+                filtered.append(cut)
+        return filtered
+
+    def add(self, cuts: List[Cut], first_column: int):
+        for (i, cut) in enumerate(cuts):
+            self._cuts.append([self._key(cut), first_column + i, 0])
+
+    def age(self, tableau: sstab.Tableau) -> Tuple[List[int], List[int]]:
+        basis = tableau.extract_basis()
+        rows = {col: r + 1 for (r, col) in enumerate(basis) if col >= 0}
+        removed = []
+        for entry in self._cuts:
+            row = rows.get(entry[1])
+            active = row is None or tableau.table[row, -1] <= tableau.tolerance
+            entry[2] = 0 if active else entry[2] + 1
+            if entry[2] > self.age_limit:
+                removed.append(entry)
+
+        removed_columns = sorted(entry[1] for entry in removed)
+        self._cuts = [entry for entry in self._cuts if entry not in removed]
+        for entry in self._cuts:
+            entry[1] -= sum(1 for c in removed_columns if c < entry[1])
+        # the removed cuts may be generated again
+        self._keys -= set(entry[0] for entry in removed)
+        return ([rows[c] for c in removed_columns], removed_columns)
+
+    def __len__(self) -> int:
+        return len(self._cuts)
+
+    def _key(self, cut: Cut) -> Tuple:
+        coefficients = np.append(cut.coefficients[:self.columns], cut.bound)
+        scale = np.abs(coefficients).max()
+        return tuple(np.round(coefficients / (scale if scale > 0 else 1.0), 6) + 0.0)
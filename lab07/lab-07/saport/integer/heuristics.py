@@ -0,0 +1,365 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple
+import math
+import numpy as np
+
+from saport.integer.model import BooleanModel
+from saport.integer.nodes import BoundChange, Node
+from saport.simplex import matrix as ssmat
+from saport.simplex import solution as lpsolution
+from saport.simplex.expressions import constraint as ssecon
+from saport.simplex.expressions import expression as sseexp
+
+if TYPE_CHECKING:
+    from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+
+
+@dataclass(frozen=True)
+class HeuristicCall:
+    """
+    A dataclass representing a single run of a primal heuristic.
+
+    Attributes
+    ----------
+    heuristic : str
+        name of the heuristic
+    depth : int
+        depth of the node the heuristic was run at
+    time : float
+        how long the heuristic has been working (in seconds)
+    assignment : List[float] | None
+        feasible integer assignment found by the heuristic, None if there is none
+    objective : float | None
+        objective value of the assignment (in the sense of the model)
+    """
+    heuristic: str
+    depth: int
+    time: float
+    assignment: List[float] = None
+    objective: float = None
+
+
+@dataclass
+class HeuristicStatistics:
+    """
+    A dataclass gathering the statistics of a primal heuristic over the whole search.
+
+    Attributes
+    ----------
+    calls : int
+        number of the runs
+    solutions : int
+        number of the runs which found a feasible solution
+    incumbents : int
+        number of the solutions which became the incumbent
+    pruned : int
+        number of the nodes pruned while the incumbent found by the heuristic was the best known solution,
+        i.e. the nodes whose subtrees the heuristic has saved
+    time : float
+        total time of the runs (in seconds)
+    """
+    calls: int = 0
+    solutions: int = 0
+    incumbents: int = 0
+    pruned: int = 0
+    time: float = 0.0
+
+
+@dataclass(frozen=True)
+class IncumbentRecord:
+    """
+    A dataclass representing an improvement of the incumbent during the search.
+
+    Attributes
+    ----------
+    source : str
+        name of the heuristic which found the solution, or "branching" for the integral relaxations
+    node : int
+        number of the nodes processed before the solution was found
+    objective : float
+        objective value of the solution (in the sense of the model)
+    """
+    source: str
+    node: int
+    objective: float
+
+
+class PrimalHeuristic(ABC):
+    """
+        A heuristic looking for the feasible integer solutions around the relaxation of a node,
+        so the branch and bound gets an incumbent (and starts pruning) early in the search.
+
+        Attributes
+        ----------
+        name : str
+            name of the heuristic used in the statistics
+
+        Methods
+        -------
+        run(solver: LinearRelaxationSolver, node: Node, solution: Solution, cutoff: float) -> List[float] | None:
+            returns a feasible integer assignment found from the (fractional) relaxation of the node
+            better than the cutoff
+            (in the maximization sense), or None
+    """
+    name: str
+
+    @abstractmethod
+    def run(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+            cutoff: float) -> List[float]:
+        pass
+
+
+class SimpleRounding(PrimalHeuristic):
+    """
+        Rounds the relaxation to the nearest integers and, if every fractional variable can be rounded
+        in a direction without any lock (see `locks`), in the directions keeping all the rows feasible.
+    """
+    name = "simple rounding"
+
+    def run(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+            cutoff: float) -> List[float]:
+        x = np.array(solution.assignment(solver.model), dtype=float)
+        candidates = [np.round(x)]
+        down_locks, up_locks = locks(solver._matrix)
+        fractional = _fractional(x, solver.integrality_tolerance)
+        if np.all((down_locks[fractional] == 0) | (up_locks[fractional] == 0)):
+            rounded = x.copy()
+            rounded[fractional] = np.where(down_locks[fractional] == 0, np.floor(x[fractional]), np.ceil(x[fractional]))
+            candidates.append(rounded)
+        return best_feasible(solver, np.array(candidates), cutoff)
+
+
+class RandomizedRounding(PrimalHeuristic):
+    """
+        Rounds every fractional variable up with the probability equal to its fractional part,
+        all the samples are checked at once on the compiled model.
+
+        Attributes
+        ----------
+        samples : int
+            number of the rounded assignments drawn in a single run
+    """
+    name = "randomized rounding"
+    samples: int
+
+    def __init__(self, samples: int = 32, seed: int = 0):
+        self.samples = samples
+        self._random = np.random.default_rng(seed)
+
+    def run(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+            cutoff: float) -> List[float]:
+        x = np.array(solution.assignment(solver.model), dtype=float)
+        floor = np.floor(x)
+        candidates = floor + (self._random.random((self.samples, len(x))) < x - floor)
+        return best_feasible(solver, candidates, cutoff)
+
+
+class Diving(PrimalHeuristic):
+    """
+        A depth-first dive from the node: a single fractional variable is rounded (its bound is changed)
+        and the relaxation is re-optimized (warm-started, like the branch and bound children) until it's integral,
+        infeasible or not better than the cutoff.
+        If a rounding makes the relaxation infeasible, the other direction is tried once.
+        Subclasses choose the variable and the direction.
+
+        Attributes
+        ----------
+        max_depth : int | None
+            maximal number of the bound changes, the number of the variables by default
+
+        Methods
+        -------
+        _select(solver: LinearRelaxationSolver, x: array, fractional: array) -> BoundChange:
+            returns the bound change rounding one of the fractional variables
+    """
+    max_depth: int
+
+    def __init__(self, max_depth: int = None):
+        self.max_depth = max_depth
+
+    def run(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+            cutoff: float) -> List[float]:
+        max_depth = self.max_depth if self.max_depth is not None else len(solver.model.variables)
+        for _ in range(max_depth):
+            if solver.timeout() or solver._sense * solution.objective_value() <= cutoff:
+                return None
+            x = np.array(solution.assignment(solver.model), dtype=float)
+            fractional = _fractional(x, solver.integrality_tolerance)
+            if not fractional.any():
+                return best_feasible(solver, np.array([np.round(x)]), cutoff)
+            change = self._select(solver, x, fractional)
+            tableau = solution.tableau if solver.warm_start else None
+            child = Node(node.bound, node.estimate, node.depth + 1, change, node)
+            solution = solver._relaxation(child, tableau)
+            if not solution.is_interrupted and not solution.is_feasible:
+                # a single backtrack: the variable is rounded in the other direction
+                change = _rounding(change.variable, x[change.variable], not change.is_upper)
+                child = Node(node.bound, node.estimate, node.depth + 1, change, node)
+                solution = solver._relaxation(child, tableau)
+            if solution.is_interrupted or not solution.is_feasible or not solution.is_bounded:
+                return None
+            node = child
+        return None
+
+    @abstractmethod
+    def _select(self, solver: LinearRelaxationSolver, x: np.ndarray, fractional: np.ndarray) -> BoundChange:
+        pass
+
+
+class FractionalDiving(Diving):
+    """
+        Rounds the least fractional variable to the nearest integer.
+    """
+    name = "fractional diving"
+
+    def _select(self, solver: LinearRelaxationSolver, x: np.ndarray, fractional: np.ndarray) -> BoundChange:
+        distance = np.where(fractional, np.abs(x - np.round(x)), np.inf)
+        j = int(np.argmin(distance))
+        return _rounding(j, x[j], x[j] - math.floor(x[j]) < 0.5)
+
+
+class CoefficientDiving(Diving):
+    """
+        Rounds the fractional variable with the fewest locks in a direction (see `locks`) in that direction,
+        so the dive violates as few rows as possible, the ties are broken by the distance to the rounded value.
+    """
+    name = "coefficient diving"
+
+    def _select(self, solver: LinearRelaxationSolver, x: np.ndarray, fractional: np.ndarray) -> BoundChange:
+        down_locks, up_locks = locks(solver._matrix)
+        down = x - np.floor(x)
+        up = np.ceil(x) - x
+        is_down = (down_locks < up_locks) | ((down_locks == up_locks) & (down < up))
+        fewest = np.where(is_down, down_locks, up_locks)
+        distance = np.where(is_down, down, up)
+        candidates = np.flatnonzero(fractional)
+        j = int(min(candidates, key=lambda j: (fewest[j], distance[j])))
+        return _rounding(j, x[j], bool(is_down[j]))
+
+
+class FeasibilityPump(PrimalHeuristic):
+    """
+        Alternates between rounding the relaxation and projecting the rounded point back onto the relaxation polytope,
+        i.e. solving the relaxation of the node with the objective minimizing the (l1) distance to the rounded point.
+        If the rounding cycles, the variables with the largest distances are flipped randomly.
+
+        Attributes
+        ----------
+        max_iterations : int
+            maximal number of the projections in a single run
+    """
+    name = "feasibility pump"
+    max_iterations: int
+
+    def __init__(self, max_iterations: int = 20, seed: int = 0):
+        self.max_iterations = max_iterations
+        self._random = np.random.default_rng(seed)
+
+    def run(self, solver: LinearRelaxationSolver, node: Node, solution: lpsolution.Solution,
+            cutoff: float) -> List[float]:
+        x = np.array(solution.assignment(solver.model), dtype=float)
+        previous = None
+        for _ in range(self.max_iterations):
+            if solver.timeout():
+                return None
+            rounded = np.round(x)
+            if previous is not None and np.array_equal(rounded, previous):
+                rounded = self._perturb(x, rounded)
+            found = best_feasible(solver, np.array([rounded]), cutoff)
+            if found is not None:
+                return found
+            previous = rounded
+
+            projection = solver._lp_solver()
+            projected = projection.solve(self._distance_model(solver, node, rounded))
+            solver.lp_pivots += projection.pivots
+            if projected.is_interrupted or not projected.is_feasible or not projected.is_bounded:
+                return None
+            x = np.array(projected.assignment(solver.model), dtype=float)
+            if not _fractional(x, solver.integrality_tolerance).any():
+                return best_feasible(solver, np.array([np.round(x)]), cutoff)
+        return None
+
+    def _perturb(self, x: np.ndarray, rounded: np.ndarray) -> np.ndarray:
+        """
+            _perturb(x: array, rounded: array) -> array:
+                flips a random number of the variables with the largest distance to their rounded values
+        """
+        distance = np.abs(x - rounded)
+        flips = min(len(x), int(self._random.integers(1, max(2, len(x) // 2) + 1)))
+        flipped = rounded.copy()
+        for j in np.argsort(-distance, kind="stable")[:flips]:
+            flipped[j] = rounded[j] + (1 if x[j] >= rounded[j] else -1)
+        return np.maximum(flipped, 0)
+
+    def _distance_model(self, solver: LinearRelaxationSolver, node: Node, rounded: np.ndarray):
+        """
+            _distance_model(solver: LinearRelaxationSolver, node: Node, rounded: array) -> Model:
+                returns the relaxation of the node minimizing the distance to the rounded point,
+                a variable rounded to 0 contributes just itself,
+                the other ones use an auxiliary variable `d >= |x - rounded|`
+        """
+        model = solver._node_model(node)
+        distance = sseexp.Expression()
+        for (var, value) in zip(list(model.variables), rounded):
+            if value == 0:
+                distance = distance + sseexp.Expression.from_vectors([var], [1.0])
+                continue
+            d = model.create_variable(f"_d{var.index}")
+            model.add_constraint(sseexp.Expression.from_vectors([d, var], [1.0, -1.0]) >= -value)
+            model.add_constraint(sseexp.Expression.from_vectors([d, var], [1.0, 1.0]) >= value)
+            distance = distance + sseexp.Expression.from_vectors([d], [1.0])
+        model.minimize(distance)
+        return model
+
+
+def default_heuristics(seed: int = 0) -> List[PrimalHeuristic]:
+    """ Returns all the heuristics, the cheap ones first. """
+    return [
+        SimpleRounding(),
+        RandomizedRounding(seed=seed),
+        FractionalDiving(),
+        CoefficientDiving(),
+        FeasibilityPump(seed=seed)
+    ]
+
+
+def locks(matrix: ssmat.MatrixModel) -> Tuple[np.ndarray, np.ndarray]:
+    """
+        Returns the numbers of the down-locks and the up-locks of the variables,
+        i.e. the numbers of the rows, which may become violated when the variable decreases (increases).
+    """
+    rows = np.repeat(np.arange(len(matrix.constraints)), np.diff(matrix.indptr))
+    senses = np.asarray(matrix.senses)[rows]
+    data = np.asarray(matrix.data)
+    is_le, is_ge, is_eq = (senses == t.value
+                           for t in (ssecon.ConstraintType.LE, ssecon.ConstraintType.GE, ssecon.ConstraintType.EQ))
+    n = len(matrix.variables)
+    down = np.bincount(matrix.indices, weights=is_eq | (is_le & (data < 0)) | (is_ge & (data > 0)), minlength=n)
+    up = np.bincount(matrix.indices, weights=is_eq | (is_le & (data > 0)) | (is_ge & (data < 0)), minlength=n)
+    return (down.astype(int), up.astype(int))
+
+
+def best_feasible(solver: LinearRelaxationSolver, candidates: np.ndarray, cutoff: float) -> List[float]:
+    """
+        Returns the best of the integer candidates (k x n array), which is feasible and better than the cutoff
+        (in the maximization sense), or None. The boolean variables have to be at most 1.
+    """
+    objectives, _, feasible = solver._matrix.evaluate_batch(candidates, solver.integrality_tolerance)
+    if isinstance(solver.model, BooleanModel):
+        feasible &= (candidates <= 1).all(axis=1)
+    scores = np.where(feasible, solver._sense * objectives, -np.inf)
+    best = int(np.argmax(scores))
+    if scores[best] <= cutoff:
+        return None
+    return [float(v) for v in candidates[best]]
+
+
+def _fractional(x: np.ndarray, tolerance: float) -> np.ndarray:
+    return np.abs(x - np.round(x)) > tolerance
+
+
+def _rounding(variable: int, value: float, is_down: bool) -> BoundChange:
+    return BoundChange(variable, True, math.floor(value)) if is_down else BoundChange(variable, False, math.ceil(value))
@@ -0,0 +1,178 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import heapq
+import math
+
+
+@dataclass(frozen=True)
+class BoundChange:
+    """
+    A dataclass representing a single branching decision.
+
+    Attributes
+    ----------
+    variable : int
+        index of the branching variable
+    is_upper : bool
+        whether the decision is `x <= value` (otherwise `x >= value`)
+    value : float
+        new bound of the variable
+    """
+    variable: int
+    is_upper: bool
+    value: float
+
+
+@dataclass(frozen=True, eq=False)
+class Node:
+    """
+    A dataclass representing a node of the branch and bound tree.
+    A node stores just its own bound change and a link to the parent, so the open nodes share their common history
+    and the frontier takes memory proportional to the number of nodes, not to the size of the model.
+
+    Attributes
+    ----------
+    bound : float
+        upper bound of the objective in the node's subtree (in the maximization sense),
+        for the unprocessed nodes it's the bound of their parent
+    estimate : float
+        estimated objective value of the best integer solution in the subtree (in the maximization sense)
+    depth : int
+        depth of the node, the root has depth 0
+    change : BoundChange | None
+        branching decision leading to the node from its parent, None for the root
+    parent : Node | None
+        parent of the node, None for the root
+    fixings : Tuple[BoundChange, ...]
+        bounds derived while processing the parent (e.g. by the reduced-cost fixing), valid in the node's whole subtree
+
+    Methods
+    -------
+    changes() -> List[BoundChange]:
+        returns all the branching decisions (and the inherited fixings) from the root to the node
+    bounds() -> Dict[int, Tuple[float, float]]:
+        returns the tightest (lower, upper) bounds of the branched variables, `-inf`/`inf` if not bounded
+    """
+    bound: float
+    estimate: float
+    depth: int = 0
+    change: BoundChange = None
+    parent: Node = None
+    fixings: Tuple[BoundChange, ...] = ()
+
+    def changes(self) -> List[BoundChange]:
+        changes = []
+        node = self
+        while node is not None and node.change is not None:
+            changes.append(node.change)
+            changes.extend(reversed(node.fixings))
+            node = node.parent
+        return changes[::-1]
+
+    def bounds(self) -> Dict[int, Tuple[float, float]]:
+        bounds = dict()
+        for change in self.changes():
+            lower, upper = bounds.get(change.variable, (-math.inf, math.inf))
+            if change.is_upper:
+                upper = min(upper, change.value)
+            else:
+                lower = max(lower, change.value)
+            bounds[change.variable] = (lower, upper)
+        return bounds
+
+
+class NodeSelection(ABC):
+    """
+        A frontier of the open nodes, the nodes are popped in the order of their priority (the lowest first),
+        the ties are resolved in favor of the most recently pushed node.
+
+        Methods
+        -------
+        priority(node: Node) -> float:
+            priority of the node, to be implemented by the selection rules
+        push(node: Node):
+            adds the node to the frontier
+        pop() -> Node:
+            removes and returns the next node to process
+        best_bound() -> float:
+            returns the highest bound of the open nodes (`-inf` if there are none)
+        prune(lower_bound: float) -> List[Node]:
+            removes and returns the nodes which can't contain a solution better than the lower bound
+        incumbent_found():
+            notifies the rule that the incumbent solution has been found (or improved)
+        clear():
+            removes all the nodes
+    """
+
+    def __init__(self):
+        self.clear()
+
+    @abstractmethod
+    def priority(self, node: Node) -> float:
+        '''Override this method, nodes with a lower priority are popped first'''
+
+    def push(self, node: Node):
+        self._counter += 1
+        heapq.heappush(self._heap, (self.priority(node), -self._counter, node))
+
+    def pop(self) -> Node:
+        return heapq.heappop(self._heap)[2]
+
+    def best_bound(self) -> float:
+        return max((node.bound for (_, _, node) in self._heap), default=-math.inf)
+
+    def prune(self, lower_bound: float) -> List[Node]:
+        pruned = [entry[2] for entry in self._heap if entry[2].bound <= lower_bound]
+        self._heap = [entry for entry in self._heap if entry[2].bound > lower_bound]
+        heapq.heapify(self._heap)
+        return pruned
+
+    def incumbent_found(self):
+        pass
+
+    def clear(self):
+        self._heap = []
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class DepthFirstSelection(NodeSelection):
+    """ Dives into the deepest node, uses little memory and finds the feasible solutions quickly. """
+
+    def priority(self, node: Node) -> float:
+        return -node.depth
+
+
+class BestBoundSelection(NodeSelection):
+    """ Processes the node with the highest bound, minimizes the number of the processed nodes. """
+
+    def priority(self, node: Node) -> float:
+        return -node.bound
+
+
+class BestEstimateSelection(NodeSelection):
+    """ Processes the node with the highest estimate of the integer solution in its subtree. """
+
+    def priority(self, node: Node) -> float:
+        return -node.estimate
+
+
+class HybridSelection(NodeSelection):
+    """ Dives depth-first until the first incumbent is found, then switches to the best-bound order. """
+
+    def clear(self):
+        super().clear()
+        self._diving = True
+
+    def priority(self, node: Node) -> float:
+        return -node.depth if self._diving else -node.bound
+
+    def incumbent_found(self):
+        if self._diving:
+            self._diving = False
+            self._heap = [(self.priority(node), counter, node) for (_, counter, node) in self._heap]
+            heapq.heapify(self._heap)
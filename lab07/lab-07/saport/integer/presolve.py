@@ -0,0 +1,315 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import math
+
+from saport.integer.model import BooleanModel, Model
+from saport.integer.solution import Solution
+from saport.simplex.expressions import constraint as ssecon
+from saport.simplex.expressions import expression as sseexp
+from saport.simplex.expressions import objective as sseobj
+
+
+@dataclass(frozen=True)
+class PresolveStatistics:
+    """
+    A dataclass representing the reductions made by the presolve.
+
+    Attributes
+    ----------
+    fixed_variables : int
+        number of the variables fixed (and removed from the model)
+    removed_rows : int
+        number of the constraints removed from the model (net of the bound rows of the general integers)
+    parallel_rows : int
+        number of the removed duplicates of the parallel rows
+    tightened_bounds : int
+        number of the tightened variable bounds
+    tightened_coefficients : int
+        number of the tightened constraint coefficients
+    rounds : int
+        number of the presolve rounds run
+    """
+    fixed_variables: int
+    removed_rows: int
+    parallel_rows: int
+    tightened_bounds: int
+    tightened_coefficients: int
+    rounds: int
+
+
+class _Row:
+    """
+        _Row(factors: Dict[int, float], bound: float, is_equality: bool, sign: float):
+            a mutable constraint `factors @ x <= bound` (or `==` for the equalities),
+            the `>=` constraints are stored multiplied by -1, `sign` restores their original direction
+    """
+    def __init__(self, factors: Dict[int, float], bound: float, is_equality: bool, sign: float):
+        self.factors = factors
+        self.bound = bound
+        self.is_equality = is_equality
+        self.sign = sign
+
+
+class Presolve:
+    """
+        Root presolve of the integer and boolean models. Reductions are repeated until nothing changes:
+        - fixed variables are substituted into the rows and removed from the model,
+        - singleton rows become the variable bounds, the bounds are tightened with the activities of the rows
+          (which also fixes the variables whose factor alone exceeds the slack of a row),
+        - rows, which are always satisfied, are removed, infeasible rows are detected,
+        - factors of the variables with two values are tightened (if the row is redundant for one of the values),
+        - duplicates of the parallel rows are removed (keeping the tightest bound).
+        The bounds of the remaining general integers are stated as the constraints of the presolved model.
+
+        Attributes
+        ----------
+        original : Model
+            the model before the presolve
+        model : Model | None
+            the presolved model, over the not fixed variables (in the original order),
+            None if the original is infeasible
+        is_infeasible : bool
+            whether the presolve has proved that the model is infeasible
+        statistics : PresolveStatistics
+            reductions made by the presolve
+
+        Methods
+        -------
+        __init__(model: Model, max_rounds: int = 20) -> Presolve:
+            presolves the given model
+        postsolve(solution: Solution) -> Solution:
+            maps the solution of the presolved model back to the variables of the original model
+        fixed_solution() -> Solution:
+            returns the solution of the original model if the presolve has fixed all the variables
+    """
+    tolerance: float = 1e-9
+    original: Model
+    model: Model
+    is_infeasible: bool
+    statistics: PresolveStatistics
+
+    def __init__(self, model: Model, max_rounds: int = 20):
+        self.original = model
+        self.is_infeasible = False
+        n = len(model.variables)
+        self._lower = [0.0] * n
+        self._upper = [1.0 if isinstance(model, BooleanModel) else math.inf] * n
+        self._rows = [self._row(c) for c in model.constraints]
+        self._parallel = 0
+        self._bounds = 0
+        self._coefficients = 0
+
+        rounds = 0
+        changed = True
+        while changed and rounds < max_rounds and not self.is_infeasible:
+            rounds += 1
+            changed = self._presolve_rows()
+            changed = not self.is_infeasible and self._remove_parallel_rows() or changed
+
+        self.model = None if self.is_infeasible else self._presolved_model()
+        fixed = sum(1 for (l, u) in zip(self._lower, self._upper) if l == u)
+        removed = len(model.constraints) - (0 if self.model is None else len(self.model.constraints))
+        self.statistics = PresolveStatistics(fixed, removed, self._parallel, self._bounds, self._coefficients, rounds)
+
+    def postsolve(self, solution: Solution) -> Solution:
+        if solution is None or not solution.has_assignment():
+            if solution is not None and not solution.is_bounded:
+                return Solution.unbounded(self.original)
+            return Solution.infeasible(self.original)
+        values = iter(solution.assignment)
+        variables_n = len(self.original.variables)
+        assignment = [self._lower[i] if self._is_fixed(i) else next(values) for i in range(variables_n)]
+        return Solution.with_assignment(self.original, [round(v) for v in assignment], solution.is_optimal)
+
+    def fixed_solution(self) -> Solution:
+        return Solution.with_assignment(self.original, [round(v) for v in self._lower], True)
+
+    def _row(self, constraint: ssecon.Constraint) -> _Row:
+        factors = dict()
+        for atom in constraint.expression.atoms:
+            factors[atom.var.index] = factors.get(atom.var.index, 0.0) + atom.coefficient
+        sign = -1.0 if constraint.type == ssecon.ConstraintType.GE else 1.0
+        factors = {j: sign * a for (j, a) in factors.items() if a != 0.0}
+        return _Row(factors, sign * constraint.bound, constraint.type == ssecon.ConstraintType.EQ, sign)
+
+    def _is_fixed(self, j: int) -> bool:
+        return self._lower[j] == self._upper[j]
+
+    def _presolve_rows(self) -> bool:
+        changed = False
+        for row in list(self._rows):
+            if self.is_infeasible:
+                return changed
+            for j in [j for j in row.factors if self._is_fixed(j)]:
+                row.bound -= row.factors.pop(j) * self._lower[j]
+            if len(row.factors) <= 1:
+                self._rows.remove(row)
+                self._singleton(row)
+                changed = True
+                continue
+
+            min_activity, max_activity = self._activities(row.factors)
+            exceeded = min_activity > row.bound + self.tolerance
+            if exceeded or (row.is_equality and max_activity < row.bound - self.tolerance):
+                self.is_infeasible = True
+                return changed
+            if not row.is_equality and max_activity <= row.bound + self.tolerance:
+                self._rows.remove(row)
+                changed = True
+                continue
+
+            changed = self._tighten_bounds(row.factors, row.bound) or changed
+            if row.is_equality:
+                changed = self._tighten_bounds({j: -a for (j, a) in row.factors.items()}, -row.bound) or changed
+            else:
+                changed = self._tighten_coefficients(row) or changed
+        return changed
+
+    def _singleton(self, row: _Row):
+        """
+            _singleton(row: _Row):
+                turns a row with at most one variable into its bound (or checks it, if it's empty)
+        """
+        if len(row.factors) == 0:
+            violated = abs(row.bound) > self.tolerance if row.is_equality else row.bound < -self.tolerance
+            self.is_infeasible = self.is_infeasible or violated
+            return
+        ((j, a),) = row.factors.items()
+        value = row.bound / a
+        if row.is_equality:
+            if abs(value - round(value)) > self.tolerance:
+                self.is_infeasible = True
+                return
+            self._set_lower(j, round(value))
+            self._set_upper(j, round(value))
+        elif a > 0:
+            self._set_upper(j, math.floor(value + self.tolerance))
+        else:
+            self._set_lower(j, math.ceil(value - self.tolerance))
+
+    def _activities(self, factors: Dict[int, float]) -> Tuple[float, float]:
+        min_activity = sum(a * (self._lower[j] if a > 0 else self._upper[j]) for (j, a) in factors.items())
+        max_activity = sum(a * (self._upper[j] if a > 0 else self._lower[j]) for (j, a) in factors.items())
+        return (min_activity, max_activity)
+
+    def _tighten_bounds(self, factors: Dict[int, float], bound: float) -> bool:
+        """
+            _tighten_bounds(factors: Dict[int, float], bound: float) -> bool:
+                tightens the bounds of the variables with the row `factors @ x <= bound`: every variable can use
+                at most the slack left by the minimal activity of the other ones, returns whether any bound has changed
+        """
+        min_activity, _ = self._activities(factors)
+        if math.isinf(min_activity):
+            return False
+        changed = False
+        for (j, a) in factors.items():
+            residual = bound - (min_activity - a * (self._lower[j] if a > 0 else self._upper[j]))
+            if a > 0:
+                changed = self._set_upper(j, math.floor(residual / a + self.tolerance)) or changed
+            else:
+                changed = self._set_lower(j, math.ceil(residual / a - self.tolerance)) or changed
+        return changed
+
+    def _tighten_coefficients(self, row: _Row) -> bool:
+        """
+            _tighten_coefficients(row: _Row) -> bool:
+                if the `<=` row is redundant when a variable with two values is at its "loose" value,
+                the factor of the variable (and the bound) can be lowered by the surplus `d`,
+                which keeps the integer solutions and tightens the relaxation
+        """
+        _, max_activity = self._activities(row.factors)
+        if math.isinf(max_activity):
+            return False
+        changed = False
+        for (j, a) in list(row.factors.items()):
+            if self._upper[j] - self._lower[j] != 1:
+                continue
+            surplus = row.bound - (max_activity - abs(a))
+            if not self.tolerance < surplus < abs(a) - self.tolerance:
+                continue
+            # the slack `bound - max_activity` doesn't change
+            shift = -surplus * self._upper[j] if a > 0 else surplus * self._lower[j]
+            row.factors[j] = a - surplus if a > 0 else a + surplus
+            row.bound += shift
+            max_activity += shift
+            self._coefficients += 1
+            changed = True
+        return changed
+
+    def _remove_parallel_rows(self) -> bool:
+        """
+            _remove_parallel_rows() -> bool:
+                keeps only one of the rows with the same factors (up to a positive scale),
+                the tightest one for the inequalities, the different equalities make the model infeasible
+        """
+        kept: Dict[Tuple, _Row] = dict()
+        changed = False
+        for row in list(self._rows):
+            scale = max(abs(a) for a in row.factors.values())
+            key = (row.is_equality, tuple(sorted((j, round(a / scale, 9)) for (j, a) in row.factors.items())))
+            other = kept.get(key)
+            if other is None:
+                kept[key] = row
+                continue
+            other_scale = max(abs(a) for a in other.factors.values())
+            if row.is_equality and abs(row.bound / scale - other.bound / other_scale) > self.tolerance:
+                self.is_infeasible = True
+                return changed
+            if row.bound / scale < other.bound / other_scale:
+                other.factors, other.bound, other.sign = row.factors, row.bound, row.sign
+            self._rows.remove(row)
+            self._parallel += 1
+            changed = True
+        return changed
+
+    def _set_lower(self, j: int, value: float) -> bool:
+        if value <= self._lower[j]:
+            return False
+        self._lower[j] = value
+        self._bounds += 1
+        self.is_infeasible = self.is_infeasible or value > self._upper[j]
+        return True
+
+    def _set_upper(self, j: int, value: float) -> bool:
+        if value >= self._upper[j]:
+            return False
+        self._upper[j] = value
+        self._bounds += 1
+        self.is_infeasible = self.is_infeasible or value < self._lower[j]
+        return True
+
+    def _presolved_model(self) -> Model:
+        original = self.original
+        model = type(original)(original.name)
+        variables: Dict[int, sseexp.Variable] = dict()
+        for var in original.variables:
+            if not self._is_fixed(var.index):
+                variables[var.index] = model.create_variable(var.name)
+
+        def expression(factors: Dict[int, float]) -> sseexp.Expression:
+            indices = sorted(factors)
+            return sseexp.Expression.from_vectors([variables[j] for j in indices], [factors[j] for j in indices])
+
+        for row in self._rows:
+            factors = {j: row.sign * a for (j, a) in row.factors.items()}
+            if row.is_equality:
+                model.add_constraint(expression(factors) == row.bound)
+            elif row.sign < 0:
+                model.add_constraint(expression(factors) >= -row.bound)
+            else:
+                model.add_constraint(expression(factors) <= row.bound)
+
+        if not isinstance(original, BooleanModel):
+            for (j, var) in variables.items():
+                if self._lower[j] > 0:
+                    model.add_constraint(sseexp.Expression.from_vectors([var], [1.0]) >= self._lower[j])
+                if self._upper[j] < math.inf:
+                    model.add_constraint(sseexp.Expression.from_vectors([var], [1.0]) <= self._upper[j])
+
+        objective = dict()
+        for atom in original.objective.expression.atoms:
+            if atom.var.index in variables:
+                objective[atom.var.index] = objective.get(atom.var.index, 0.0) + atom.coefficient
+        model.objective = sseobj.Objective(expression(objective), original.objective.type)
+        return model
@@ -0,0 +1,216 @@
+from __future__ import annotations
+from typing import List, Tuple
+import math
+
+from saport.simplex import matrix as ssmat
+from saport.simplex.expressions import constraint as ssecon
+
+
+class Propagator:
+    """
+        Incremental bound propagation over the rows of a compiled integer model.
+
+        Every constraint is kept as one or two `<=` rows (`>=` rows negated, equalities split) together with
+        its minimal and maximal activity over the current bounds (the infinite contributions are counted separately,
+        so the activities stay finite). A bound change updates only the activities of the rows of its column
+        and queues them, `propagate` then tightens the bounds of the variables of the queued rows
+        (every variable may use at most the slack left by the minimal activity of the others, rounded to the integers)
+        until nothing changes, or until a row can't be satisfied anymore.
+
+        Every bound change is recorded on a trail, `undo` reverts the changes made after the given mark
+        (in the reverse order), so backtracking costs just as much as the changes themselves.
+
+        Attributes
+        ----------
+        lower : List[float]
+            current lower bounds of the variables
+        upper : List[float]
+            current upper bounds of the variables
+        tightenings : int
+            number of the bound changes implied by the rows
+        conflicts : int
+            number of the infeasibilities detected
+
+        Methods
+        -------
+        __init__(matrix: MatrixModel, lower: List[float], upper: List[float]) -> Propagator:
+            creates a propagator of the compiled model with the given initial bounds
+        mark() -> int:
+            returns the current position of the trail
+        undo(mark: int):
+            reverts all the bound changes made after the mark
+        set_lower(variable: int, value: float) -> bool:
+            raises the lower bound of the variable, returns False if the domain becomes empty
+        set_upper(variable: int, value: float) -> bool:
+            lowers the upper bound of the variable, returns False if the domain becomes empty
+        fix(variable: int, value: float) -> bool:
+            sets both bounds of the variable, returns False if the domain becomes empty
+        propagate() -> bool:
+            derives the implied bounds from the queued rows, returns False if the model is infeasible
+        is_fixed(variable: int) -> bool:
+            returns whether both bounds of the variable are equal
+        changes(mark: int) -> List[int]:
+            returns the variables whose bounds were changed after the mark (in the order of the changes)
+    """
+    tolerance: float = 1e-9
+    max_rounds: int = 100
+    lower: List[float]
+    upper: List[float]
+    tightenings: int
+    conflicts: int
+
+    def __init__(self, matrix: ssmat.MatrixModel, lower: List[float], upper: List[float]):
+        self.lower = list(lower)
+        self.upper = list(upper)
+        self.tightenings = 0
+        self.conflicts = 0
+
+        self._rows: List[List[Tuple[int, float]]] = []
+        self._rhs: List[float] = []
+        indptr, indices, data = matrix.indptr.tolist(), matrix.indices.tolist(), matrix.data.tolist()
+        for (i, (bound, sense)) in enumerate(zip(matrix.rhs.tolist(), matrix.senses.tolist())):
+            row = list(zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]))
+            if sense != ssecon.ConstraintType.GE.value:
+                self._add_row(row, bound)
+            if sense != ssecon.ConstraintType.LE.value:
+                self._add_row([(j, -a) for (j, a) in row], -bound)
+
+        self._columns: List[List[Tuple[int, float]]] = [[] for _ in self.lower]
+        for (r, row) in enumerate(self._rows):
+            for (j, a) in row:
+                self._columns[j].append((r, a))
+
+        m = len(self._rows)
+        # finite parts of the activities and the numbers of the infinite contributions
+        self._min_activity = [0.0] * m
+        self._max_activity = [0.0] * m
+        self._min_infinite = [0] * m
+        self._max_infinite = [0] * m
+        for (j, column) in enumerate(self._columns):
+            for (r, a) in column:
+                self._shift(r, a, None, None, self.lower[j], self.upper[j])
+
+        self._trail: List[Tuple[int, float, float]] = []
+        self._queue = set(range(m))
+
+    def mark(self) -> int:
+        return len(self._trail)
+
+    def undo(self, mark: int):
+        while len(self._trail) > mark:
+            (j, lower, upper) = self._trail.pop()
+            self._change(j, lower, upper)
+        self._queue.clear()
+
+    def set_lower(self, variable: int, value: float) -> bool:
+        return self._set_bounds(variable, value, self.upper[variable], False)
+
+    def set_upper(self, variable: int, value: float) -> bool:
+        return self._set_bounds(variable, self.lower[variable], value, False)
+
+    def fix(self, variable: int, value: float) -> bool:
+        return self._set_bounds(variable, value, value, False)
+
+    def is_fixed(self, variable: int) -> bool:
+        return self.lower[variable] == self.upper[variable]
+
+    def changes(self, mark: int) -> List[int]:
+        return [entry[0] for entry in self._trail[mark:]]
+
+    def propagate(self) -> bool:
+        rounds = 0
+        # a chain of the general integer bounds may grow for long, the partial propagation is still valid
+        while len(self._queue) > 0 and rounds < self.max_rounds:
+            rounds += 1
+            queue = sorted(self._queue)
+            self._queue.clear()
+            for r in queue:
+                if not self._propagate_row(r):
+                    self.conflicts += 1
+                    self._queue.clear()
+                    return False
+        return True
+
+    def _add_row(self, row: List[Tuple[int, float]], bound: float):
+        self._rows.append([(j, a) for (j, a) in row if a != 0.0])
+        self._rhs.append(bound)
+
+    def _propagate_row(self, r: int) -> bool:
+        """
+            _propagate_row(r: int) -> bool:
+                checks the row against its minimal activity and tightens the bounds of its variables,
+                returns False if the row can't be satisfied
+        """
+        bound = self._rhs[r]
+        if self._min_infinite[r] == 0 and self._min_activity[r] > bound + self.tolerance:
+            return False
+        # the row can't cut anything while it's satisfied by the maximal activity
+        if self._max_infinite[r] == 0 and self._max_activity[r] <= bound + self.tolerance:
+            return True
+        if self._min_infinite[r] > 1:
+            return True
+        for (j, a) in self._rows[r]:
+            contribution = a * self.lower[j] if a > 0 else a * self.upper[j]
+            if self._min_infinite[r] == 1:
+                # only the variable with the infinite contribution can be bounded
+                if not math.isinf(contribution):
+                    continue
+                rest = self._min_activity[r]
+            else:
+                rest = self._min_activity[r] - contribution
+            residual = (bound - rest) / a
+            if a > 0 and math.floor(residual + self.tolerance) < self.upper[j]:
+                if not self._set_bounds(j, self.lower[j], math.floor(residual + self.tolerance), True):
+                    return False
+            elif a < 0 and math.ceil(residual - self.tolerance) > self.lower[j]:
+                if not self._set_bounds(j, math.ceil(residual - self.tolerance), self.upper[j], True):
+                    return False
+        return True
+
+    def _set_bounds(self, j: int, lower: float, upper: float, implied: bool) -> bool:
+        lower, upper = max(lower, self.lower[j]), min(upper, self.upper[j])
+        if lower > upper:
+            return False
+        if lower == self.lower[j] and upper == self.upper[j]:
+            return True
+        self._trail.append((j, self.lower[j], self.upper[j]))
+        self.tightenings += implied
+        self._change(j, lower, upper)
+        self._queue.update(r for (r, _) in self._columns[j])
+        return True
+
+    def _change(self, j: int, lower: float, upper: float):
+        for (r, a) in self._columns[j]:
+            self._shift(r, a, self.lower[j], self.upper[j], lower, upper)
+        self.lower[j] = lower
+        self.upper[j] = upper
+
+    def _shift(self, r: int, a: float, old_lower: float, old_upper: float, lower: float, upper: float):
+        """
+            _shift(r: int, a: float, old_lower: float, old_upper: float, lower: float, upper: float):
+                replaces the contributions of a variable with the factor `a` to the activities of the row `r`
+                (the old bounds are None when the contributions are added for the first time)
+        """
+        (old_min, old_max) = (None, None) if old_lower is None else self._contributions(a, old_lower, old_upper)
+        (new_min, new_max) = self._contributions(a, lower, upper)
+        if old_min is not None:
+            if math.isinf(old_min):
+                self._min_infinite[r] -= 1
+            else:
+                self._min_activity[r] -= old_min
+            if math.isinf(old_max):
+                self._max_infinite[r] -= 1
+            else:
+                self._max_activity[r] -= old_max
+        if math.isinf(new_min):
+            self._min_infinite[r] += 1
+        else:
+            self._min_activity[r] += new_min
+        if math.isinf(new_max):
+            self._max_infinite[r] += 1
+        else:
+            self._max_activity[r] += new_max
+
+    @staticmethod
+    def _contributions(a: float, lower: float, upper: float) -> Tuple[float, float]:
+        return (a * lower, a * upper) if a > 0 else (a * upper, a * lower)
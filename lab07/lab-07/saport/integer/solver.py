@@ -2,10 +2,12 @@ from abc import ABC, abstractmethod
 from copy import deepcopy
 from saport.simplex import solver as lpsolver
 from saport.integer.model import Model
+from saport.integer.presolve import Presolve, PresolveStatistics
 from saport.integer.solution import Solution
 from saport.simplex.expressions import constraint as ssecon
 from saport.simplex.expressions import expression as sseexp
 from saport.simplex import solution as lpsolution
+from saport.simplex.cancellation import CancellationToken
 import math
 import time 
 
@@ -24,7 +26,15 @@ class IntegerProgrammingSolver(ABC):
         start_time: float
             when the solving started
         interrupted: bool
-            whether solving has been interrupted (by timeout)
+            whether solving has been interrupted (by timeout or cancellation)
+        token: CancellationToken
+            token expiring after the timelimit, shared with the linear programming solvers used during the search
+        presolve: bool
+            whether the model should be presolved before the search (see `Presolve`),
+            the search then works on the presolved model (so do its statistics),
+            the solution is mapped back to the original one
+        presolve_statistics: PresolveStatistics | None
+            reductions made by the presolve in the last solve, None without the presolve
 
         Methods
         -------
@@ -35,10 +45,10 @@ class IntegerProgrammingSolver(ABC):
         wall_time() -> float:
             returns how long solver has been working
         timeout() -> bool:
-            whether solver should stop working due to the timeout
+            whether solver should stop working due to the timeout or cancellation
 
-        solve(model: Model, timelimit: int) -> Solution:
-            solves the given model within a specified timelimit
+        solve(model: Model, timelimit: int, token: CancellationToken = None) -> Solution:
+            solves the given model within a specified timelimit, the search can be also stopped with the token
         _solving
     """
     
@@ -47,21 +57,45 @@ class IntegerProgrammingSolver(ABC):
     interrupted = False
     best_solution = None
     timelimit = 0
+    presolve: bool = False
+    presolve_statistics: PresolveStatistics = None
 
-    def solve(self, model: Model, timelimit: int) -> Solution:
+    def solve(self, model: Model, timelimit: int, token: CancellationToken = None) -> Solution:
         self.timelimit = timelimit
+        self.token = (token if token is not None else CancellationToken()).limited(timelimit)
 
         self.model = model
 
         self.start_timer()
-        self._solving_routine()
+        if self.presolve:
+            self._presolved_routine()
+        else:
+            self._solving_routine()
         self.stop_timer()
 
         return self.best_solution
+
+    def _presolved_routine(self):
+        '''Runs the solving routine on the presolved model and maps its solution back to the original model'''
+        presolved = Presolve(self.model)
+        self.presolve_statistics = presolved.statistics
+        if presolved.is_infeasible:
+            self.best_solution = Solution.infeasible(self.model)
+        elif len(presolved.model.variables) == 0:
+            self.best_solution = presolved.fixed_solution()
+        else:
+            self.model = presolved.model
+            self._solving_routine()
+            self.model = presolved.original
+            self.best_solution = presolved.postsolve(self.best_solution)
            
     def _lower_bound(self):
         return self.best_solution.objective_value() if self.best_solution is not None and self.best_solution.has_assignment() else float('-inf') 
 
+    def _lp_solver(self) -> lpsolver.Solver:
+        '''Simplex solver stopping between pivots when the integer solver times out'''
+        return lpsolver.Solver(self.token)
+
     @abstractmethod
     def _solving_routine(self):
         '''This method should be implemented in every integer programming solver'''
@@ -76,4 +110,4 @@ class IntegerProgrammingSolver(ABC):
         return time.time() - self.start_time
 
     def timeout(self) -> bool:
-        return self.wall_time() > self.timelimit
+        return self.wall_time() > self.timelimit or self.token.is_cancelled()
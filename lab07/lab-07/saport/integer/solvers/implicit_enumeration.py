@@ -1,9 +1,13 @@
 from copy import deepcopy
-from typing import Set, Dict, List
+from typing import Set, Dict, List, Tuple
+import math
+import numpy as np
 
 from saport.integer.solver import IntegerProgrammingSolver
 from saport.integer.model import BooleanModel
+from saport.integer.propagation import Propagator
 from saport.integer.solution import Solution
+from saport.simplex import matrix as ssmat
 from saport.simplex.expressions import expression as sseexp
 from saport.simplex.expressions import constraint as ssecon
 from saport.simplex.expressions import expression as sseexp
@@ -13,20 +17,149 @@ class UnsupportedModel(Exception):
     pass
 
 
+class _Slacks:
+    """
+        _Slacks(model: BooleanModel):
+            the constraints of the enumerable model (all `<=`) compiled into a dense matrix, with the activities
+            of the best possible assignment (the free variables are 0) and the optimistic activities
+            (the free variables with the negative factors are 1), both updated by a single column
+            when a variable is fixed or released, so the checks of a node take O(m) instead of O(nm),
+            the partial assignment itself is kept in two boolean arrays: `fixed` and `values`
+    """
+    tolerance: float = 1e-9
+
+    def __init__(self, model: BooleanModel):
+        matrix = ssmat.MatrixModel.from_model(model)
+        # the columns are contiguous, so fixing a variable touches one block of memory
+        self.columns = np.ascontiguousarray(matrix.dense().T)
+        self.bounds = np.asarray(matrix.rhs, dtype=float)
+        self.factors = np.asarray(matrix.objective, dtype=float)
+        self.negative = np.minimum(self.columns, 0.0)
+        self.activity = np.zeros(len(self.bounds))
+        self.optimistic = self.negative.sum(axis=0)
+        self.fixed = np.zeros(len(self.factors), dtype=bool)
+        self.values = np.zeros(len(self.factors), dtype=bool)
+        self.objective = 0.0
+        self.free_count = len(self.factors)
+
+    def fix(self, j: int, value: int):
+        self.fixed[j] = True
+        self.free_count -= 1
+        self.values[j] = value
+        self.optimistic -= self.negative[j]
+        if value:
+            self.activity += self.columns[j]
+            self.optimistic += self.columns[j]
+            self.objective += self.factors[j]
+
+    def release(self, j: int):
+        self.fixed[j] = False
+        self.free_count += 1
+        self.optimistic += self.negative[j]
+        if self.values[j]:
+            self.values[j] = False
+            self.activity -= self.columns[j]
+            self.optimistic -= self.columns[j]
+            self.objective -= self.factors[j]
+
+    def assignment(self) -> List[int]:
+        return self.values.astype(int).tolist()
+
+    def is_satisfiable(self) -> bool:
+        return bool((self.optimistic <= self.bounds + self.tolerance).all())
+
+    def infeasibility(self) -> float:
+        return float(np.maximum(self.activity - self.bounds, 0.0).sum())
+
+    def branching_variable(self) -> int:
+        """
+            branching_variable() -> int:
+                returns the free variable with the least total infeasibility when set to 1
+                (the smallest index on a tie), all the candidates are evaluated at once
+        """
+        free = np.flatnonzero(~self.fixed)
+        violations = self.activity + self.columns[free] - self.bounds
+        return int(free[np.argmin(np.maximum(violations, 0.0).sum(axis=1))])
+
+    def best_completion(self, completions: np.ndarray, chunk: int) -> Tuple[float, List[int]]:
+        """
+            best_completion(completions: numpy.Array, chunk: int) -> Tuple[float, List[int]] | None:
+                evaluates all the completions of the free variables (the rows of the 0/1 matrix) at once,
+                `chunk` rows at a time, returns the best feasible one (objective and the whole assignment),
+                None if none is feasible
+        """
+        free = np.flatnonzero(~self.fixed)
+        columns, factors = self.columns[free], self.factors[free]
+        best_objective, best_row = -math.inf, None
+        for start in range(0, len(completions), chunk):
+            bits = completions[start:start + chunk]
+            feasible = ((self.activity + bits @ columns) <= self.bounds + self.tolerance).all(axis=1)
+            if not feasible.any():
+                continue
+            objectives = np.where(feasible, bits @ factors, -math.inf)
+            row = int(np.argmax(objectives))
+            if objectives[row] > best_objective:
+                best_objective, best_row = float(objectives[row]), bits[row]
+        if best_row is None:
+            return None
+        assignment = self.values.astype(int)
+        assignment[free] = best_row
+        return (self.objective + best_objective, assignment.tolist())
+
+
 class ImplicitEnumerationSolver(IntegerProgrammingSolver):
     """
         Naive branch and bound solver for boolean integer programming problems
         using an implicit enumeration approach.
 
+        The search keeps the compiled constraints with the activities of the partial assignment (see `_Slacks`),
+        which are updated by a column when a variable is fixed or released, instead of evaluating the expressions.
+
+        The search is iterative (with an explicit stack), so the depth of the tree isn't limited by the recursion.
+        Once at most `leaf_size` variables are free, all their completions are evaluated at once as a 0/1 matrix
+        (in chunks of `leaf_chunk` elements of the activity matrix), instead of enumerating them node by node.
+
+        With the propagation (see `Propagator`) every branching decision is propagated through the constraints:
+        the implied fixings join the partial assignment and the branches with an empty domain are pruned at once.
+        The changes are undone through the propagator's trail when the search backtracks.
+
         Attributes:
         ----------
+        propagation: bool
+            whether the branching decisions should be propagated
+        leaf_size: int
+            maximal number of the free variables enumerated at once (0 disables the leaf enumeration)
+        leaf_chunk: int
+            maximal number of the elements of the activity matrix evaluated at once by the leaf enumeration
+        nodes: int
+            number of the nodes evaluated in the last solve (a subtree solved by the leaf enumeration counts as one)
+        leaf_enumerations: int
+            number of the subtrees solved by the leaf enumeration in the last solve
         _flipped_variables: Set[Variable]
             variables that had to be "flipped" in order to get an enumerable model
+
+        Methods:
+        --------
+        __init__(presolve: bool = False, propagation: bool = False) -> ImplicitEnumerationSolver:
+            constructs a new solver, optionally presolving the model before the search (see `Presolve`)
+            and propagating the branching decisions
     """
+    leaf_size: int = 12
+    leaf_chunk: int = 1 << 20
+    propagation: bool
+    nodes: int
+    leaf_enumerations: int
     _flipped_variables: Set[sseexp.Variable]
 
-    def __init__(self):
+    def __init__(self, presolve: bool = False, propagation: bool = False):
         self._flipped_variables = set()
+        self.presolve = presolve
+        self.propagation = propagation
+        self._propagator = None
+        self._slacks = None
+        self._completions = dict()
+        self.nodes = 0
+        self.leaf_enumerations = 0
 
     def _solving_routine(self):
         if not isinstance(self.model, BooleanModel):
@@ -34,7 +167,22 @@ class ImplicitEnumerationSolver(IntegerProgrammingSolver):
                 f"the model of type {type(self.model)} is not supported by the implicit enumeration solver")
         self.model.simplify()
         self._enum_model = self._preprocess_model(deepcopy(self.model))
-        self._branch_and_bound(dict(), set(self._enum_model.variables))
+        n = len(self._enum_model.variables)
+        feasible = True
+        self._propagator = None
+        self._slacks = _Slacks(self._enum_model)
+        self._trail, self._trail_size = [0] * n, 0
+        self.nodes = 0
+        self.leaf_enumerations = 0
+        if self.propagation:
+            self._propagator = Propagator(ssmat.MatrixModel.from_model(self._enum_model), [0] * n, [1] * n)
+            feasible = self._propagator.propagate()
+            for j in self._propagator.changes(0):
+                self._slacks.fix(j, int(self._propagator.lower[j]))
+                self._trail[self._trail_size] = j
+                self._trail_size += 1
+        if feasible:
+            self._branch_and_bound()
 
         if self.best_solution is None:
             self.best_solution = Solution.infeasible(self.model)
@@ -89,148 +237,163 @@ class ImplicitEnumerationSolver(IntegerProgrammingSolver):
                       for var in self._enum_model.variables]
         return Solution.with_assignment(self.model, assignment, is_optimal=not self.interrupted)
 
-    def _branch_and_bound(self, partial_assignment: Dict[sseexp.Variable, int], left: Set[sseexp.Variable]) -> None:
+    def _branch_and_bound(self) -> None:
         """
             Performs a branch and bound search using implicit enumeration strategy.
-            This recursive method returns `None` and should just update the self.best_solution. 
-
-            Arguments:
-            ----------
-            partial_assignment: Dict[Variable, int]
-                variables with already assigned (integer) values
-            left: Set[Variable]
-                variables still left to be assigned
-        """
-        # TODO: 1) find the best possible assignment containing the partial assignment[1]
-        #          then the upper bound is the objective value[2] of this assignment
-        #       2) if the upper bound is lower than the current lower bound[2], then the branch may be pruned
-        #          as in every other branch and bound algorithm 
-        #       3) then check if the partial assignment is still satisfiable[3]
-        #          if it's not, then the branch should be pruned
-        #       4) then check if it's feasible solution[4]
-        #          if yes, then prune the branch and update the self.best_solution as necessary[5]
-        #       5) check for timeout[6] and if it's the case, set self.interrupted to True and finish
-        #       6) otherwise, choose the branching variable[7] and branch on it
-        #          remember to branch with updated "left" and "partial_assignment"
-        #
-        # [1] `self._best_possible_assignment(<partial assignment>)`
-        # [2] `self._enum_model.objective.evaluate(<assignment>)``
-        # [3] `self._lower_bound()` which is inherited from the `Solver` class
-        # [4] `self._is_model_satisfiable_with_partial_assignment(<partial assignment>)`
-        # [5] `self._total_infeasibilty(<best possible assignment>)` as to be equal zero
-        # [6] `Solution.with_assignment(self._enum_model, <best possible assignment>, False)`
-        # [7] `self.timeout()`
-        # [8] `self._select_var_to_branch(left, partial_assignment)`
-        upper_bound = self._enum_model.objective.evaluate(self._best_possible_assignment(partial_assignment))
-        if upper_bound < self._lower_bound():
-            return
-        if not self._is_model_satisfiable_with_partial_assignment(partial_assignment):
-            return
-        if self._total_infeasibility(self._best_possible_assignment(partial_assignment)) == 0:
-            self.best_solution = Solution.with_assignment(self._enum_model, self._best_possible_assignment(partial_assignment), False)
+            This method returns `None` and should just update the self.best_solution.
+
+            The search is iterative, the explicit stack keeps for every level the branching variable,
+            the value of its current branch and the positions of the trails
+            (of the fixed variables and of the propagator) before the branch.
+            The stack and the trail are preallocated for the depth of n, so going down or back doesn't allocate
+            and the depth isn't limited by the recursion.
+            The search starts from the variables already fixed in the slacks (and pushed on the trail).
+        """
+        n = len(self._enum_model.variables)
+        self._incumbent = -math.inf
+        branching = self._evaluate_node()
+        if branching < 0:
             return
+        variables, values, marks, propagator_marks = [0] * (n + 1), [0] * (n + 1), [0] * (n + 1), [0] * (n + 1)
+        variables[0], values[0] = branching, -1
+        marks[0], propagator_marks[0] = self._trail_size, self._propagator_mark()
+        top = 1
+        while top > 0:
+            level = top - 1
+            self._backtrack(marks[level], propagator_marks[level])
+            values[level] += 1
+            if values[level] > 1:
+                top -= 1
+                continue
+            if not self._assign(variables[level], values[level]):
+                continue
+            branching = self._evaluate_node()
+            if self.interrupted:
+                return
+            if branching >= 0:
+                variables[top], values[top] = branching, -1
+                marks[top], propagator_marks[top] = self._trail_size, self._propagator_mark()
+                top += 1
+
+    def _evaluate_node(self) -> int:
+        """
+            _evaluate_node() -> int:
+                bounds and checks the current partial assignment (updating the incumbent if it's feasible),
+                returns the variable to branch on, or -1 if the node is pruned (or solved by the leaf enumeration)
+        """
+        # the slacks follow the partial assignment, so every check below takes O(m) (see `_Slacks`)
+        self.nodes += 1
+        slacks = self._slacks
+        if slacks.objective < self._incumbent:
+            return -1
+        if not slacks.is_satisfiable():
+            return -1
+        if slacks.infeasibility() <= slacks.tolerance:
+            self._update_incumbent(slacks.objective, slacks.assignment())
+            return -1
         if self.timeout():
             self.interrupted = True
-            return
-        else:
-            var = self._select_var_to_branch(left, partial_assignment)
-            left.remove(var)
-            partial_assignment[var] = 0
-            self._branch_and_bound(partial_assignment, left)
-            partial_assignment[var] = 1
-            self._branch_and_bound(partial_assignment, left)
+            return -1
+        if slacks.free_count <= self.leaf_size:
+            self.leaf_enumerations += 1
+            chunk = max(1, self.leaf_chunk // (len(slacks.bounds) + 1))
+            best = slacks.best_completion(self._leaf_completions(slacks.free_count), chunk)
+            if best is not None and best[0] >= self._incumbent:
+                self._update_incumbent(*best)
+            return -1
+        return slacks.branching_variable()
+
+    def _update_incumbent(self, objective: float, assignment: List[int]):
+        self.best_solution = Solution.with_assignment(self._enum_model, assignment, False)
+        self._incumbent = objective
+
+    def _leaf_completions(self, k: int) -> np.ndarray:
+        """
+            _leaf_completions(k: int) -> numpy.Array:
+                returns (and caches) the 2^k x k matrix of all the 0/1 assignments of k variables
+        """
+        if k not in self._completions:
+            rows = np.arange(2 ** k, dtype=np.int64)[:, None]
+            self._completions[k] = ((rows >> np.arange(k, dtype=np.int64)) & 1).astype(float)
+        return self._completions[k]
 
+    def _assign(self, j: int, value: int) -> bool:
+        """
+            _assign(j: int, value: int) -> bool:
+                fixes the variable (and the variables implied by the propagation) and pushes them on the trail,
+                returns False if the propagation has found the branch infeasible
+        """
+        if self._propagator is None:
+            self._slacks.fix(j, value)
+            self._trail[self._trail_size] = j
+            self._trail_size += 1
+            return True
+        mark = self._propagator.mark()
+        if not self._propagator.fix(j, value) or not self._propagator.propagate():
+            self._propagator.undo(mark)
+            return False
+        for k in self._propagator.changes(mark):
+            self._slacks.fix(k, int(self._propagator.lower[k]))
+            self._trail[self._trail_size] = k
+            self._trail_size += 1
+        return True
 
-    def _best_possible_assignment(self, partial_assignment: Dict[sseexp.Variable, int]) -> List[int]:
-        # TODO: This methods create an assignment (list of integers corresponding to the variables[1])    
-        #       satisfying following conditions:
-        #       - if the variable has a value in `partial_assignment` it should be the same in the output assignment
-        #       - otherwise the value should be `0`
-        #
-        # [1] self._enum_model.variables
-        assignment = [0] * len(self._enum_model.variables)
-        for item in self._enum_model.variables:
-            if item in partial_assignment.keys():
-                assignment[item.index] = partial_assignment[item]
-
-        return assignment
+    def _backtrack(self, mark: int, propagator_mark: int):
+        """
+            _backtrack(mark: int, propagator_mark: int):
+                releases the variables fixed after the positions of the trails
+        """
+        while self._trail_size > mark:
+            self._trail_size -= 1
+            self._slacks.release(self._trail[self._trail_size])
+        if self._propagator is not None:
+            self._propagator.undo(propagator_mark)
 
-    def _is_model_satisfiable_with_partial_assignment(self, partial_assignment: Dict[sseexp.Variable, int]) -> bool:
-        # TODO: Check for each constraint whether the partial assignments can be extended to satisfy the constraint
-        #       1) create an "optimistic" assignment based on the partial_assignment and the tested constraint
-        #          - variables fixed in the assignment should have value as fixed
-        #          - other ones should be 1 if they have negative coefficient in the constraint[1], otherwise 0
-        #       2) evaluate the constraint expression[2] and check if it satisfies the bound[3]
-        #       3) if at least one constraint can't be satisfied, the model is not satisfiable
-        #
-        # [1] constraint.expression.coefficients(self._enum_model)
-        # [2] constraint.expression.evaluate(<assignment>)
-        # [3] constraint.bound (remember that enum model contains only LE constraints)
-
-        for constraint in self._enum_model.constraints:
-            cons_coef = constraint.expression.coefficients(self._enum_model)
-            out_list = [0] * len(cons_coef)
-            counter = 0
-            for item in constraint.expression.atoms:
-                if item.var in partial_assignment.keys():
-                    out_list[counter] = partial_assignment[item.var]
-                else:
-                    if item.coefficient < 0:
-                        out_list[counter] = 1
-                    else:
-                        out_list[counter] = 0
-                counter += 1
-            if not constraint.expression.evaluate(out_list) <= constraint.bound:
-                return False
+    def _propagator_mark(self) -> int:
+        return 0 if self._propagator is None else self._propagator.mark()
 
-        return True
+    def _partial_slacks(self, partial_assignment: Dict[sseexp.Variable, int]) -> _Slacks:
+        """
+            _partial_slacks(partial_assignment: Dict[Variable, int]) -> _Slacks:
+                compiles the enumerable model into new slacks with the partial assignment fixed
+        """
+        slacks = _Slacks(self._enum_model)
+        for (var, value) in partial_assignment.items():
+            slacks.fix(var.index, value)
+        return slacks
 
-    def _select_var_to_branch(self, left: Set[sseexp.Variable], partial_assignment: Dict[sseexp.Variable,
-                                                                                         int]) -> sseexp.Variable:
-        # TODO: for every variable in the problem, check what would be the total infeasibility[1], 
-        #       if the variable was assigned 1 and all the remaining variables were set to 0[2]
-        # 
-        #       Return variable with the least infeasibility (replace left.pop()).
-        #       I case of a tie choose variable with the smallest index.
-        #
-        # [1] self._total_infeasibility(<assignment>)
-        # [2] self._best_possible_assignment(<partial assignment>)
-
-        best_yet = [None, 10000000000000]
-        for var in self._enum_model.variables:
-            if var in partial_assignment:
-                continue
-            partial_assignment[var] = 1
-            loop_result = self._total_infeasibility(self._best_possible_assignment(partial_assignment))
-
-            if loop_result < best_yet[1]:
-                best_yet[1] = loop_result
-                best_yet[0] = var
-
-            if loop_result == best_yet[1]:
-                if best_yet[0].index < var.index:
-                    pass
-                else:
-                    best_yet[1] = loop_result
-                    best_yet[0] = var
-            partial_assignment.pop(var)
-
-        return best_yet[0]
-
-    def _total_infeasibility(self, assignment: List[int]) -> int:
-        total_infeasibility = 0
-        # TODO: check how much the constraints are violated.
-        #       For each constraint evaluate the constraint expression[1] 
-        #       and check how much its value surraise NotImplementedError()es the bound.
-        #       Then add the result to the total_infeasibility
-        #
-        # [1] constraint.expression.evaluate(<assignment>)
-        for constraint in self._enum_model.constraints:
-            value = constraint.expression.evaluate(assignment) - constraint.bound
-            if value < 0:
-                continue
-            total_infeasibility += value
+    def _best_possible_assignment(self, partial_assignment: Dict[sseexp.Variable, int]) -> List[int]:
+        """
+            _best_possible_assignment(partial_assignment: Dict[Variable, int]) -> List[int]:
+                returns the assignment of the variables[1], the values of `partial_assignment`
+                and 0 for the free variables, the search itself reads it from the slacks (see `_Slacks.assignment`)
 
-        return total_infeasibility
+                [1] self._enum_model.variables
+        """
+        return self._partial_slacks(partial_assignment).assignment()
 
-    
+    def _is_model_satisfiable_with_partial_assignment(self, partial_assignment: Dict[sseexp.Variable, int]) -> bool:
+        """
+            _is_model_satisfiable_with_partial_assignment(partial_assignment: Dict[Variable, int]) -> bool:
+                checks whether every constraint can be satisfied by the optimistic completion of `partial_assignment`
+                (the free variables with the negative coefficients are 1, the other ones 0),
+                see `_Slacks.is_satisfiable`
+        """
+        return self._partial_slacks(partial_assignment).is_satisfiable()
+
+    def _select_var_to_branch(self, left: Set[sseexp.Variable],
+                              partial_assignment: Dict[sseexp.Variable, int]) -> sseexp.Variable:
+        """
+            _select_var_to_branch(left: Set[Variable], partial_assignment: Dict[Variable, int]) -> Variable:
+                returns the variable outside of `partial_assignment` with the least total infeasibility
+                when set to 1 (the smallest index on a tie), see `_Slacks.branching_variable`
+        """
+        return self._enum_model.variables[self._partial_slacks(partial_assignment).branching_variable()]
+
+    def _total_infeasibility(self, assignment: List[int]) -> float:
+        """
+            _total_infeasibility(assignment: List[int]) -> float:
+                returns the sum of the violations of the constraints by the assignment, see `_Slacks.infeasibility`
+        """
+        variables = self._enum_model.variables
+        return self._partial_slacks({var: assignment[var.index] for var in variables}).infeasibility()
@@ -1,57 +1,679 @@
 from copy import deepcopy
 from saport.integer.solver import IntegerProgrammingSolver
-from saport.simplex import solver as lpsolver
-from saport.integer.model import Model
+from saport.integer.model import BooleanModel, Model
 from saport.integer.solution import Solution
-from saport.simplex.expressions import constraint as ssecon
+from saport.integer.nodes import BestBoundSelection, BoundChange, Node, NodeSelection
+from saport.integer import covers, cuts
+from saport.integer.branching import BranchingRule, FirstFractionalBranching
+from saport.integer.heuristics import HeuristicCall, HeuristicStatistics, IncumbentRecord, PrimalHeuristic
+from saport.integer.propagation import Propagator
 from saport.simplex.expressions import expression as sseexp
+from saport.simplex.expressions import objective as sseobj
+from saport.simplex import matrix as ssmat
 from saport.simplex import solution as lpsolution
+from saport.simplex import tableau as sstab
+from typing import Dict, List, Tuple
 import math
+import numpy as np
+import time
 
 class LinearRelaxationSolver(IntegerProgrammingSolver):
     """
-        Naive branch and bound solver for general integer programming problems
-        using a linear relaxation approach. 
-    """  
+        Branch and bound solver for general integer programming problems
+        using a linear relaxation approach.
+
+        The open nodes are kept in a queue ordered by the node selection rule (best-bound by default).
+        Every node stores only its branching bound change.
+        The node relaxation is warm-started from the parent's optimal tableau:
+        the branching bound is added as a new row and a few dual simplex pivots restore the optimality.
+        The parent's tableau is kept only until both of its children are processed (or pruned).
+        Without the warm start (or for the root) the node model is rebuilt from the root model and solved from scratch.
+        Bounds inside the search are kept in the maximization sense, `upper_bound()` and `gap()` report them
+        in the sense of the model and can be called at any moment of the search.
+
+        The relaxations can be tightened with rounds of Gomory mixed integer cuts read from their final tableaux
+        and (for the boolean models) lifted cover inequalities of the knapsack rows,
+        at the root and optionally at the nodes (branch and cut). The cuts are added as the tableau rows, so they are
+        inherited by the subtree through the warm start (without it no cuts are generated), the root ones are global.
+        A round stops the generation if it doesn't improve the bound,
+        the inactive cuts are dropped after aging (see `CutPool`).
+
+        The branching variable is chosen among the fractional ones by the branching rule (see `BranchingRule`),
+        the first fractional variable by default, the rule is notified about the bounds of the processed nodes.
+
+        The primal heuristics (see `PrimalHeuristic`) are run on the fractional relaxations at the root
+        and at every `heuristic_frequency`-th level of the tree,
+        their solutions seed the incumbent, so the pruning starts early.
+
+        With the propagation (see `Propagator`) the branching bounds of a node are propagated through the rows
+        before its relaxation is solved: the nodes with an empty domain are closed without solving the relaxation,
+        the implied bounds violated by the relaxation solution are added to its tableau (so the subtree inherits them).
+        The propagator is shared by all the nodes, it's reset to the root bounds through its trail.
+
+        With the reduced-cost fixing the final tableau of every fractional node (the root included) bounds the variables
+        of the solutions better than the incumbent: every basic variable is an affine function of the nonbasic columns
+        and a nonbasic column can't grow by more than the gap (between the node bound and the incumbent)
+        divided by its reduced cost.
+        The bounds tighter than the node's own ones are added to its tableau
+        and inherited by its children (see `Node.fixings`),
+        a variable fixed this way is never branched on in the subtree.
+
+        Attributes:
+        ----------
+        selection: NodeSelection
+            rule choosing the next open node to process
+        branching: BranchingRule
+            rule choosing the branching variable
+        warm_start: bool
+            whether the node relaxations should be re-optimized from the parent's tableau
+        nodes: int
+            number of the processed nodes
+        lp_pivots: int
+            total number of the simplex pivots made by the node relaxations
+        cut_rounds: int
+            number of the cut generation rounds at the root
+        node_cut_rounds: int
+            number of the cut generation rounds at the other nodes
+        cuts_per_round: int
+            maximal number of the cuts added in a single round
+        cut_age_limit: int
+            number of the rounds an inactive cut is kept
+        gomory_cuts: bool
+            whether the Gomory mixed integer cuts should be generated
+        cover_cuts: bool
+            whether the lifted cover inequalities should be generated (only for the boolean models)
+        cut_statistics: List[CutRound]
+            statistics of the cut generation rounds of the last solve, e.g. the bound improvement per round
+        heuristics: List[PrimalHeuristic]
+            primal heuristics run at the nodes, in the given order
+        heuristic_frequency: int
+            the heuristics are run at the nodes with the depth divisible by the frequency
+        heuristic_statistics: Dict[str, HeuristicStatistics]
+            statistics of the heuristics of the last solve,
+            e.g. the number of the nodes pruned thanks to their solutions
+        incumbents: List[IncumbentRecord]
+            improvements of the incumbent in the last solve, with the heuristic (or the branching) which found them
+        propagation: bool
+            whether the node bounds should be propagated
+        propagated_nodes: int
+            number of the nodes proven infeasible by the propagation (without solving their relaxations)
+        implied_bounds: int
+            number of the implied bounds added to the relaxations
+        reduced_cost_fixing: bool
+            whether the variables should be fixed with the reduced costs of the node relaxations
+        reduced_cost_fixings: int
+            number of the bounds derived from the reduced costs
+        avoided_branches: int
+            number of the variables fixed at a single value by the reduced costs, so their branchings were avoided
+
+        Methods:
+        --------
+        __init__(selection: NodeSelection | None = None, warm_start: bool = True, cut_rounds: int = 0,
+                 node_cut_rounds: int = 0, heuristics: List[PrimalHeuristic] | None = None, presolve: bool = False,
+                 propagation: bool = False,
+                 branching: BranchingRule | None = None, reduced_cost_fixing: bool = False) -> LinearRelaxationSolver:
+            constructs a new solver using the given node selection rule, the cut generation settings,
+            the primal heuristics
+            (none by default, see `default_heuristics`), optionally presolving the model (see `Presolve`)
+            and propagating the node bounds, branching with the given rule (the first fractional variable by default),
+            optionally fixing the variables with the reduced costs
+        lower_bound() -> float:
+            returns the objective value of the incumbent (in the model sense, `-inf`/`inf` without one)
+        upper_bound() -> float:
+            returns the global bound, no solution can be better than it (in the model sense)
+        gap() -> float:
+            returns the relative optimality gap, `inf` without an incumbent, 0 once the search is complete
+        root_gap_closed() -> float | None:
+            returns the fraction of the root integrality gap (between the relaxation and the incumbent)
+            closed by the cuts,
+            None without an incumbent or if there is no gap
+    """
+    integrality_tolerance = 1e-6
+    cuts_per_round: int = 10
+    cut_age_limit: int = 3
+    gomory_cuts: bool = True
+    cover_cuts: bool = True
+    heuristic_frequency: int = 10
+    selection: NodeSelection
+    branching: BranchingRule
+    warm_start: bool
+    nodes: int
+    lp_pivots: int
+    cut_rounds: int
+    node_cut_rounds: int
+    cut_statistics: List[cuts.CutRound]
+    heuristics: List[PrimalHeuristic]
+    heuristic_statistics: Dict[str, HeuristicStatistics]
+    incumbents: List[IncumbentRecord]
+    propagation: bool
+    propagated_nodes: int
+    implied_bounds: int
+    reduced_cost_fixing: bool
+    reduced_cost_fixings: int
+    avoided_branches: int
+
+    def __init__(self,
+                 selection: NodeSelection = None,
+                 warm_start: bool = True,
+                 cut_rounds: int = 0,
+                 node_cut_rounds: int = 0,
+                 heuristics: List[PrimalHeuristic] = None,
+                 presolve: bool = False,
+                 propagation: bool = False,
+                 branching: BranchingRule = None,
+                 reduced_cost_fixing: bool = False):
+        self.selection = selection if selection is not None else BestBoundSelection()
+        self.branching = branching if branching is not None else FirstFractionalBranching()
+        self.warm_start = warm_start
+        self.cut_rounds = cut_rounds
+        self.node_cut_rounds = node_cut_rounds
+        self.heuristics = heuristics if heuristics is not None else []
+        self.presolve = presolve
+        self.propagation = propagation
+        self.reduced_cost_fixing = reduced_cost_fixing
+        self.nodes = 0
+        self.lp_pivots = 0
+        self.cut_statistics = []
+        self.heuristic_statistics = dict()
+        self.incumbents = []
+        self.propagated_nodes = 0
+        self.implied_bounds = 0
+        self.reduced_cost_fixings = 0
+        self.avoided_branches = 0
+        self._incumbent_source = None
+        self._knapsack_rows = None
+        self._propagator = None
+        self._warm_starts = dict()
+        self._sense = 1.0
+        self._active = []
 
     def _solving_routine(self):
-        self._branch_and_bound(self.model)
-        self.best_solution = Solution.with_linear_solution(self.model, self.best_solution, not self.interrupted)
-           
-    def _branch_and_bound(self, model: Model):
-        # TODO: implement a branch and bound procedure analogically to the one in the knapsack solver
-        #       1) use simplex[1] to find the upper bound[2]
-        #       2) remember to handle infeasible and unbounded models[3]
-        #       3) check the lower bound[4] and compare with the upper one
-        #       4) look for a variable with float value[5]
-        #          if there is none, update the `self.best_solution` if the solution is better than the old one
-        #       5) check for timeout[6] and set the `self.interrupted` to `True` when it happens
-        #       6) branch on the variable with the float value:
-        #          - every branch has a different model exluding the current float value[7]
-        #                     
-        # [1] `lpsolver.Solver().solve(<model>)` 
-        # [2] `solution.objective_value()`
-        # [3] `solution.is_feasible`, `solution.is_bounded`, `solution.has_assignment()`
-        # [4] `self._lower_bound()` inherited from the `Solver` class
-        # [5] `self.find_float_assignment(<solution>)`
-        # [6] `self.timeout()`
-        # [7] `self._model_with_new_constraint(<model>, <constraint>)`
-        
-        raise NotImplementedError() 
-
-        
+        self._start_search()
+        while len(self.selection) > 0 and not self._unbounded:
+            if self.timeout():
+                self.interrupted = True
+                break
+            node = self.selection.pop()
+            if node.bound <= self._incumbent_score():
+                self._release(node)
+                self._count_pruned(1)
+                continue
+            self._active = [node]
+            self._branch_and_bound(node)
+            self._active = []
+        self._finish_search()
+
+    def _start_search(self):
+        """
+            _start_search():
+                resets the statistics and the frontier, so it contains only the root node
+        """
+        self.best_solution = None
+        self.interrupted = False
+        self.nodes = 0
+        self.lp_pivots = 0
+        self.cut_statistics = []
+        self.heuristic_statistics = dict()
+        self.incumbents = []
+        self.propagated_nodes = 0
+        self.implied_bounds = 0
+        self.reduced_cost_fixings = 0
+        self.avoided_branches = 0
+        self._incumbent_source = None
+        self._knapsack_rows = None
+        self._warm_starts = dict()
+        self._unbounded = False
+        self._prepare_objective()
+        self.branching.reset()
+        self.selection.clear()
+        self.selection.push(Node(math.inf, math.inf))
+
+    def _prepare_objective(self):
+        self._sense = -1.0 if self.model.objective.type == sseobj.ObjectiveType.MIN else 1.0
+        self._objective = [self._sense * c for c in self.model.objective.expression.coefficients(self.model)]
+        needs_matrix = len(self.heuristics) > 0 or self.propagation
+        self._matrix = ssmat.MatrixModel.from_model(self.model) if needs_matrix else None
+        self._propagator = None
+        if self.propagation:
+            n = len(self.model.variables)
+            upper = 1.0 if isinstance(self.model, BooleanModel) else math.inf
+            self._propagator = Propagator(self._matrix, [0.0] * n, [upper] * n)
+            self._root_feasible = self._propagator.propagate()
+            self._root_mark = self._propagator.mark()
+
+    def _finish_search(self):
+        """
+            _finish_search():
+                converts the best linear solution found into the integer one
+        """
+        self._warm_starts = dict()
+        if self._unbounded:
+            self.best_solution = Solution.unbounded(self.model)
+        elif self.best_solution is None:
+            self.best_solution = Solution.infeasible(self.model)
+        else:
+            self.best_solution = Solution.with_linear_solution(self.model, self.best_solution, not self.interrupted)
+
+    def _branch_and_bound(self, node: Node):
+        """
+            Processes a single node: solves its linear relaxation, updates the incumbent or pushes the children.
+        """
+        self.nodes += 1
+        solution = self._solve_relaxation(node)
+        if solution.is_interrupted:
+            # the node stays open, so the global bound remains valid
+            self.interrupted = True
+            self.selection.push(node)
+            return
+        self._release(node)
+        if not solution.is_bounded:
+            self._unbounded = True
+            return
+        if not solution.is_feasible:
+            self.branching.observe(node, -math.inf)
+            return
+
+        bound = self._sense * solution.objective_value()
+        self.branching.observe(node, bound)
+        if bound <= self._incumbent_score():
+            self._count_pruned(1)
+            return
+
+        solution = self._tighten(node, solution)
+        if not solution.is_feasible:
+            return
+        bound = self._sense * solution.objective_value()
+        if bound <= self._incumbent_score():
+            self._count_pruned(1)
+            return
+
+        if self._find_float_assignment(solution) is None:
+            self._update_incumbent(solution, bound)
+            return
+        self._apply_heuristics(self._run_heuristics(node, solution, self._incumbent_score()))
+        if bound <= self._incumbent_score():
+            self._count_pruned(1)
+            return
+
+        solution, fixings = self._fix_reduced_costs(node, solution, bound, self._incumbent_score())
+        if not solution.is_feasible:
+            self._count_pruned(1)
+            return
+        bound = self._sense * solution.objective_value()
+        if bound <= self._incumbent_score():
+            self._count_pruned(1)
+            return
+        changes = self._branching(node, solution)
+        if len(changes) == 0:
+            self._update_incumbent(solution, bound)
+            return
+        self._branch(node, bound, self._estimate(solution, bound), changes, solution.tableau, fixings)
+
+    def _update_incumbent(self, solution: lpsolution.Solution, bound: float, source: str = "branching"):
+        self.best_solution = solution
+        self._incumbent_source = source
+        self.incumbents.append(IncumbentRecord(source, self.nodes, float(self._sense * bound)))
+        pruned = self.selection.prune(bound)
+        for node in pruned:
+            self._release(node)
+        self._count_pruned(len(pruned))
+        self.selection.incumbent_found()
+
+    def _run_heuristics(self, node: Node, solution: lpsolution.Solution, cutoff: float) -> List[HeuristicCall]:
+        """
+            _run_heuristics(node: Node, solution: Solution, cutoff: float) -> List[HeuristicCall]:
+                runs the heuristics on the fractional relaxation of the node (if it's due at its depth),
+                every heuristic has to beat the cutoff and the solutions of the previous ones
+        """
+        if len(self.heuristics) == 0 or node.depth % self.heuristic_frequency != 0:
+            return []
+        calls = []
+        for heuristic in self.heuristics:
+            if self.timeout():
+                break
+            start = time.perf_counter()
+            assignment = heuristic.run(self, node, solution, cutoff)
+            elapsed = time.perf_counter() - start
+            if assignment is None:
+                calls.append(HeuristicCall(heuristic.name, node.depth, elapsed))
+                continue
+            objective = self.model.objective.evaluate(assignment)
+            cutoff = max(cutoff, self._sense * objective)
+            calls.append(HeuristicCall(heuristic.name, node.depth, elapsed, assignment, objective))
+        return calls
+
+    def _apply_heuristics(self, calls: List[HeuristicCall]):
+        for call in calls:
+            statistics = self.heuristic_statistics.setdefault(call.heuristic, HeuristicStatistics())
+            statistics.calls += 1
+            statistics.time += call.time
+            if call.assignment is None:
+                continue
+            statistics.solutions += 1
+            score = self._sense * call.objective
+            if score > self._incumbent_score():
+                statistics.incumbents += 1
+                incumbent = lpsolution.Solution.with_assignment(self.model, call.assignment, None, None)
+                self._update_incumbent(incumbent, score, call.heuristic)
+
+    def _count_pruned(self, count: int):
+        """
+            _count_pruned(count: int):
+                credits the heuristic which found the incumbent with the pruned nodes
+        """
+        statistics = self.heuristic_statistics.get(self._incumbent_source)
+        if statistics is not None:
+            statistics.pruned += count
+
+    def _branching(self, node: Node, solution: lpsolution.Solution) -> List[BoundChange]:
+        """
+            _branching(node: Node, solution: Solution) -> List[BoundChange]:
+                returns the bound changes of the children ("up" first) on the variable chosen by the branching rule,
+                no changes if the solution is integer
+        """
+        candidates = self._fractional_variables(solution)
+        if len(candidates) == 0:
+            return []
+        index = self.branching.select(self, node, solution, candidates)
+        value = solution.value(self.model.variables[index])
+        return [BoundChange(index, False, math.ceil(value)), BoundChange(index, True, math.floor(value))]
+
+    def _fractional_variables(self, solution: lpsolution.Solution) -> List[int]:
+        return [var.index for var in self.model.variables
+                if abs(solution.value(var) - round(solution.value(var))) > self.integrality_tolerance]
+
+    def _estimate(self, solution: lpsolution.Solution, bound: float) -> float:
+        return bound - sum(abs(c) * min(v - math.floor(v), math.ceil(v) - v)
+                           for (c, v) in zip(self._objective, solution.assignment(self.model)))
+
+    def _branch(self, node: Node, bound: float, estimate: float, changes: List[BoundChange], tableau: sstab.Tableau,
+                fixings: List[BoundChange] = None):
+        if self.warm_start:
+            # the tableau is shared by both children
+            self._warm_starts[node] = [tableau, len(changes)]
+        fixings = tuple(fixings or [])
+        # the "down" branch is pushed last, so it's processed first among the equal nodes
+        for change in changes:
+            self.selection.push(Node(bound, estimate, node.depth + 1, change, node, fixings))
+
+    def _fix_reduced_costs(self, node: Node, solution: lpsolution.Solution, bound: float,
+                           cutoff: float) -> Tuple[lpsolution.Solution, List[BoundChange]]:
+        """
+            _fix_reduced_costs(node: Node, solution: Solution, bound: float,
+                               cutoff: float) -> Tuple[Solution, List[BoundChange]]:
+                derives the bounds of the solutions better than the cutoff
+                from the reduced costs of the node relaxation,
+                returns the relaxation re-optimized with them (infeasible if the node can't beat the cutoff)
+                and the derived bounds
+        """
+        if not self.reduced_cost_fixing or cutoff == -math.inf or solution.tableau is None:
+            return solution, []
+        fixings, avoided = self._reduced_cost_bounds(node, solution.tableau, bound - cutoff)
+        if len(fixings) == 0:
+            return solution, []
+        columns = solution.tableau.table.shape[1] - 1
+        rows = np.zeros((len(fixings), columns))
+        for (i, change) in enumerate(fixings):
+            rows[i, change.variable] = 1.0 if change.is_upper else -1.0
+        solver = self._lp_solver()
+        fixed = solver.reoptimize_with_rows(self.model, solution.tableau, rows,
+                                            [c.value if c.is_upper else -c.value for c in fixings])
+        self.lp_pivots += solver.pivots
+        if fixed.is_interrupted:
+            return solution, []
+        self.reduced_cost_fixings += len(fixings)
+        self.avoided_branches += avoided
+        return fixed, fixings
+
+    def _reduced_cost_bounds(self, node: Node, tableau: sstab.Tableau, gap: float) -> Tuple[List[BoundChange], int]:
+        """
+            _reduced_cost_bounds(node: Node, tableau: Tableau, gap: float) -> Tuple[List[BoundChange], int]:
+                returns the integer bounds (tighter than the node's ones) of the solutions of the optimal tableau
+                losing at most the gap, and the number of the variables they fix
+        """
+        table = tableau.table
+        n = len(self.model.variables)
+        tolerance = tableau.tolerance
+        costs = np.maximum(table[0, :-1], 0.0)
+        basis = np.array(tableau.extract_basis())
+        nonbasic = np.ones(len(costs), dtype=bool)
+        nonbasic[basis[basis >= 0]] = False
+
+        # y_k <= gap / d_k for every nonbasic column, a nonbasic variable is at zero
+        reach = np.divide(gap, costs, out=np.full(len(costs), np.inf), where=costs > tolerance)
+        lower, upper = np.zeros(n), np.where(nonbasic[:n], reach[:n], np.inf)
+        # a basic variable x = b - sum(a_k * y_k) moves the most along a single nonbasic column
+        rows = np.flatnonzero((basis >= 0) & (basis < n))
+        if len(rows) > 0:
+            factors = table[1 + rows, :-1][:, nonbasic]
+            steps = reach[nonbasic]
+            values = table[1 + rows, -1]
+            decrease = np.multiply(factors, steps, out=np.zeros(factors.shape), where=factors > tolerance)
+            increase = np.multiply(-factors, steps, out=np.zeros(factors.shape), where=factors < -tolerance)
+            lower[basis[rows]] = values - decrease.max(axis=1, initial=0.0)
+            upper[basis[rows]] = values + increase.max(axis=1, initial=0.0)
+
+        bounds = node.bounds()
+        boolean = isinstance(self.model, BooleanModel)
+        fixings, avoided = [], 0
+        for j in range(n):
+            old_lower, old_upper = bounds.get(j, (-math.inf, math.inf))
+            old_lower = max(old_lower, 0.0)
+            old_upper = min(old_upper, 1.0) if boolean else old_upper
+            new_lower, new_upper = old_lower, old_upper
+            if lower[j] > -math.inf:
+                new_lower = max(old_lower, math.ceil(lower[j] - self.integrality_tolerance * max(1.0, abs(lower[j]))))
+            if upper[j] < math.inf:
+                new_upper = min(old_upper, math.floor(upper[j] + self.integrality_tolerance * max(1.0, abs(upper[j]))))
+            if new_lower > old_lower:
+                fixings.append(BoundChange(j, False, new_lower))
+            if new_upper < old_upper:
+                fixings.append(BoundChange(j, True, new_upper))
+            avoided += new_lower == new_upper and old_lower < old_upper
+        return fixings, avoided
+
+    def _cut_rounds(self, node: Node) -> int:
+        if not self.warm_start:
+            return 0
+        return self.cut_rounds if node.depth == 0 else self.node_cut_rounds
+
+    def _tighten(self, node: Node, solution: lpsolution.Solution) -> lpsolution.Solution:
+        if self._cut_rounds(node) == 0 or self._find_float_assignment(solution) is None:
+            return solution
+        return self._cutting_planes(node, solution)
+
+    def _cutting_planes(self, node: Node, solution: lpsolution.Solution) -> lpsolution.Solution:
+        """
+            _cutting_planes(node: Node, solution: Solution) -> Solution:
+                tightens the (fractional) relaxation of the node with rounds of the cuts,
+                returns the last relaxation, which is infeasible if the node turned out to be empty
+        """
+        if self._knapsack_rows is None:
+            boolean = self.cover_cuts and isinstance(self.model, BooleanModel)
+            self._knapsack_rows = covers.knapsack_rows(self.model) if boolean else []
+        tableau = solution.tableau
+        integer = cuts.integer_columns(self.model, tableau)
+        pool = cuts.CutPool(len(integer), self.cut_age_limit)
+        bound = self._sense * solution.objective_value()
+        for _ in range(self._cut_rounds(node)):
+            if self.timeout():
+                break
+            columns = len(integer)
+            assignment = np.array(tableau.extract_assignment())
+            covers_found = covers.cover_cuts(self._knapsack_rows, assignment[:len(self.model.variables)],
+                                             self.cuts_per_round)
+            cover_cuts = [cuts.Cut(np.pad(c.coefficients, (0, columns - len(c.coefficients))), c.bound)
+                          for c in covers_found]
+            cover_cuts = pool.filter(cover_cuts)
+            gomory_cuts = cuts.gomory_cuts(tableau, integer, self.cuts_per_round) if self.gomory_cuts else []
+            gomory_cuts = pool.filter(gomory_cuts)
+            generated = cover_cuts + gomory_cuts
+            if len(generated) == 0:
+                break
+            solver = self._lp_solver()
+            rows = np.array([c.coefficients for c in generated])
+            cut_solution = solver.reoptimize_with_rows(self.model, tableau, rows, [c.bound for c in generated])
+            self.lp_pivots += solver.pivots
+            if cut_solution.is_interrupted:
+                break
+            if not cut_solution.is_feasible:
+                return cut_solution
+
+            pool.add(generated, columns)
+            tableau = cut_solution.tableau
+            integer = np.append(integer, np.zeros(len(generated), dtype=bool))
+            removed_rows, removed_columns = pool.age(tableau)
+            if len(removed_columns) > 0:
+                tableau = tableau.without_rows(removed_rows, removed_columns)
+                integer = np.delete(integer, removed_columns)
+            solution = lpsolution.Solution.with_assignment(self.model, tableau.extract_assignment(),
+                                                           solution.initial_tableau, tableau)
+
+            new_bound = self._sense * solution.objective_value()
+            improvement = bound - new_bound
+            self.cut_statistics.append(cuts.CutRound(node.depth, float(self._sense * new_bound), float(improvement),
+                                                     len(generated), len(removed_columns), len(pool), len(cover_cuts)))
+            bound = new_bound
+            stalled = improvement <= self.integrality_tolerance * max(1.0, abs(bound))
+            if stalled or self._find_float_assignment(solution) is None:
+                break
+        return solution
+
+    def _solve_relaxation(self, node: Node) -> lpsolution.Solution:
+        warm_start = self._warm_starts.get(node.parent)
+        return self._relaxation(node, None if warm_start is None else warm_start[0])
+
+    def _relaxation(self, node: Node, tableau: sstab.Tableau = None) -> lpsolution.Solution:
+        """
+            _relaxation(node: Node, tableau: Tableau | None) -> Solution:
+                solves the node relaxation, re-optimizing the parent's tableau if given
+        """
+        implied = self._propagate(node)
+        if implied is None:
+            self.propagated_nodes += 1
+            return lpsolution.Solution.infeasible(self.model, None, None)
+        solver = self._lp_solver()
+        if tableau is None or node.change is None:
+            solution = solver.solve(self._node_model(node))
+        else:
+            change = node.change
+            solution = solver.reoptimize_with_bound(self.model, tableau, change.variable, change.is_upper, change.value)
+        self.lp_pivots += solver.pivots
+        return self._enforce(solution, implied)
+
+    def _propagate(self, node: Node) -> List[BoundChange]:
+        """
+            _propagate(node: Node) -> List[BoundChange] | None:
+                propagates the branching bounds of the node, returns the implied bounds tighter than the node's own ones
+                (including the ones implied at the root), None if the node is infeasible
+        """
+        propagator = self._propagator
+        if propagator is None:
+            return []
+        if not self._root_feasible:
+            return None
+        propagator.undo(self._root_mark)
+        for change in node.changes():
+            if change.is_upper and not propagator.set_upper(change.variable, change.value):
+                return None
+            if not change.is_upper and not propagator.set_lower(change.variable, change.value):
+                return None
+        if not propagator.propagate():
+            return None
+
+        bounds = node.bounds()
+        implied = []
+        for j in sorted(set(propagator.changes(0))):
+            lower, upper = bounds.get(j, (-math.inf, math.inf))
+            if propagator.lower[j] > max(lower, 0.0):
+                implied.append(BoundChange(j, False, propagator.lower[j]))
+            if propagator.upper[j] < upper and (propagator.upper[j] < 1 or not isinstance(self.model, BooleanModel)):
+                implied.append(BoundChange(j, True, propagator.upper[j]))
+        return implied
+
+    def _enforce(self, solution: lpsolution.Solution, implied: List[BoundChange]) -> lpsolution.Solution:
+        """
+            _enforce(solution: Solution, implied: List[BoundChange]) -> Solution:
+                adds the implied bounds violated by the relaxation solution to its tableau, one at a time,
+                until the solution satisfies all of them
+        """
+        for _ in range(len(implied)):
+            if not solution.is_feasible or not solution.is_bounded or solution.is_interrupted:
+                break
+            assignment = solution.assignment(self.model)
+            violated = [c for c in implied
+                        if (assignment[c.variable] > c.value + self.integrality_tolerance if c.is_upper
+                            else assignment[c.variable] < c.value - self.integrality_tolerance)]
+            if len(violated) == 0:
+                break
+            change = violated[0]
+            solver = self._lp_solver()
+            solution = solver.reoptimize_with_bound(self.model, solution.tableau, change.variable, change.is_upper,
+                                                    change.value)
+            self.lp_pivots += solver.pivots
+            self.implied_bounds += 1
+        return solution
+
+    def _release(self, node: Node):
+        """
+            _release(node: Node):
+                marks the node as closed, the parent's tableau is dropped once none of its children needs it
+        """
+        warm_start = self._warm_starts.get(node.parent)
+        if warm_start is not None:
+            warm_start[1] -= 1
+            if warm_start[1] == 0:
+                del self._warm_starts[node.parent]
+
     def _find_float_assignment(self, solution: lpsolution.Solution) -> sseexp.Variable:
-        # TODO: find an variable[1] that has non-integer value[2] in the solution
-        #      due to numeric errors some variables may have "almost integer" value, like 0.9999999 or 1.0000001
-        #      make sure they are still counted as integers
-        #      Make sure this method returns None if none of variables has a floating point value.
-        #
-        # [1] `self.model.variables` 
-        # [2] `solution.value(<variable>)`
-  
+        for var in self.model.variables:
+            value = solution.value(var)
+            if abs(value - round(value)) > self.integrality_tolerance:
+                return var
         return None
 
-    def _model_with_new_constraint(self, model: Model, constraint: ssecon.Constraint) -> Model:
-        new_model = deepcopy(model)
-        new_model.add_constraint(constraint)
-        return new_model
+    def _node_model(self, node: Node) -> Model:
+        model = deepcopy(self.model)
+        bounds = node.bounds()
+        if isinstance(self.model, BooleanModel):
+            # the relaxation of a boolean variable is the [0, 1] interval
+            for var in self.model.variables:
+                lower, upper = bounds.get(var.index, (-math.inf, math.inf))
+                bounds[var.index] = (lower, min(upper, 1))
+        for (index, (lower, upper)) in bounds.items():
+            var = model.variables[index]
+            if lower > -math.inf:
+                model.add_constraint(sseexp.Expression.from_vectors([var], [1.0]) >= lower)
+            if upper < math.inf:
+                model.add_constraint(sseexp.Expression.from_vectors([var], [1.0]) <= upper)
+        return model
+
+    def _incumbent_score(self) -> float:
+        if self.best_solution is None or not self.best_solution.has_assignment():
+            return -math.inf
+        return self._sense * self.best_solution.objective_value()
+
+    def lower_bound(self) -> float:
+        return self._sense * self._incumbent_score()
+
+    def upper_bound(self) -> float:
+        score = max([self._incumbent_score(), self.selection.best_bound()] + [node.bound for node in self._active])
+        return self._sense * score
+
+    def root_gap_closed(self) -> float:
+        rounds = [r for r in self.cut_statistics if r.depth == 0]
+        if self._incumbent_score() == -math.inf:
+            return None
+        if len(rounds) == 0:
+            return 0.0
+        relaxation = self._sense * rounds[0].bound + rounds[0].improvement
+        gap = relaxation - self._incumbent_score()
+        if gap <= self.integrality_tolerance:
+            return None
+        return (relaxation - self._sense * rounds[-1].bound) / gap
+
+    def gap(self) -> float:
+        lower, upper = self._incumbent_score(), self._sense * self.upper_bound()
+        if lower == -math.inf:
+            return math.inf
+        return (upper - lower) / max(abs(lower), 1e-10)
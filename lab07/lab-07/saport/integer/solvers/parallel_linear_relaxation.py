@@ -0,0 +1,332 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List
+import math
+import multiprocessing
+import numpy as np
+
+from saport.integer.branching import BranchingRule
+from saport.integer.cuts import CutRound
+from saport.integer.heuristics import HeuristicCall, PrimalHeuristic
+from saport.integer.nodes import BoundChange, Node, NodeSelection
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.simplex import solution as lpsolution
+from saport.simplex import tableau as sstab
+from saport.simplex.cancellation import CancellationToken
+
+
+class NodeStatus(Enum):
+    """
+    An enum representing the outcomes of processing a node in a worker.
+    """
+    INTERRUPTED = "interrupted"
+    UNBOUNDED = "unbounded"
+    INFEASIBLE = "infeasible"
+    PRUNED = "pruned"
+    INTEGER = "integer"
+    BRANCHED = "branched"
+
+
+@dataclass(frozen=True)
+class NodeResult:
+    """
+    A dataclass representing the result of processing a node, sent back from a worker.
+    Only the plain data crosses the process boundary: the children are sent as bound changes
+    (the main process links them to its own copy of the node) and the tableau as a bare table.
+
+    Attributes
+    ----------
+    status : NodeStatus
+        outcome of processing the node
+    bound : float
+        objective value of the node relaxation (in the maximization sense), `-inf` if there is none
+    estimate : float
+        estimated objective value of the best integer solution in the node's subtree (in the maximization sense)
+    assignment : List[float] | None
+        assignment of the relaxation for the integer nodes
+    changes : List[BoundChange]
+        bound changes of the children for the branched nodes
+    table : numpy.Array | None
+        optimal table of the relaxation for the branched nodes (if the warm start is enabled)
+    pivots : int
+        number of the simplex pivots made
+    cut_rounds : List[CutRound]
+        statistics of the cut generation rounds run at the node
+    heuristic_calls : List[HeuristicCall]
+        runs of the primal heuristics at the node, with their solutions
+    propagated : int
+        number of the relaxations (of the node or of the heuristics) proven infeasible by the propagation
+    fixings : List[BoundChange]
+        bounds derived from the reduced costs for the branched nodes, inherited by the children
+    reduced_cost_fixings : int
+        number of the bounds derived from the reduced costs
+    avoided_branches : int
+        number of the variables fixed at a single value by the reduced costs
+    """
+    status: NodeStatus
+    bound: float = -math.inf
+    estimate: float = -math.inf
+    assignment: List[float] = None
+    changes: List[BoundChange] = None
+    table: np.ndarray = None
+    pivots: int = 0
+    cut_rounds: List[CutRound] = None
+    heuristic_calls: List[HeuristicCall] = None
+    propagated: int = 0
+    fixings: List[BoundChange] = None
+    reduced_cost_fixings: int = 0
+    avoided_branches: int = 0
+
+
+# state of the worker process, set once by the pool initializer
+_worker: LinearRelaxationSolver = None
+_incumbent = None
+_share_incumbent = False
+
+
+def _initialize_worker(solver: LinearRelaxationSolver, deadline: float, incumbent, share_incumbent: bool):
+    global _worker, _incumbent, _share_incumbent
+    _worker = solver
+    _worker.token = CancellationToken(deadline)
+    # the deadline of the token is the only time limit of the worker
+    _worker.timelimit = math.inf
+    _worker.start_timer()
+    _worker._prepare_objective()
+    _incumbent = incumbent
+    _share_incumbent = share_incumbent
+
+
+def _process_node(node: Node, table: np.ndarray) -> NodeResult:
+    pivots = _worker.lp_pivots
+    _worker.cut_statistics = []
+    _worker.propagated_nodes = 0
+    _worker.reduced_cost_fixings = 0
+    _worker.avoided_branches = 0
+    tableau = None if table is None else sstab.Tableau(_worker.model, table)
+    solution = _worker._relaxation(node, tableau)
+
+    if solution.is_interrupted:
+        return NodeResult(NodeStatus.INTERRUPTED, pivots=_worker.lp_pivots - pivots)
+    if not solution.is_bounded:
+        return NodeResult(NodeStatus.UNBOUNDED, pivots=_worker.lp_pivots - pivots)
+    if solution.is_feasible and _worker._sense * solution.objective_value() > _incumbent.value:
+        solution = _worker._tighten(node, solution)
+    pivots = _worker.lp_pivots - pivots
+    if not solution.is_feasible:
+        _worker.branching.observe(node, -math.inf)
+        return NodeResult(NodeStatus.INFEASIBLE, pivots=pivots, cut_rounds=_worker.cut_statistics,
+                          propagated=_worker.propagated_nodes)
+
+    bound = _worker._sense * solution.objective_value()
+    _worker.branching.observe(node, bound)
+    # the incumbent found by any worker prunes the node at once
+    if bound <= _incumbent.value:
+        return NodeResult(NodeStatus.PRUNED, bound, pivots=pivots, cut_rounds=_worker.cut_statistics)
+
+    if _worker._find_float_assignment(solution) is None:
+        _share(bound)
+        return NodeResult(NodeStatus.INTEGER, bound, bound, solution.assignment(), pivots=pivots,
+                          cut_rounds=_worker.cut_statistics)
+
+    heuristic_pivots = _worker.lp_pivots
+    calls = _worker._run_heuristics(node, solution, _incumbent.value)
+    pivots += _worker.lp_pivots - heuristic_pivots
+    found = [_worker._sense * call.objective for call in calls if call.assignment is not None]
+    if len(found) > 0:
+        _share(max(found))
+    cutoff = max(found + [_incumbent.value])
+    if bound <= cutoff:
+        return NodeResult(NodeStatus.PRUNED, bound, pivots=pivots, cut_rounds=_worker.cut_statistics,
+                          heuristic_calls=calls, propagated=_worker.propagated_nodes)
+
+    fixing_pivots = _worker.lp_pivots
+    solution, fixings = _worker._fix_reduced_costs(node, solution, bound, cutoff)
+    pivots += _worker.lp_pivots - fixing_pivots
+    statistics = dict(pivots=pivots,
+                      cut_rounds=_worker.cut_statistics,
+                      heuristic_calls=calls,
+                      propagated=_worker.propagated_nodes,
+                      reduced_cost_fixings=_worker.reduced_cost_fixings,
+                      avoided_branches=_worker.avoided_branches)
+    bound = _worker._sense * solution.objective_value() if solution.is_feasible else -math.inf
+    if bound <= cutoff:
+        return NodeResult(NodeStatus.PRUNED, bound, **statistics)
+    changes = _worker._branching(node, solution)
+    if len(changes) == 0:
+        _share(bound)
+        return NodeResult(NodeStatus.INTEGER, bound, bound, solution.assignment(), **statistics)
+    table = solution.tableau.table if _worker.warm_start else None
+    estimate = _worker._estimate(solution, bound)
+    return NodeResult(NodeStatus.BRANCHED, bound, estimate, changes=changes, table=table, fixings=fixings, **statistics)
+
+
+def _share(score: float):
+    if _share_incumbent:
+        with _incumbent.get_lock():
+            _incumbent.value = max(_incumbent.value, score)
+
+
+class ParallelLinearRelaxationSolver(LinearRelaxationSolver):
+    """
+        Branch and bound solver processing the open nodes in a pool of worker processes.
+
+        The main process owns the frontier (ordered by the node selection rule) and hands the nodes out to the workers,
+        which solve the relaxations (warm-started from the parent's table)
+        and send back the children or the integer solution.
+        The incumbent objective value lives in shared memory,
+        so every worker prunes against the best known solution at once.
+
+        In the deterministic mode the nodes are handed out in batches of `workers` nodes, the results are applied
+        in the order of the batch and the incumbent is shared only between the batches,
+        so the search (and its statistics) is reproducible for the given number of workers, at the cost of idle workers.
+
+        Attributes:
+        ----------
+        workers: int
+            number of the worker processes
+        deterministic: bool
+            whether the search should be reproducible
+        poll_interval: float
+            how often (in seconds) the main process checks the timeout while waiting for the workers
+
+        Methods:
+        --------
+        __init__(workers: int | None = None, deterministic: bool = False, selection: NodeSelection | None = None,
+                 warm_start: bool = True, cut_rounds: int = 0, node_cut_rounds: int = 0,
+                 heuristics: List[PrimalHeuristic] | None = None, presolve: bool = False, propagation: bool = False,
+                 branching: BranchingRule | None = None,
+                 reduced_cost_fixing: bool = False) -> ParallelLinearRelaxationSolver:
+            constructs a new solver with the given number of workers (the number of CPUs by default),
+            the cuts are generated, the heuristics are run, the bounds are propagated
+            and the reduced costs fixed by the workers,
+            the presolve is run by the main process, every worker keeps its own copy of the branching rule
+            (so e.g. the pseudo-costs are learned only from the nodes processed by the worker)
+    """
+    workers: int
+    deterministic: bool
+    poll_interval: float = 0.05
+
+    def __init__(self,
+                 workers: int = None,
+                 deterministic: bool = False,
+                 selection: NodeSelection = None,
+                 warm_start: bool = True,
+                 cut_rounds: int = 0,
+                 node_cut_rounds: int = 0,
+                 heuristics: List[PrimalHeuristic] = None,
+                 presolve: bool = False,
+                 propagation: bool = False,
+                 branching: BranchingRule = None,
+                 reduced_cost_fixing: bool = False):
+        super().__init__(selection, warm_start, cut_rounds, node_cut_rounds, heuristics, presolve, propagation,
+                         branching, reduced_cost_fixing)
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.deterministic = deterministic
+
+    def _solving_routine(self):
+        self._start_search()
+        incumbent = multiprocessing.Value('d', -math.inf)
+        worker = LinearRelaxationSolver(warm_start=self.warm_start,
+                                        cut_rounds=self.cut_rounds,
+                                        node_cut_rounds=self.node_cut_rounds,
+                                        heuristics=self.heuristics,
+                                        propagation=self.propagation,
+                                        branching=self.branching,
+                                        reduced_cost_fixing=self.reduced_cost_fixing)
+        worker.heuristic_frequency = self.heuristic_frequency
+        worker.cuts_per_round = self.cuts_per_round
+        worker.cut_age_limit = self.cut_age_limit
+        worker.gomory_cuts = self.gomory_cuts
+        worker.cover_cuts = self.cover_cuts
+        worker.model = self.model
+        running: Dict[Future, Node] = dict()
+
+        with ProcessPoolExecutor(self.workers,
+                                 initializer=_initialize_worker,
+                                 initargs=(worker, self.token.deadline, incumbent, not self.deterministic)) as executor:
+            while (len(self.selection) > 0 or len(running) > 0) and not self._unbounded:
+                if self.timeout():
+                    self.interrupted = True
+                    break
+                self._dispatch(executor, running)
+                if len(running) == 0:
+                    continue
+                for future in self._completed(running):
+                    self._apply(running.pop(future), future.result())
+                    self._publish(incumbent)
+                self._active = list(running.values())
+
+            # the started nodes finish (the workers share the deadline), their results are applied,
+            # since the other workers may have already pruned against an incumbent they have published,
+            # the nodes which haven't started stay open, so the global bound remains valid
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for (future, node) in running.items():
+                if future.cancelled():
+                    self.selection.push(node)
+                else:
+                    self._apply(node, future.result())
+            self._active = []
+        self._finish_search()
+
+    def _publish(self, incumbent):
+        """
+            _publish(incumbent: Value):
+                raises the shared incumbent to the one of the main process,
+                a better value published by a worker (whose result hasn't been applied yet) is kept
+        """
+        with incumbent.get_lock():
+            incumbent.value = max(incumbent.value, self._incumbent_score())
+
+    def _dispatch(self, executor: ProcessPoolExecutor, running: Dict[Future, Node]):
+        if self.deterministic and len(running) > 0:
+            return
+        while len(running) < self.workers and len(self.selection) > 0:
+            node = self.selection.pop()
+            if node.bound <= self._incumbent_score():
+                self._release(node)
+                self._count_pruned(1)
+                continue
+            warm_start = self._warm_starts.get(node.parent)
+            running[executor.submit(_process_node, node, None if warm_start is None else warm_start[0].table)] = node
+        self._active = list(running.values())
+
+    def _completed(self, running: Dict[Future, Node]) -> List[Future]:
+        """
+            _completed(running: Dict[Future, Node]) -> List[Future]:
+                waits (at most the poll interval) for the workers,
+                returns the finished futures in the order of their submission,
+                in the deterministic mode only the whole batch is returned
+        """
+        if self.deterministic:
+            _, pending = wait(running, timeout=self.poll_interval)
+            return list(running) if len(pending) == 0 else []
+        done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+        return [future for future in running if future in done]
+
+    def _apply(self, node: Node, result: NodeResult):
+        self.nodes += 1
+        self.lp_pivots += result.pivots
+        self.cut_statistics += result.cut_rounds or []
+        self.propagated_nodes += result.propagated
+        self.reduced_cost_fixings += result.reduced_cost_fixings
+        self.avoided_branches += result.avoided_branches
+        self._apply_heuristics(result.heuristic_calls or [])
+        if result.status == NodeStatus.INTERRUPTED:
+            self.interrupted = True
+            self.selection.push(node)
+            return
+        self._release(node)
+        if result.status == NodeStatus.UNBOUNDED:
+            self._unbounded = True
+        elif result.status == NodeStatus.INTEGER and result.bound > self._incumbent_score():
+            incumbent = lpsolution.Solution.with_assignment(self.model, result.assignment, None, None)
+            self._update_incumbent(incumbent, result.bound)
+        elif result.status == NodeStatus.BRANCHED and result.bound > self._incumbent_score():
+            tableau = None if result.table is None else sstab.Tableau(self.model, result.table)
+            self._branch(node, result.bound, result.estimate, result.changes, tableau, result.fixings)
+        elif result.status in [NodeStatus.PRUNED, NodeStatus.BRANCHED]:
+            self._count_pruned(1)
@@ -0,0 +1,80 @@
+"""
+Asyncio front-end of the solvers: solves run in an executor, so they don't block the event loop.
+
+Cancelling the awaiting task cancels the token passed to the solver, which stops between pivots (or nodes)
+and the task finishes only after the worker has actually stopped, so the executor and the limiter are freed.
+The process pools share the cancellation events through a manager process, started once per executor
+and shut down when the executor is garbage collected.
+"""
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, TypeVar
+import asyncio
+import functools
+import multiprocessing
+import weakref
+
+import saport.simplex.model as ssmod
+import saport.simplex.solution as sssol
+from saport.simplex.cancellation import CancellationToken
+
+T = TypeVar('T')
+
+_POLL_INTERVAL = 0.005
+
+# one manager per process pool, shut down together with the pool's executor object
+_managers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _cancellation_token(executor: Executor) -> CancellationToken:
+    if not isinstance(executor, ProcessPoolExecutor):
+        return CancellationToken()
+    # worker processes can't see a threading.Event, they get a proxy to the event living in the manager process,
+    # every check of the proxy is a round-trip to the manager, so the workers poll it only every few milliseconds
+    manager = _managers.get(executor)
+    if manager is None:
+        manager = multiprocessing.Manager()
+        _managers[executor] = manager
+        weakref.finalize(executor, manager.shutdown)
+    return CancellationToken(event=manager.Event(), poll_interval=_POLL_INTERVAL)
+
+
+async def run_cancellable(function: Callable[..., T],
+                          *args,
+                          timeout: float = None,
+                          executor: Executor = None,
+                          limiter: asyncio.Semaphore = None) -> T:
+    """
+        Runs `function(*args, token)` in the executor (the default thread pool if None) and returns its result.
+        The token expires after `timeout` seconds and gets cancelled together with the awaiting task.
+        The limiter (if given) caps the number of the in-flight calls, the timeout starts when the call acquires it.
+    """
+    if limiter is not None:
+        await limiter.acquire()
+    try:
+        token = _cancellation_token(executor).limited(timeout)
+        future = asyncio.get_running_loop().run_in_executor(executor, functools.partial(function, *args, token))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            token.cancel()
+            await asyncio.wait([future])
+            raise
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+
+def _solve(model: ssmod.Model, token: CancellationToken) -> sssol.Solution:
+    return model.solve(token=token)
+
+
+async def solve_async(model: ssmod.Model,
+                      timeout: float = None,
+                      executor: Executor = None,
+                      limiter: asyncio.Semaphore = None) -> sssol.Solution:
+    """
+        Solves the linear programming model in the executor.
+        After the timeout the solver returns an interrupted solution (see `Solution.is_interrupted`).
+    """
+    return await run_cancellable(_solve, model, timeout=timeout, executor=executor, limiter=limiter)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+import threading
+import time
+
+
+class CancellationToken:
+    """
+        A class to represent a cooperative stop signal shared between the caller and the solvers.
+        Solvers check the token between pivots (or nodes) and stop as soon as it is cancelled or past its deadline.
+
+        Attributes
+        ----------
+        deadline : float | None
+            time (as returned by `time.time()`) after which the token is considered cancelled
+        poll_interval : float
+            minimal time (in seconds) between the checks of the event, the deadline is checked every time,
+            a nonzero interval makes the checks cheap when the event is a proxy to another process
+
+        Methods
+        -------
+        __init__(deadline: float | None = None, event: Event | None = None,
+                 poll_interval: float = 0.0) -> CancellationToken:
+            constructs a new token with an optional deadline,
+            a custom event (e.g. `multiprocessing.Manager().Event()`) makes the token usable across processes
+        cancel():
+            cancels the token (and all the tokens derived from it with `limited`), it's safe to call from other threads
+        is_cancelled() -> bool:
+            whether the token has been cancelled or its deadline has passed
+        limited(timelimit: float | None) -> CancellationToken:
+            returns a token sharing the cancellation with this one,
+            but with a deadline at most `timelimit` seconds from now
+    """
+    deadline: float
+    poll_interval: float
+
+    def __init__(self, deadline: float = None, event: threading.Event = None, poll_interval: float = 0.0):
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self._event = event if event is not None else threading.Event()
+        self._cancelled = False
+        self._next_poll = 0.0
+
+    def cancel(self):
+        self._event.set()
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        if self._cancelled:
+            return True
+        now = time.time()
+        if self.deadline is not None and now > self.deadline:
+            return True
+        if now >= self._next_poll:
+            # a cancelled event is never reset, so its state can be remembered
+            self._cancelled = self._event.is_set()
+            self._next_poll = now + self.poll_interval
+        return self._cancelled
+
+    def limited(self, timelimit: float = None) -> CancellationToken:
+        deadline = self.deadline
+        if timelimit is not None:
+            deadline = time.time() + timelimit if deadline is None else min(deadline, time.time() + timelimit)
+        return CancellationToken(deadline, self._event, self.poll_interval)
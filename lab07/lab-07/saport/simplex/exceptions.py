@@ -14,4 +14,12 @@ class EmptyModelError(Exception):
 class MissingObjectiveError(Exception):
     
     def __init__(self) -> None:
-        super().__init__(f"Cannot solve model missing an objective.")
\ No newline at end of file
+        super().__init__(f"Cannot solve model missing an objective.")
+
+
+class ModelFormatError(Exception):
+
+    def __init__(self, path: str, line: int, reason: str) -> None:
+        super().__init__(f"Cannot read model from {path} (line {line}): {reason}.")
+        self.path = path
+        self.line = line
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from copy import deepcopy
 from typing import Iterable, List
 
 from itertools import groupby
@@ -79,12 +78,11 @@ class Expression:
         self.atoms = [reduce_group(g) for g in grouped_atoms]
             
     def coefficients(self, model: ssmod.Model) -> List[float]:
-        simplified_expression = deepcopy(self)
-        simplified_expression.simplify()
+        # sums the repeated variables like `simplify` would, without copying the expression
         coefficients = [0.0 for _ in model.variables]
-        for a in simplified_expression.atoms:
+        for a in self.atoms:
             if a.var.index < len(coefficients):
-                coefficients[a.var.index] = a.coefficient
+                coefficients[a.var.index] += a.coefficient
         return coefficients
 
     def get_coefficient(self, var: Variable) -> float:
@@ -0,0 +1,479 @@
+"""
+Streaming readers and writers of the MPS (free format) and CPLEX-LP text formats.
+
+Readers build the MatrixModel directly (coefficients are collected in compact arrays, line by line),
+call `to_model()` to get a regular model. Variables in SAPORT are always nonnegative,
+so bounds are translated into additional constraints, and the unsupported ones (free, negative lower bounds, ranges)
+raise ModelFormatError. Integrality markers are ignored.
+"""
+from __future__ import annotations
+from array import array
+from typing import Dict, List, TextIO, Tuple, Union
+import os
+import re
+
+import numpy as np
+
+import saport.simplex.model as ssmod
+from saport.simplex.exceptions import ModelFormatError
+from saport.simplex.expressions.constraint import ConstraintType
+from saport.simplex.expressions.objective import ObjectiveType
+from saport.simplex.matrix import MatrixModel
+
+
+class _MatrixBuilder:
+    """
+        Collects the model coefficients (in the COO format) while the file is being read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows: Dict[str, int] = dict()
+        self.row_names: List[str] = []
+        self.senses = array('b')
+        self.rhs = array('d')
+        self.columns: Dict[str, int] = dict()
+        self.column_names: List[str] = []
+        self.objective = array('d')
+        self.entry_rows = array('q')
+        self.entry_columns = array('q')
+        self.entry_values = array('d')
+
+    def add_row(self, name: str, sense: ConstraintType, line: int) -> int:
+        if name in self.rows:
+            raise ModelFormatError(self.path, line, f"duplicate row {name}")
+        self.rows[name] = len(self.row_names)
+        self.row_names.append(name)
+        self.senses.append(sense.value)
+        self.rhs.append(0.0)
+        return self.rows[name]
+
+    def row(self, name: str, line: int) -> int:
+        if name not in self.rows:
+            raise ModelFormatError(self.path, line, f"unknown row {name}")
+        return self.rows[name]
+
+    def column(self, name: str) -> int:
+        index = self.columns.get(name)
+        if index is None:
+            index = self.columns[name] = len(self.column_names)
+            self.column_names.append(name)
+            self.objective.append(0.0)
+        return index
+
+    def existing_column(self, name: str, line: int) -> int:
+        if name not in self.columns:
+            raise ModelFormatError(self.path, line, f"unknown column {name}")
+        return self.columns[name]
+
+    def add_entry(self, row: int, column: int, value: float):
+        self.entry_rows.append(row)
+        self.entry_columns.append(column)
+        self.entry_values.append(value)
+
+    def add_bound(self, column: int, line: int, lower: float = None, upper: float = None):
+        name = self.column_names[column]
+        if lower is not None and lower == upper:
+            self._add_bound_row(f"{name}_fx", ConstraintType.EQ, column, lower, line)
+            return
+        if lower is not None and lower < 0:
+            raise ModelFormatError(self.path, line, f"negative lower bound of {name} is not supported")
+        if lower is not None and lower > 0:
+            self._add_bound_row(f"{name}_lb", ConstraintType.GE, column, lower, line)
+        if upper is not None and upper != float('inf'):
+            self._add_bound_row(f"{name}_ub", ConstraintType.LE, column, upper, line)
+
+    def _add_bound_row(self, name: str, sense: ConstraintType, column: int, value: float, line: int):
+        row = self.add_row(name, sense, line)
+        self.add_entry(row, column, 1.0)
+        self.rhs[row] = value
+
+    def build(self, name: str, objective_type: ObjectiveType) -> MatrixModel:
+        rows = np.frombuffer(self.entry_rows, dtype=np.int64)
+        order = np.argsort(rows, kind='stable')
+        counts = np.bincount(rows, minlength=len(self.row_names))
+        indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return MatrixModel(name,
+                           self.column_names,
+                           self.row_names,
+                           indptr,
+                           np.frombuffer(self.entry_columns, dtype=np.int64)[order],
+                           np.frombuffer(self.entry_values, dtype=float)[order],
+                           np.array(self.rhs, dtype=float),
+                           np.array(self.senses, dtype=np.int8),
+                           np.array(self.objective, dtype=float),
+                           objective_type)
+
+
+def _matrix_model(model: Union[ssmod.Model, MatrixModel]) -> MatrixModel:
+    return model if isinstance(model, MatrixModel) else MatrixModel.from_model(model)
+
+
+def _number(value: float) -> str:
+    return '%.17g' % value
+
+
+def _columns_order(matrix: MatrixModel):
+    """ returns the CSR entries reordered column by column (i.e. CSC) """
+    rows = np.repeat(np.arange(len(matrix.constraints)), np.diff(matrix.indptr))
+    order = np.argsort(matrix.indices, kind='stable')
+    colptr = np.concatenate([[0], np.cumsum(np.bincount(matrix.indices, minlength=len(matrix.variables)))])
+    return (colptr, rows[order], matrix.data[order])
+
+
+_MPS_SENSES = {'L': ConstraintType.LE, 'G': ConstraintType.GE, 'E': ConstraintType.EQ}
+_MPS_SECTIONS = {'NAME', 'OBJSENSE', 'ROWS', 'COLUMNS', 'RHS', 'BOUNDS', 'RANGES', 'ENDATA'}
+
+
+def read_mps(path: str) -> MatrixModel:
+    """ Reads a model from the free MPS file. """
+    builder = _MatrixBuilder(path)
+    name = os.path.basename(path)
+    objective_row = None
+    ignored_rows = set()
+    objective_type = ObjectiveType.MIN
+    section = None
+
+    with open(path) as f:
+        for (line_no, line) in enumerate(f, 1):
+            tokens = line.split()
+            if len(tokens) == 0 or line[0] == '*':
+                continue
+
+            if not line[0].isspace():
+                section = tokens[0].upper()
+                if section not in _MPS_SECTIONS:
+                    raise ModelFormatError(path, line_no, f"unknown section {tokens[0]}")
+                if section == 'RANGES':
+                    raise ModelFormatError(path, line_no, "ranges are not supported")
+                if section == 'ENDATA':
+                    break
+                if section == 'NAME' and len(tokens) > 1:
+                    name = line.split(None, 1)[1].strip()
+                if section == 'OBJSENSE' and len(tokens) > 1:
+                    objective_type = _mps_objective_type(tokens[1], path, line_no)
+                continue
+
+            if section == 'OBJSENSE':
+                objective_type = _mps_objective_type(tokens[0], path, line_no)
+            elif section == 'ROWS':
+                kind, row = tokens[0].upper(), tokens[1]
+                if kind == 'N':
+                    if objective_row is None:
+                        objective_row = row
+                    else:
+                        ignored_rows.add(row)
+                elif kind in _MPS_SENSES:
+                    builder.add_row(row, _MPS_SENSES[kind], line_no)
+                else:
+                    raise ModelFormatError(path, line_no, f"unknown row type {tokens[0]}")
+            elif section == 'COLUMNS':
+                if len(tokens) > 1 and tokens[1] == "'MARKER'":
+                    continue
+                column = builder.column(tokens[0])
+                for (row, value) in zip(tokens[1::2], tokens[2::2]):
+                    if row == objective_row:
+                        builder.objective[column] += float(value)
+                    elif row not in ignored_rows:
+                        builder.add_entry(builder.row(row, line_no), column, float(value))
+            elif section == 'RHS':
+                # the rhs set name is optional, (row, value) pairs always come last
+                pairs = tokens[len(tokens) % 2:]
+                for (row, value) in zip(pairs[0::2], pairs[1::2]):
+                    # the objective constant is not supported by the model, so it's skipped
+                    if row != objective_row and row not in ignored_rows:
+                        builder.rhs[builder.row(row, line_no)] = float(value)
+            elif section == 'BOUNDS':
+                _read_mps_bound(builder, tokens, line_no)
+            else:
+                raise ModelFormatError(path, line_no, "data outside of a section")
+
+    return builder.build(name, objective_type)
+
+
+def _mps_objective_type(token: str, path: str, line: int) -> ObjectiveType:
+    token = token.upper()
+    if token in ('MAX', 'MAXIMIZE'):
+        return ObjectiveType.MAX
+    if token in ('MIN', 'MINIMIZE'):
+        return ObjectiveType.MIN
+    raise ModelFormatError(path, line, f"unknown objective sense {token}")
+
+
+def _read_mps_bound(builder: _MatrixBuilder, tokens: List[str], line: int):
+    kind = tokens[0].upper()
+    needs_value = kind in ('UP', 'LO', 'FX', 'LI', 'UI')
+    # the bound set name is optional as well
+    column_token = tokens[2] if len(tokens) >= (4 if needs_value else 3) else tokens[1]
+    column = builder.existing_column(column_token, line)
+    value = float(tokens[-1]) if needs_value else None
+
+    if kind in ('UP', 'UI'):
+        builder.add_bound(column, line, upper=value)
+    elif kind in ('LO', 'LI'):
+        builder.add_bound(column, line, lower=value)
+    elif kind == 'FX':
+        builder.add_bound(column, line, lower=value, upper=value)
+    elif kind == 'BV':
+        builder.add_bound(column, line, upper=1.0)
+    elif kind != 'PL':
+        raise ModelFormatError(builder.path, line, f"bound type {kind} is not supported")
+
+
+def write_mps(model: Union[ssmod.Model, MatrixModel], path: str):
+    """ Writes the model into the free MPS file. """
+    matrix = _matrix_model(model)
+    colptr, rows, values = _columns_order(matrix)
+    senses = {t.value: s for (s, t) in _MPS_SENSES.items()}
+
+    with open(path, 'w') as f:
+        f.write(f"NAME {matrix.name}\n")
+        if matrix.objective_type == ObjectiveType.MAX:
+            f.write("OBJSENSE\n    MAX\n")
+        f.write("ROWS\n N obj\n")
+        f.writelines(f" {senses[int(s)]} {r}\n" for (s, r) in zip(matrix.senses, matrix.constraints))
+
+        f.write("COLUMNS\n")
+        for (j, var) in enumerate(matrix.variables):
+            if matrix.objective[j] != 0 or colptr[j] == colptr[j + 1]:
+                f.write(f"    {var} obj {_number(matrix.objective[j])}\n")
+            f.writelines(f"    {var} {matrix.constraints[r]} {_number(v)}\n"
+                         for (r, v) in zip(rows[colptr[j]:colptr[j + 1]], values[colptr[j]:colptr[j + 1]]))
+
+        f.write("RHS\n")
+        f.writelines(f"    RHS {r} {_number(b)}\n" for (r, b) in zip(matrix.constraints, matrix.rhs) if b != 0)
+        f.write("ENDATA\n")
+
+
+_LP_SECTIONS = {
+    'maximize': 'max', 'maximise': 'max', 'maximum': 'max', 'max': 'max',
+    'minimize': 'min', 'minimise': 'min', 'minimum': 'min', 'min': 'min',
+    'subject to': 'st', 'such that': 'st', 'st': 'st', 's.t.': 'st', 'st.': 'st',
+    'bounds': 'bounds', 'bound': 'bounds',
+    'general': 'general', 'generals': 'general', 'gen': 'general', 'integer': 'general', 'integers': 'general',
+    'binary': 'binary', 'binaries': 'binary', 'bin': 'binary',
+    'end': 'end'
+}
+_LP_TOKEN = re.compile(r'\s*(?:(<=|=<|>=|=>|<|>|=)|([+-])|(:)|((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|([^\s:+\-<>=]+))')
+_LP_OPERATORS = {'<=': ConstraintType.LE, '=<': ConstraintType.LE, '<': ConstraintType.LE,
+                 '>=': ConstraintType.GE, '=>': ConstraintType.GE, '>': ConstraintType.GE, '=': ConstraintType.EQ}
+
+
+class _LpStatement:
+    """
+        Tokens of a single LP statement (objective, constraint or bound), consumed from the left.
+    """
+
+    def __init__(self, tokens: List[tuple], path: str, line: int):
+        self.tokens = tokens
+        self.position = 0
+        self.path = path
+        self.line = line
+
+    def peek(self, kind: int) -> bool:
+        return self.position < len(self.tokens) and self.tokens[self.position][kind] != ''
+
+    def take(self) -> tuple:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def error(self, reason: str) -> ModelFormatError:
+        return ModelFormatError(self.path, self.line, reason)
+
+    def label(self) -> str:
+        if len(self.tokens) > 1 and self.tokens[0][4] != '' and self.tokens[1][2] != '':
+            self.position = 2
+            return self.tokens[0][4]
+        return None
+
+    def number(self) -> float:
+        sign = 1.0
+        while self.peek(1):
+            sign *= -1.0 if self.take()[1] == '-' else 1.0
+        if self.peek(3):
+            return sign * float(self.take()[3])
+        if self.peek(4) and self.tokens[self.position][4].lower() in ('inf', 'infinity'):
+            self.take()
+            return sign * float('inf')
+        raise self.error("number expected")
+
+    def terms(self):
+        """ yields (coefficient, name) pairs until an operator, constants are yielded with None name """
+        while not self.done() and not self.peek(0):
+            sign = 1.0
+            while self.peek(1):
+                sign *= -1.0 if self.take()[1] == '-' else 1.0
+            coefficient = float(self.take()[3]) if self.peek(3) else 1.0
+            name = self.take()[4] if self.peek(4) else None
+            if name is None and not self.peek(0) and not self.done() and not self.peek(1):
+                raise self.error("unexpected token")
+            yield (sign * coefficient, name)
+
+
+def read_lp(path: str) -> MatrixModel:
+    """ Reads a model from the CPLEX-LP file. """
+    builder = _MatrixBuilder(path)
+    objective_type = None
+    section = None
+    tokens = []
+    scan = 0
+    start_line = 0
+
+    def flush():
+        nonlocal tokens, scan
+        if len(tokens) > 0:
+            statement = _LpStatement(tokens, path, start_line)
+            if section in ('max', 'min'):
+                _read_lp_objective(builder, statement)
+            elif section == 'st':
+                _read_lp_constraint(builder, statement)
+            else:
+                raise statement.error("unfinished statement")
+        tokens = []
+        scan = 0
+
+    with open(path) as f:
+        for (line_no, line) in enumerate(f, 1):
+            line = line.split('\\', 1)[0].strip()
+            if len(line) == 0:
+                continue
+
+            keyword = _LP_SECTIONS.get(' '.join(line.lower().split()))
+            if keyword is not None:
+                flush()
+                section = keyword
+                if section in ('max', 'min'):
+                    objective_type = ObjectiveType.MAX if section == 'max' else ObjectiveType.MIN
+                if section == 'end':
+                    break
+                continue
+
+            line_tokens = _LP_TOKEN.findall(line)
+            if section == 'bounds':
+                _read_lp_bound(builder, _LpStatement(line_tokens, path, line_no))
+            elif section == 'binary':
+                for token in line_tokens:
+                    builder.add_bound(builder.existing_column(token[4], line_no), line_no, upper=1.0)
+            elif section == 'general':
+                continue
+            elif section in ('max', 'min', 'st'):
+                if len(tokens) == 0:
+                    start_line = line_no
+                tokens += line_tokens
+                if section == 'st':
+                    (start, scan) = _flush_finished_constraints(builder, tokens, scan, path, start_line, line_no)
+                    if start > 0:
+                        # the constraints left in the buffer begin on this line
+                        start_line = line_no
+                        del tokens[:start]
+                        scan -= start
+            else:
+                raise ModelFormatError(path, line_no, "data outside of a section")
+        flush()
+
+    if objective_type is None:
+        raise ModelFormatError(path, 0, "missing objective")
+    return builder.build(os.path.basename(path), objective_type)
+
+
+def _flush_finished_constraints(builder: _MatrixBuilder, tokens: List[tuple], scan: int, path: str, line: int,
+                                current_line: int) -> Tuple[int, int]:
+    """
+        reads all the complete constraints (ending with the `operator number` suffix) from the buffer,
+        the operators are searched from `scan` on, so every token is scanned once however long the constraint is,
+        returns the position of the unfinished constraint and the position to resume the search from
+    """
+    start = 0
+    while True:
+        operator = scan
+        while operator < len(tokens) and tokens[operator][0] == '':
+            operator += 1
+        end = operator + 1
+        while end < len(tokens) and tokens[end][1] != '':
+            end += 1
+        if end >= len(tokens):
+            return (start, operator)
+        _read_lp_constraint(builder, _LpStatement(tokens[start:end + 1], path, line if start == 0 else current_line))
+        start = scan = end + 1
+
+
+def _read_lp_objective(builder: _MatrixBuilder, statement: _LpStatement):
+    statement.label()
+    for (coefficient, name) in statement.terms():
+        if name is not None:
+            builder.objective[builder.column(name)] += coefficient
+    if not statement.done():
+        raise statement.error("unexpected operator in the objective")
+
+
+def _read_lp_constraint(builder: _MatrixBuilder, statement: _LpStatement):
+    name = statement.label()
+    terms = list(statement.terms())
+    if statement.done():
+        raise statement.error("missing constraint operator")
+    sense = _LP_OPERATORS[statement.take()[0]]
+    rhs = statement.number() - sum(c for (c, n) in terms if n is None)
+
+    row = builder.add_row(name if name is not None else f"R{len(builder.row_names)}", sense, statement.line)
+    builder.rhs[row] = rhs
+    for (coefficient, var) in terms:
+        if var is not None:
+            builder.add_entry(row, builder.column(var), coefficient)
+
+
+def _read_lp_bound(builder: _MatrixBuilder, statement: _LpStatement):
+    tokens = statement.tokens
+    if len(tokens) == 2 and tokens[1][4].lower() == 'free':
+        raise statement.error(f"free variable {tokens[0][4]} is not supported")
+
+    if statement.peek(4) and tokens[0][4].lower() not in ('inf', 'infinity'):
+        column = builder.column(statement.take()[4])
+        sense = _LP_OPERATORS[statement.take()[0]]
+        value = statement.number()
+        bounds = {ConstraintType.LE: dict(upper=value), ConstraintType.GE: dict(lower=value),
+                  ConstraintType.EQ: dict(lower=value, upper=value)}[sense]
+        builder.add_bound(column, statement.line, **bounds)
+        return
+
+    lower = statement.number()
+    if _LP_OPERATORS[statement.take()[0]] != ConstraintType.LE:
+        raise statement.error("only `lower <= x <= upper` double bounds are supported")
+    column = builder.column(statement.take()[4])
+    upper = None
+    if not statement.done():
+        if _LP_OPERATORS[statement.take()[0]] != ConstraintType.LE:
+            raise statement.error("only `lower <= x <= upper` double bounds are supported")
+        upper = statement.number()
+    builder.add_bound(column, statement.line, lower=lower if lower != 0 else None, upper=upper)
+
+
+def write_lp(model: Union[ssmod.Model, MatrixModel], path: str, terms_per_line: int = 8):
+    """ Writes the model into the CPLEX-LP file. """
+    matrix = _matrix_model(model)
+    senses = {ConstraintType.LE.value: '<=', ConstraintType.GE.value: '>=', ConstraintType.EQ.value: '='}
+
+    def write_terms(f: TextIO, columns, values):
+        for (k, (j, v)) in enumerate(zip(columns, values)):
+            if k > 0 and k % terms_per_line == 0:
+                f.write("\n   ")
+            f.write(f" {'-' if v < 0 else '+'} {_number(abs(v))} {matrix.variables[j]}")
+
+    with open(path, 'w') as f:
+        f.write(f"\\ Problem name: {matrix.name}\n")
+        f.write("Maximize\n" if matrix.objective_type == ObjectiveType.MAX else "Minimize\n")
+        f.write(" obj:")
+        objective_columns = np.nonzero(matrix.objective)[0]
+        write_terms(f, objective_columns, matrix.objective[objective_columns])
+        f.write("\nSubject To\n")
+        for (i, name) in enumerate(matrix.constraints):
+            f.write(f" {name}:")
+            start, end = matrix.indptr[i], matrix.indptr[i + 1]
+            if start == end:
+                f.write(f" 0 {matrix.variables[0]}")
+            write_terms(f, matrix.indices[start:end], matrix.data[start:end])
+            f.write(f" {senses[int(matrix.senses[i])]} {_number(matrix.rhs[i])}\n")
+        f.write("End\n")
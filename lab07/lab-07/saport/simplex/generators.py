@@ -0,0 +1,91 @@
+"""
+Seeded generators of the random linear programs, used by the benchmarks and the tests.
+
+Every generator takes the size parameters and a seed, and returns a new model,
+the same arguments always produce the same model.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+import saport.simplex.model as ssmod
+import saport.simplex.expressions.expression as sseexp
+
+
+def dense_lp(constraints_n: int, variables_n: int, seed: int = 0) -> ssmod.Model:
+    """ A feasible and bounded maximization with a fully dense matrix of positive coefficients. """
+    rng = np.random.default_rng(seed)
+    model = ssmod.Model(f"dense_{constraints_n}x{variables_n}_{seed}")
+    vars = [model.create_variable(f"x{i}") for i in range(variables_n)]
+    for _ in range(constraints_n):
+        coefficients = rng.uniform(0.1, 5.0, variables_n).tolist()
+        model.add_constraint(sseexp.Expression.from_vectors(vars, coefficients) <= float(rng.uniform(10, 100)))
+    model.maximize(sseexp.Expression.from_vectors(vars, rng.uniform(1.0, 10.0, variables_n).tolist()))
+    return model
+
+
+def transportation_lp(suppliers_n: int, customers_n: int, seed: int = 0) -> ssmod.Model:
+    """ A sparse minimum cost transportation problem, the total supply exceeds the total demand. """
+    rng = np.random.default_rng(seed)
+    model = ssmod.Model(f"transportation_{suppliers_n}x{customers_n}_{seed}")
+    flows = [[model.create_variable(f"x{i}_{j}") for j in range(customers_n)] for i in range(suppliers_n)]
+    demands = rng.integers(5, 20, customers_n).astype(float)
+    supplies = rng.dirichlet(np.ones(suppliers_n)) * demands.sum() * 1.2 + 1.0
+    costs = rng.integers(1, 30, (suppliers_n, customers_n)).astype(float)
+
+    for i in range(suppliers_n):
+        model.add_constraint(sseexp.Expression.from_vectors(flows[i], [1.0] * customers_n) <= float(supplies[i]))
+    for j in range(customers_n):
+        column = [flows[i][j] for i in range(suppliers_n)]
+        model.add_constraint(sseexp.Expression.from_vectors(column, [1.0] * suppliers_n) >= float(demands[j]))
+    model.minimize(sseexp.Expression.from_vectors([x for row in flows for x in row], costs.flatten().tolist()))
+    return model
+
+
+def assignment_lp(n: int, seed: int = 0) -> ssmod.Model:
+    """ A minimum cost assignment of n workers to n tasks, a sparse and highly degenerate problem. """
+    rng = np.random.default_rng(seed)
+    model = ssmod.Model(f"assignment_{n}_{seed}")
+    assign = [[model.create_variable(f"x{i}_{j}") for j in range(n)] for i in range(n)]
+    for i in range(n):
+        model.add_constraint(sseexp.Expression.from_vectors(assign[i], [1.0] * n) == 1)
+    for j in range(n):
+        model.add_constraint(sseexp.Expression.from_vectors([assign[i][j] for i in range(n)], [1.0] * n) == 1)
+    costs = rng.integers(1, 100, n * n).astype(float).tolist()
+    model.minimize(sseexp.Expression.from_vectors([x for row in assign for x in row], costs))
+    return model
+
+
+def degenerate_lp(constraints_n: int, variables_n: int, seed: int = 0) -> ssmod.Model:
+    """ A dense maximization where half of the constraints pass through the origin, so many pivots are degenerate. """
+    rng = np.random.default_rng(seed)
+    model = ssmod.Model(f"degenerate_{constraints_n}x{variables_n}_{seed}")
+    vars = [model.create_variable(f"x{i}") for i in range(variables_n)]
+    for i in range(constraints_n):
+        coefficients = rng.uniform(-1.0, 5.0, variables_n) if i % 2 else rng.uniform(0.1, 5.0, variables_n)
+        bound = 0.0 if i % 2 else float(rng.uniform(10, 100))
+        model.add_constraint(sseexp.Expression.from_vectors(vars, coefficients.tolist()) <= bound)
+    model.maximize(sseexp.Expression.from_vectors(vars, rng.uniform(1.0, 10.0, variables_n).tolist()))
+    return model
+
+
+def infeasible_lp(constraints_n: int, variables_n: int, seed: int = 0) -> ssmod.Model:
+    """ A dense problem with a covering constraint that contradicts the packing ones. """
+    model = dense_lp(constraints_n, variables_n, seed)
+    model.name = f"infeasible_{constraints_n}x{variables_n}_{seed}"
+    # every packing row has coefficients >= 0.1 and the bound <= 100, so the sum of the variables can't exceed 1000
+    model.add_constraint(sseexp.Expression.from_vectors(model.variables, [1.0] * variables_n) >= 1001)
+    return model
+
+
+def unbounded_lp(constraints_n: int, variables_n: int, seed: int = 0) -> ssmod.Model:
+    """ A dense maximization where the last variable only relaxes the constraints and improves the objective. """
+    rng = np.random.default_rng(seed)
+    model = ssmod.Model(f"unbounded_{constraints_n}x{variables_n}_{seed}")
+    vars = [model.create_variable(f"x{i}") for i in range(variables_n)]
+    for _ in range(constraints_n):
+        coefficients = rng.uniform(0.1, 5.0, variables_n)
+        coefficients[-1] = -rng.uniform(0.1, 1.0)
+        model.add_constraint(sseexp.Expression.from_vectors(vars, coefficients.tolist()) <= float(rng.uniform(10, 100)))
+    model.maximize(sseexp.Expression.from_vectors(vars, rng.uniform(1.0, 10.0, variables_n).tolist()))
+    return model
@@ -0,0 +1,287 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import json
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import saport.simplex.model as ssmod
+import saport.simplex.expressions.constraint as ssecon
+import saport.simplex.expressions.expression as sseexp
+import saport.simplex.expressions.objective as sseobj
+
+
+class MatrixModel:
+    """
+        A class to represent a linear programming problem in a compact matrix form.
+        Constraint matrix is stored row-wise in the CSR format (row `i` has coefficients `data[indptr[i]:indptr[i+1]]`
+        for the variables `indices[indptr[i]:indptr[i+1]]`), so big models don't need per-term Expression objects.
+
+        Attributes
+        ----------
+        name : str
+            name of the problem
+        variables : List[str]
+            names of the variables, variable `i` corresponds to the column `i`
+        constraints : List[str]
+            names of the constraints, constraint `i` corresponds to the row `i`
+        indptr : numpy.Array
+            CSR row pointers (len = number of constraints + 1)
+        indices : numpy.Array
+            CSR column indexes of the nonzero coefficients
+        data : numpy.Array
+            CSR nonzero coefficients
+        rhs : numpy.Array
+            bounds of the constraints
+        senses : numpy.Array
+            types of the constraints, stored as `ConstraintType.value`
+        objective : numpy.Array
+            dense vector of the objective coefficients
+        objective_type : ObjectiveType
+            whether the objective should be maximized or minimized
+
+        Methods
+        -------
+        from_model(model: Model) -> MatrixModel:
+            compiles the given model into the matrix form
+        to_model(model_type: type = None) -> Model:
+            creates a regular model (of `model_type`, a `Model` subclass, by default `Model`),
+            with expressions built directly from the rows
+        dense() -> numpy.Array:
+            returns the constraint matrix as a dense 2d-array
+        nnz() -> int:
+            returns number of the nonzero coefficients in the constraint matrix
+        evaluate_batch(assignments: array, tolerance: float = 1e-9) -> Tuple[array, array, array]:
+            evaluates k assignments (k x n array) at once, returns the objective values (k),
+            the slacks of the constraints (k x m, negative when violated,
+            minus the absolute residual for the equalities)
+            and the feasibility mask (k), taking into account nonnegativity of the variables
+        save(path: str):
+            stores the model in the binary snapshot file
+        load(path: str, mmap: bool = True) -> MatrixModel:
+            loads the model from the binary snapshot file, arrays are memory-mapped (read only) if `mmap` is set,
+            so the processes loading the same file share one copy of the matrix (as long as they use the MatrixModel,
+            `to_model` copies the arrays into the expressions)
+    """
+    _MAGIC = b"SAPORT01"
+    _ALIGNMENT = 64
+
+    name: str
+    variables: List[str]
+    constraints: List[str]
+    indptr: ArrayLike
+    indices: ArrayLike
+    data: ArrayLike
+    rhs: ArrayLike
+    senses: ArrayLike
+    objective: ArrayLike
+    objective_type: sseobj.ObjectiveType
+
+    def __init__(self, name: str, variables: List[str], constraints: List[str], indptr: ArrayLike, indices: ArrayLike,
+                 data: ArrayLike, rhs: ArrayLike, senses: ArrayLike, objective: ArrayLike,
+                 objective_type: sseobj.ObjectiveType = sseobj.ObjectiveType.MAX):
+        self.name = name
+        self.variables = variables
+        self.constraints = constraints
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.rhs = rhs
+        self.senses = senses
+        self.objective = objective
+        self.objective_type = objective_type
+
+    @staticmethod
+    def from_model(model: ssmod.Model) -> MatrixModel:
+        indptr = [0]
+        indices = []
+        data = []
+        for constraint in model.constraints:
+            row = dict()
+            for a in constraint.expression.atoms:
+                row[a.var.index] = row.get(a.var.index, 0.0) + a.coefficient
+            columns = sorted(j for (j, v) in row.items() if v != 0.0)
+            indices += columns
+            data += [row[j] for j in columns]
+            indptr.append(len(indices))
+
+        objective = np.zeros(len(model.variables))
+        objective_type = sseobj.ObjectiveType.MAX
+        if model.objective is not None:
+            objective_type = model.objective.type
+            for a in model.objective.expression.atoms:
+                objective[a.var.index] += a.coefficient
+
+        return MatrixModel(model.name,
+                           [v.name for v in model.variables],
+                           [f"c{c.index}" for c in model.constraints],
+                           np.array(indptr, dtype=np.int64),
+                           np.array(indices, dtype=np.int64),
+                           np.array(data, dtype=float),
+                           np.array([c.bound for c in model.constraints], dtype=float),
+                           np.array([c.type.value for c in model.constraints], dtype=np.int8),
+                           objective,
+                           objective_type)
+
+    def to_model(self, model_type: type = None) -> ssmod.Model:
+        model = (ssmod.Model if model_type is None else model_type)(self.name)
+        # names are unique by construction, so the (quadratic) duplicate check of `create_variable` can be skipped
+        model.variables = [sseexp.Variable(name, i) for (i, name) in enumerate(self.variables)]
+
+        # plain lists are much faster to iterate than the (possibly memory-mapped) arrays
+        indptr, indices, data = self.indptr.tolist(), self.indices.tolist(), self.data.tolist()
+        types = {t.value: t for t in ssecon.ConstraintType}
+        for (i, (bound, sense)) in enumerate(zip(self.rhs.tolist(), self.senses.tolist())):
+            atoms = [
+                sseexp.Atom(model.variables[j], v)
+                for (j, v) in zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]])
+            ]
+            model.add_constraint(ssecon.Constraint(sseexp.Expression(*atoms), bound, types[sense]))
+
+        objective_atoms = [sseexp.Atom(model.variables[j], self.objective[j]) for j in np.nonzero(self.objective)[0]]
+        model.objective = sseobj.Objective(sseexp.Expression(*objective_atoms), self.objective_type)
+        return model
+
+    def dense(self) -> ArrayLike:
+        matrix = np.zeros((len(self.constraints), len(self.variables)))
+        rows = np.repeat(np.arange(len(self.constraints)), np.diff(self.indptr))
+        np.add.at(matrix, (rows, self.indices), self.data)
+        return matrix
+
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def evaluate_batch(self, assignments: ArrayLike, tolerance: float = 1e-9) -> Tuple[ArrayLike, ArrayLike, ArrayLike]:
+        assignments = np.atleast_2d(np.asarray(assignments, dtype=float))
+        objective_values = assignments @ self.objective
+        residuals = self._products(assignments) - self.rhs
+        senses = np.asarray(self.senses)
+        slacks = np.where(senses == ssecon.ConstraintType.EQ.value, -np.abs(residuals), senses * residuals)
+        feasible = (slacks >= -tolerance).all(axis=1) & (assignments >= -tolerance).all(axis=1)
+        return (objective_values, slacks, feasible)
+
+    def _products(self, assignments: np.ndarray, chunk: int = 1 << 22) -> np.ndarray:
+        """
+            _products(assignments: array, chunk: int = 1 << 22) -> array:
+                returns the left hand sides of the constraints for the assignments (k x m) straight from the CSR arrays,
+                the assignments are processed in batches of at most `chunk` nonzero products
+        """
+        indptr = np.asarray(self.indptr)
+        products = np.zeros((len(assignments), len(self.constraints)))
+        # `reduceat` can't sum the empty rows, the segments of the other ones span exactly their nonzeros
+        nonempty = np.flatnonzero(np.diff(indptr) > 0)
+        if len(nonempty) == 0:
+            return products
+        starts = indptr[nonempty]
+        step = max(1, chunk // max(1, self.nnz()))
+        for start in range(0, len(assignments), step):
+            block = assignments[start:start + step]
+            products[start:start + step, nonempty] = np.add.reduceat(block[:, self.indices] * self.data, starts, axis=1)
+        return products
+
+    def save(self, path: str):
+        """
+            Snapshot layout: magic, header length (uint64), json header, arrays (each aligned to 64 bytes).
+            Names are stored as a string table, i.e. utf-8 bytes of all the names and their offsets.
+        """
+        arrays = {
+            'indptr': np.asarray(self.indptr, dtype=np.int64),
+            'indices': np.asarray(self.indices, dtype=np.int64),
+            'data': np.asarray(self.data, dtype=np.float64),
+            'rhs': np.asarray(self.rhs, dtype=np.float64),
+            'senses': np.asarray(self.senses, dtype=np.int8),
+            'objective': np.asarray(self.objective, dtype=np.float64),
+        }
+        for (key, names) in [('variables', self.variables), ('constraints', self.constraints)]:
+            encoded = [n.encode('utf-8') for n in names]
+            arrays[f'{key}_table'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            lengths = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+            arrays[f'{key}_offsets'] = np.concatenate([[0], lengths]).astype(np.int64)
+
+        layout: Dict[str, dict] = dict()
+        offset = 0
+        for (key, array) in arrays.items():
+            layout[key] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += self._aligned(array.nbytes)
+        header = json.dumps({
+            'name': self.name,
+            'objective_type': self.objective_type.value,
+            'arrays': layout
+        }).encode('utf-8')
+        data_start = self._aligned(len(self._MAGIC) + 8 + len(header))
+
+        with open(path, 'wb') as f:
+            f.write(self._MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for (key, array) in arrays.items():
+                f.seek(data_start + layout[key]['offset'])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> MatrixModel:
+        with open(path, 'rb') as f:
+            if f.read(len(MatrixModel._MAGIC)) != MatrixModel._MAGIC:
+                raise ValueError(f"{path} is not a SAPORT model snapshot")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_length).decode('utf-8'))
+        data_start = MatrixModel._aligned(len(MatrixModel._MAGIC) + 8 + header_length)
+
+        def array(key: str):
+            spec = header['arrays'][key]
+            dtype, shape, offset = np.dtype(spec['dtype']), tuple(spec['shape']), data_start + spec['offset']
+            if shape[0] == 0:
+                return np.zeros(shape, dtype=dtype)
+            if mmap:
+                return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+            return np.fromfile(path, dtype=dtype, count=shape[0], offset=offset)
+
+        def names(key: str) -> List[str]:
+            table, offsets = bytes(array(f'{key}_table')), array(f'{key}_offsets')
+            return [table[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+        return MatrixModel(header['name'], names('variables'), names('constraints'),
+                           array('indptr'), array('indices'), array('data'), array('rhs'), array('senses'),
+                           array('objective'), sseobj.ObjectiveType(header['objective_type']))
+
+    @staticmethod
+    def _aligned(size: int) -> int:
+        return -(-size // MatrixModel._ALIGNMENT) * MatrixModel._ALIGNMENT
+
+
+def basis_matrix(matrix: ArrayLike, basis: List[int], tolerance: float = 1e-9) -> Tuple[np.ndarray, np.ndarray]:
+    """
+        basis_matrix(matrix: array, basis: List[int], tolerance: float = 1e-9) -> Tuple[array, array]:
+            returns the square basis matrix
+            (the columns of the dense constraint matrix in the order of the tableau rows)
+            and the mask of its artificial columns: a redundant row has no basic variable (`-1` in the basis),
+            its slot gets the unit column of one of the dependent constraints, so the matrix stays nonsingular
+            and the dual price of that constraint is zero
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    basis = np.asarray(basis, dtype=int)
+    missing = basis < 0
+    columns = matrix[:, np.where(missing, 0, basis)]
+    if not missing.any():
+        return (columns, missing)
+
+    # the rows of the basic columns spanning the space are kept, the remaining constraints get the unit columns
+    basic = columns[:, ~missing]
+    independent, vectors = [], []
+    for (i, row) in enumerate(basic):
+        residual = row.copy()
+        for vector in vectors:
+            residual -= (residual @ vector) * vector
+        norm = np.linalg.norm(residual)
+        if norm > tolerance * max(1.0, np.linalg.norm(row)):
+            independent.append(i)
+            vectors.append(residual / norm)
+            if len(vectors) == basic.shape[1]:
+                break
+    independent = set(independent)
+    slots = np.flatnonzero(missing)
+    dependent = [i for i in range(len(matrix)) if i not in independent][:len(slots)]
+    columns[:, missing] = 0.0
+    columns[dependent, slots[:len(dependent)]] = 1.0
+    return (columns, missing)
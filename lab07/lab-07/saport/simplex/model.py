@@ -1,12 +1,15 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Tuple
+from numpy.typing import ArrayLike
 from saport.simplex.exceptions import DuplicateVariableError, EmptyModelError, MissingObjectiveError
+from saport.simplex.cancellation import CancellationToken
 
 import saport.simplex.expressions.objective as sseobj
 import saport.simplex.expressions.constraint as ssecon
 import saport.simplex.solver as ssslv
 import saport.simplex.expressions.expression as sseexp
 import saport.simplex.solution as sssol
+import saport.simplex.matrix as ssmat
 
 class Model:
     """
@@ -37,9 +40,26 @@ class Model:
             sets objective to minimize the specified Expression
         simplify():
             simplifies all the expressions used in the model
-        solve() -> Solution
+        solve(timelimit: float | None = None, token: CancellationToken | None = None) -> Solution
             solves the current model using Simplex solver and returns the result
             when called, the model should already contain at least one variable and objective
+            solving stops after `timelimit` seconds or when the token gets cancelled, returning an interrupted solution
+        solve_lexicographic(objectives: List[Objective], timelimit: float | None = None,
+                            token: CancellationToken | None = None) -> List[Solution]
+            optimizes the objectives in the priority order,
+            each stage re-optimizes the optimal tableau of the previous one,
+            returns solutions of the consecutive stages,
+            the last one is optimal for all the objectives (see `Solver.solve_lexicographic`)
+        evaluate_batch(assignments: array, tolerance: float = 1e-9) -> Tuple[array, array, array]:
+            evaluates k assignments (k x n array) at once on the compiled model (see `MatrixModel.evaluate_batch`),
+            returns the objective values, the constraint slacks and the feasibility mask,
+            the model is compiled on every call,
+            the repeated evaluations should keep the `MatrixModel.from_model` result
+        save(path: str):
+            stores the model in the binary snapshot file (see MatrixModel)
+        load(path: str) -> Model:
+            class method, loads the model (of the class it's called on) from the binary snapshot file,
+            the expressions are built in every process, use `MatrixModel.load` to share one copy of the matrix
     """
     name: str
     variables: List[sseexp.Variable]
@@ -79,16 +99,43 @@ class Model:
         if self.objective is not None:
             self.objective.simplify()
 
-    def solve(self) -> sssol.Solution:
+    def solve(self, timelimit: float = None, token: CancellationToken = None) -> sssol.Solution:
         if len(self.variables) == 0:
             raise EmptyModelError()
 
         if self.objective is None:
             raise MissingObjectiveError()
 
-        solver = ssslv.Solver()
+        if timelimit is not None:
+            token = (token if token is not None else CancellationToken()).limited(timelimit)
+        solver = ssslv.Solver(token)
         return solver.solve(self)
 
+    def solve_lexicographic(self,
+                            objectives: List[sseobj.Objective],
+                            timelimit: float = None,
+                            token: CancellationToken = None) -> List[sssol.Solution]:
+        if len(self.variables) == 0:
+            raise EmptyModelError()
+
+        if len(objectives) == 0:
+            raise MissingObjectiveError()
+
+        if timelimit is not None:
+            token = (token if token is not None else CancellationToken()).limited(timelimit)
+        solver = ssslv.Solver(token)
+        return solver.solve_lexicographic(self, objectives)
+
+    def evaluate_batch(self, assignments: ArrayLike, tolerance: float = 1e-9) -> Tuple[ArrayLike, ArrayLike, ArrayLike]:
+        return ssmat.MatrixModel.from_model(self).evaluate_batch(assignments, tolerance)
+
+    def save(self, path: str):
+        ssmat.MatrixModel.from_model(self).save(path)
+
+    @classmethod
+    def load(cls, path: str) -> Model:
+        return ssmat.MatrixModel.load(path, mmap=False).to_model(cls)
+
     def __str__(self) -> str:
         separator = '\n\t'
         text = f'''- name: {self.name}
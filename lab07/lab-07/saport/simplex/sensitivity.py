@@ -0,0 +1,155 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+import saport.simplex.model as ssmod
+import saport.simplex.tableau as sstab
+import saport.simplex.matrix as ssmat
+import saport.simplex.expressions.objective as sseobj
+
+
+@dataclass(frozen=True)
+class Range:
+    """
+    A dataclass representing the range in which a coefficient can change without changing the optimal basis.
+
+    Attributes
+    ----------
+    value : float
+        current value of the coefficient
+    lower : float
+        lowest value keeping the basis optimal (may be -inf)
+    upper : float
+        highest value keeping the basis optimal (may be inf)
+    """
+    value: float
+    lower: float
+    upper: float
+
+    def allowable_increase(self) -> float:
+        return self.upper - self.value
+
+    def allowable_decrease(self) -> float:
+        return self.value - self.lower
+
+
+class SensitivityAnalysis:
+    """
+        A class computing the sensitivity information of an optimal solution from its final tableau.
+
+        All the quantities are expressed in the terms of the original model (its objective sense and constraint signs),
+        even though the tableau corresponds to the augmented (maximization, nonnegative bounds) one.
+        Only the inverse of the optimal basis has to be computed, the rest are vectorized operations on the tableau.
+        A redundant constraint (a tableau row without a basic variable) keeps an artificial variable
+        at zero in the basis,
+        its dual price is zero and its bound can't change without making the model infeasible.
+
+        Attributes
+        ----------
+        model : Model
+            the original model
+        tableau : Tableau
+            the optimal tableau of the model
+
+        Methods
+        -------
+        __init__(model: Model, tableau: Tableau) -> SensitivityAnalysis:
+            prepares the analysis of the given optimal tableau
+        duals() -> numpy.Array:
+            returns shadow prices of the constraints, i.e. the objective change per unit increase of the bounds
+        reduced_costs() -> numpy.Array:
+            returns reduced costs of the variables (`c_j - duals @ a_j`), zero for the basic variables
+        rhs_ranges() -> List[Range]:
+            returns ranges of the constraint bounds, within which the duals stay valid
+        objective_ranges() -> List[Range]:
+            returns ranges of the objective coefficients, within which the solution stays optimal
+        report() -> str:
+            returns a human readable summary of the analysis
+    """
+    model: ssmod.Model
+    tableau: sstab.Tableau
+
+    def __init__(self, model: ssmod.Model, tableau: sstab.Tableau):
+        self.model = model
+        self.tableau = tableau
+        matrix = ssmat.MatrixModel.from_model(tableau.model)
+        self._basis = np.array(tableau.extract_basis())
+        basis_matrix, self._artificial = ssmat.basis_matrix(matrix.dense(), self._basis)
+        self._basis_inverse = np.linalg.inv(basis_matrix)
+        self._costs = matrix.objective
+        self._basic_costs = np.where(self._artificial, 0.0, self._costs[self._basis])
+        self._row_signs = np.array([-1.0 if c.bound < 0 else 1.0 for c in model.constraints])
+        self._objective_sign = -1.0 if model.objective.type == sseobj.ObjectiveType.MIN else 1.0
+
+    def duals(self) -> np.ndarray:
+        max_duals = self._basic_costs @ self._basis_inverse
+        return max_duals * self._row_signs * self._objective_sign
+
+    def reduced_costs(self) -> np.ndarray:
+        variables_n = len(self.model.variables)
+        return -self._objective_sign * np.asarray(self.tableau.objective_factors()[:variables_n], dtype=float)
+
+    def rhs_ranges(self) -> List[Range]:
+        values = np.asarray(self.tableau.table[1:, -1], dtype=float)
+        # changing the i-th (augmented) bound by delta moves the basic variables by delta * basis_inverse[:, i]
+        # the artificial variables have to stay at zero, so they block the changes in both directions
+        artificial = self._artificial[:, None]
+        inverse = self._basis_inverse
+        increase = self._ratios(values[:, None], np.where(artificial, np.abs(inverse), -inverse))
+        decrease = self._ratios(values[:, None], np.where(artificial, np.abs(inverse), inverse))
+        return self._ranges([c.bound for c in self.model.constraints], increase, decrease, self._row_signs)
+
+    def objective_ranges(self) -> List[Range]:
+        variables_n = len(self.model.variables)
+        factors = np.asarray(self.tableau.objective_factors(), dtype=float)
+        # a nonbasic variable enters the basis once its cost grows by more than its reduced cost
+        increase = np.maximum(factors[:variables_n], 0.0)
+        decrease = np.full(variables_n, np.inf)
+
+        # changing the cost of the basic variable in row r by delta changes the reduced costs by delta * row r
+        rows = np.asarray(self.tableau.table[1:, :-1], dtype=float)
+        nonbasic = np.ones(len(factors), dtype=bool)
+        nonbasic[self._basis[~self._artificial]] = False
+        row_rates = np.where(nonbasic, rows, 0.0)
+        basic_increase = self._ratios(factors[None, :], -row_rates, axis=1)
+        basic_decrease = self._ratios(factors[None, :], row_rates, axis=1)
+        original = ~self._artificial & (self._basis < variables_n)
+        increase[self._basis[original]] = basic_increase[original]
+        decrease[self._basis[original]] = basic_decrease[original]
+
+        costs = self._costs[:variables_n] * self._objective_sign
+        return self._ranges(costs, increase, decrease, np.full(variables_n, self._objective_sign))
+
+    def report(self) -> str:
+        def cell(x, w: int) -> str:
+            return '{0: >{1}}'.format(x, w)
+
+        def number(x: float) -> str:
+            return "{:.3f}".format(x)
+
+        header = ["", "value", "price", "lower", "upper"]
+        rows = [[f"c{i}", number(r.value), number(d), number(r.lower), number(r.upper)]
+                for (i, (r, d)) in enumerate(zip(self.rhs_ranges(), self.duals()))]
+        rows += [[v.name, number(r.value), number(d), number(r.lower), number(r.upper)]
+                 for (v, r, d) in zip(self.model.variables, self.objective_ranges(), self.reduced_costs())]
+        longest_col = max(len(v) for row in [header] + rows for v in row)
+        return "\n".join(" | ".join(cell(v, longest_col) for v in row) for row in [header] + rows) + "\n"
+
+    @staticmethod
+    def _ratios(numerators: np.ndarray, rates: np.ndarray, axis: int = 0) -> np.ndarray:
+        """
+            _ratios(numerators: array, rates: array, axis: int) -> array:
+                returns the largest steps keeping `numerators - step * rates` nonnegative, computed along the axis
+        """
+        positive = rates > sstab.eps
+        steps = np.where(positive, np.maximum(numerators, 0.0) / np.where(positive, rates, 1.0), np.inf)
+        return steps.min(axis=axis) if steps.shape[axis] > 0 else np.full(steps.shape[1 - axis], np.inf)
+
+    @staticmethod
+    def _ranges(values: List[float], increase: np.ndarray, decrease: np.ndarray, signs: np.ndarray) -> List[Range]:
+        # in the augmented model the coefficient is `sign * value`, so a negative sign swaps the directions
+        upper = np.where(signs > 0, increase, decrease)
+        lower = np.where(signs > 0, decrease, increase)
+        return [Range(float(v), float(v - l), float(v + u)) for (v, l, u) in zip(values, lower, upper)]
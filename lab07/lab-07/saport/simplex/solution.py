@@ -4,6 +4,7 @@ from typing import List
 import saport.simplex.model as ssmod
 import saport.simplex.tableau as sstab
 import saport.simplex.expressions.expression as sseexp
+import saport.simplex.sensitivity as sssen
 
 class Solution:
     """
@@ -22,12 +23,17 @@ class Solution:
             whether the problem is feasible
         is_bounded: bool
             whether the problem is bounded
+        is_interrupted: bool
+            whether the solver has been stopped before reaching the optimum,
+            the assignment (if any) corresponds then to the last feasible basis
 
         Methods
         -------
-        __init__(model: Model, assignment: list[float] | None, initial_tableau: Tableau, tableau: Tableau, is_feasible: bool, is_bounded: bool) -> Solution:
+        __init__(model: Model, assignment: list[float] | None, initial_tableau: Tableau, tableau: Tableau,
+                 is_feasible: bool, is_bounded: bool, is_interrupted: bool = False) -> Solution:
             constructs a new solution for the specified model, assignment, tableau
-            if the assignment is null, one of the flags should false - either the solution is infeasible or is unbounded
+            if the assignment is null, one of the flags should false,
+            either the solution is infeasible, unbounded or interrupted
         assignment(model: Model | None) -> List[float]:
             list with the values assigned to the variables in the model if solution is feasible and bounded, otherwise None
             order of values should correspond to the order of variables in model.variables list
@@ -38,6 +44,18 @@ class Solution:
             returns a value of the objective function if the model is feasible and bounded, otherwise None
         has_assignment() -> bool:
             helper method returning info if the model is feasible and bounded, only then there is an assignment available
+        duals() -> numpy.Array | None:
+            returns shadow prices of the constraints (objective change per unit increase of the bound)
+            if the solution is optimal
+        reduced_costs() -> numpy.Array | None:
+            returns reduced costs of the variables if the solution is optimal
+        rhs_ranges() -> List[Range] | None:
+            returns the ranges of the constraint bounds, within which the duals stay valid, if the solution is optimal
+        objective_ranges() -> List[Range] | None:
+            returns the ranges of the objective coefficients, within which the assignment stays optimal,
+            if the solution is optimal
+        sensitivity() -> SensitivityAnalysis | None:
+            returns the (cached) sensitivity analysis of the final tableau if the solution is optimal
     
         Static Methods
         --------------
@@ -47,15 +65,28 @@ class Solution:
             helper method to create infeasible solutions
         unbounded(model, initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
             helper method to create unbounded solutions
+        interrupted(model: ssmod.Model, assignment: List[float] | None, initial_tableau: sstab.Tableau,
+                    tableau: sstab.Tableau):
+            helper method to create solutions of the interrupted solves,
+            assignment is None if no feasible basis was found
     """
 
-    def __init__(self, model: ssmod.Model, assignment: List[float], initial_tableau: sstab.Tableau, tableau: sstab.Tableau, is_feasible: bool, is_bounded: bool):
+    def __init__(self,
+                 model: ssmod.Model,
+                 assignment: List[float],
+                 initial_tableau: sstab.Tableau,
+                 tableau: sstab.Tableau,
+                 is_feasible: bool,
+                 is_bounded: bool,
+                 is_interrupted: bool = False):
         self.model = model 
         self.is_feasible = is_feasible
         self.is_bounded = is_bounded
+        self.is_interrupted = is_interrupted
         self.tableau = tableau
         self.initial_tableau = initial_tableau
         self._assignment = assignment
+        self._sensitivity = None
 
     def assignment(self, model: ssmod.Model = None):
         model = self.model if model is None else model
@@ -70,6 +101,29 @@ class Solution:
     def has_assignment(self):
         return self._assignment is not None
 
+    def sensitivity(self) -> sssen.SensitivityAnalysis:
+        if not self.has_assignment() or self.is_interrupted:
+            return None
+        if self._sensitivity is None:
+            self._sensitivity = sssen.SensitivityAnalysis(self.model, self.tableau)
+        return self._sensitivity
+
+    def duals(self):
+        sensitivity = self.sensitivity()
+        return None if sensitivity is None else sensitivity.duals()
+
+    def reduced_costs(self):
+        sensitivity = self.sensitivity()
+        return None if sensitivity is None else sensitivity.reduced_costs()
+
+    def rhs_ranges(self) -> List[sssen.Range]:
+        sensitivity = self.sensitivity()
+        return None if sensitivity is None else sensitivity.rhs_ranges()
+
+    def objective_ranges(self) -> List[sssen.Range]:
+        sensitivity = self.sensitivity()
+        return None if sensitivity is None else sensitivity.objective_ranges()
+
     @staticmethod
     def with_assignment(model: ssmod.Model, assignment: List[float], initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
         return Solution(model, assignment, initial_tableau, tableau, True, True)  
@@ -82,13 +136,22 @@ class Solution:
     def unbounded(model, initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
         return Solution(model, None, initial_tableau, tableau, True, False)
 
+    @staticmethod
+    def interrupted(model: ssmod.Model, assignment: List[float], initial_tableau: sstab.Tableau,
+                    tableau: sstab.Tableau):
+        return Solution(model, assignment, initial_tableau, tableau, True, True, True)
+
     def __str__(self, model: ssmod.Model = None):
         model = self.model if model is None else model
         
         if not self.is_bounded:
             return "There is no optimal solution, the model is unbounded"
+
+        if self.is_interrupted and not self.has_assignment():
+            return "There is no solution, solving has been interrupted before finding a feasible one"
             
         text = f'- objective value: {self.objective_value()}\n'
+        text += '- solving has been interrupted, solution may be not optimal\n' if self.is_interrupted else ''
         text += '- assignment:'
         for var in model.variables:
             text += f'\n\t- {var.name} = {"{:.3f}".format(self._assignment[var.index])}'
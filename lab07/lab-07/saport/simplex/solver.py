@@ -2,13 +2,14 @@ from __future__ import annotations
 import sys
 from typing import Dict, List
 
-from copy import deepcopy
+from copy import copy, deepcopy
 import saport.simplex.model as ssmod
 import saport.simplex.expressions.objective as sseobj
 import saport.simplex.expressions.constraint as ssecon
 import saport.simplex.expressions.expression as sseexp
 import saport.simplex.solution as sssol
 import saport.simplex.tableau as sstab
+from saport.simplex.cancellation import CancellationToken
 import numpy as np
 
 class Solver:
@@ -23,42 +24,268 @@ class Solver:
             contains mapping from surplus variables to their corresponding constraints
         _artificial: Dict[Variable, Constraint]:
             contains mapping from artificial variables to their corresponding constraints
+        token: CancellationToken | None
+            checked between pivots, when cancelled the solver stops and returns an interrupted solution
+        interrupted: bool
+            whether the last solve has been interrupted
+        out_of_core: bool
+            whether the tableaux should be kept in memory-mapped files (see `MemoryMappedTableau`)
+        memmap_dir: str | None
+            directory for the memory-mapped tableaux, the system temporary directory if None
+        block_rows: int
+            number of rows of a memory-mapped tableau processed at once
+        dtype: numpy.dtype
+            precision of the tableaux, with a lower one than float64 (e.g. float32 for the screening runs)
+            the final basis is refined in float64 (in RAM) and re-optimized if needed, to confirm the optimality
+        refine: bool
+            whether the final basis of a lower precision solve should be refined,
+            without it the solution is a low precision one
+        pivots: int
+            number of pivots made during the last solve
+        refinement_pivots: int
+            number of float64 pivots needed after the refinement of the final basis during the last solve
 
         Methods
         -------
+        __init__(token: CancellationToken | None = None, out_of_core: bool = False, memmap_dir: str | None = None,
+                 block_rows: int = 1024, dtype: numpy.dtype = numpy.float64, refine: bool = True) -> Solver:
+            constructs a new solver, optionally stoppable with the given token,
+            working out of core or in a lower precision
         solve(model: Model) -> Tableau:
             solves the given model and return the first solution
+        solve_lexicographic(model: Model, objectives: List[Objective]) -> List[Solution]:
+            optimizes the objectives in the priority order, each one over the optimal solutions of the previous ones,
+            returns a solution per solved stage (the model of the i-th one has objectives[i] as its objective),
+            the solving stops at the first stage that isn't optimal
+        reoptimize_with_bound(model: Model, tableau: Tableau, col: int, is_upper: bool, value: float) -> Solution:
+            adds the bound `x_col <= value` (or `x_col >= value`) to the optimal tableau of the model
+            and re-optimizes it with the dual simplex, the given tableau isn't modified
+        reoptimize_with_rows(model: Model, tableau: Tableau, rows: array, bounds: List[float]) -> Solution:
+            adds the constraints `rows[i] @ x <= bounds[i]` over the tableau columns (e.g. cuts) to the optimal tableau
+            and re-optimizes it with the dual simplex, the given tableau isn't modified
+        probe_bound(tableau: Tableau, col: int, is_upper: bool, value: float, max_pivots: int) -> float:
+            adds the bound to the optimal tableau and makes at most `max_pivots` dual simplex pivots,
+            returns the objective value of the tableau (in the maximization sense), which is an upper bound
+            of the re-optimized one, since the dual simplex only lowers it,
+            `-inf` if the bound makes the problem infeasible
     """
     _slacks: Dict[sseexp.Variable, ssecon.Constraint]
     _surpluses: Dict[sseexp.Variable, ssecon.Constraint]
     _artificial: Dict[sseexp.Variable, ssecon.Constraint]
+    token: CancellationToken
+    interrupted: bool
+    out_of_core: bool
+    memmap_dir: str
+    block_rows: int
+    dtype: np.dtype
+    refine: bool
+    pivots: int
+    refinement_pivots: int
+
+    def __init__(self,
+                 token: CancellationToken = None,
+                 out_of_core: bool = False,
+                 memmap_dir: str = None,
+                 block_rows: int = 1024,
+                 dtype: np.dtype = np.float64,
+                 refine: bool = True):
+        self.token = token
+        self.interrupted = False
+        self.out_of_core = out_of_core
+        self.memmap_dir = memmap_dir
+        self.block_rows = block_rows
+        self.dtype = np.dtype(dtype)
+        self.refine = refine
+        self.pivots = 0
+        self.refinement_pivots = 0
 
     def solve(self, model: ssmod.Model):
+        self.interrupted = False
+        self.pivots = 0
+        self.refinement_pivots = 0
         normal_model = self._augment_model(model)
         if len(self._slacks) < len(normal_model.constraints):
             tableau, success = self._presolve(normal_model)
+            if self.interrupted:
+                # there is no feasible basis before the first phase finishes
+                return sssol.Solution.interrupted(model, None, tableau, tableau)
             if not success:
                 return sssol.Solution.infeasible(model, tableau, tableau)
         else:
             tableau = self._basic_initial_tableau(normal_model)
 
-        initial_tableau = deepcopy(tableau)
+        initial_tableau = tableau.copy()
         if self._optimize(tableau) == False:
             return sssol.Solution.unbounded(model, initial_tableau, tableau)
 
+        if not self.interrupted and self.refine and self.dtype != np.float64:
+            refined_tableau = self._refine(normal_model, tableau)
+            if refined_tableau is None:
+                return self._solve_in_full_precision(model)
+            tableau = refined_tableau
+            pivots = self.pivots
+            bounded = self._optimize(tableau)
+            self.refinement_pivots = self.pivots - pivots
+            if not bounded:
+                return sssol.Solution.unbounded(model, initial_tableau, tableau)
+
         assignment = tableau.extract_assignment()
+        if self.interrupted:
+            return sssol.Solution.interrupted(model, assignment, initial_tableau, tableau)
         return self._create_solution(assignment, model, initial_tableau, tableau)
 
+    def solve_lexicographic(self, model: ssmod.Model, objectives: List[sseobj.Objective]) -> List[sssol.Solution]:
+        stage_model = copy(model)
+        stage_model.objective = objectives[0]
+        solutions = [self.solve(stage_model)]
+        fixed = None
+
+        for objective in objectives[1:]:
+            previous = solutions[-1]
+            if not previous.has_assignment() or previous.is_interrupted:
+                break
+            stage_model = copy(model)
+            stage_model.objective = objective
+            tableau = previous.tableau.copy()
+            fixed = np.zeros(len(tableau.objective_factors()), dtype=bool) if fixed is None else fixed
+            solutions.append(self._solve_next_stage(stage_model, tableau, fixed))
+        return solutions
+
+    def _solve_next_stage(self, model: ssmod.Model, tableau: sstab.Tableau, fixed: np.ndarray) -> sssol.Solution:
+        """
+            _solve_next_stage(model: Model, tableau: Tableau, fixed: array) -> Solution:
+                re-optimizes the optimal tableau of the previous stage for the objective of the given model,
+                the variables with positive reduced costs are fixed at zero,
+                which keeps the previous objectives optimal,
+                `fixed` is the mask of the variables fixed by the previous stages, it's updated in place
+        """
+        normal_model = tableau.model
+        basis = tableau.extract_basis()
+        fixed |= tableau.objective_factors() > tableau.tolerance
+        tableau.zero_columns(np.flatnonzero(fixed))
+
+        normal_model.objective = deepcopy(model.objective)
+        self._change_objective_to_max(normal_model)
+        objective_row = np.array((-1 * normal_model.objective.expression).coefficients(normal_model) + [0.0])
+        objective_row[:-1][fixed] = 0.0
+        tableau.set_objective_row(objective_row)
+        tableau = self._fix_objective_row_to_the_basis(tableau, basis)
+
+        initial_tableau = tableau.copy()
+        if self._optimize(tableau) == False:
+            return sssol.Solution.unbounded(model, initial_tableau, tableau)
+
+        assignment = tableau.extract_assignment()
+        if self.interrupted:
+            return sssol.Solution.interrupted(model, assignment, initial_tableau, tableau)
+        return self._create_solution(assignment, model, initial_tableau, tableau)
+
+    def reoptimize_with_bound(self, model: ssmod.Model, tableau: sstab.Tableau, col: int, is_upper: bool,
+                              value: float) -> sssol.Solution:
+        return self._reoptimize(model, tableau, tableau.with_bound_row(col, is_upper, value))
+
+    def reoptimize_with_rows(self, model: ssmod.Model, tableau: sstab.Tableau, rows: np.ndarray,
+                             bounds: List[float]) -> sssol.Solution:
+        return self._reoptimize(model, tableau, tableau.with_rows(rows, bounds))
+
+    def probe_bound(self, tableau: sstab.Tableau, col: int, is_upper: bool, value: float, max_pivots: int) -> float:
+        self.interrupted = False
+        self.pivots = 0
+        self.refinement_pivots = 0
+        extended_tableau = tableau.with_bound_row(col, is_upper, value)
+        if not self._dual_optimize(extended_tableau, max_pivots):
+            return -np.inf
+        return float(extended_tableau.objective_value())
+
+    def _reoptimize(self, model: ssmod.Model, tableau: sstab.Tableau,
+                    extended_tableau: sstab.Tableau) -> sssol.Solution:
+        """
+            _reoptimize(model: Model, tableau: Tableau, extended_tableau: Tableau) -> Solution:
+                re-optimizes the optimal tableau extended with the new rows using the dual simplex
+        """
+        self.interrupted = False
+        self.pivots = 0
+        self.refinement_pivots = 0
+        if not self._dual_optimize(extended_tableau):
+            return sssol.Solution.infeasible(model, tableau, extended_tableau)
+        if self.interrupted:
+            # the dual simplex keeps the optimality, not the feasibility, so there is no valid assignment yet
+            return sssol.Solution.interrupted(model, None, tableau, extended_tableau)
+
+        # the dual simplex ends at the optimum, the primal pass only cleans up the numerical noise
+        self._optimize(extended_tableau)
+        assignment = extended_tableau.extract_assignment()
+        if self.interrupted:
+            return sssol.Solution.interrupted(model, assignment, tableau, extended_tableau)
+        return self._create_solution(assignment, model, tableau, extended_tableau)
+
+    def _dual_optimize(self, tableau: sstab.Tableau, max_pivots: float = np.inf):
+        """
+            _dual_optimize(tableau: Tableau, max_pivots: float = inf) -> bool:
+                runs the dual simplex on the (dual feasible) tableau (stopping after `max_pivots` pivots),
+                returns False if the problem is infeasible
+        """
+        pivots = 0
+        while not tableau.is_primal_feasible() and pivots < max_pivots:
+            if self.token is not None and self.token.is_cancelled():
+                self.interrupted = True
+                return True
+            pivot_row = tableau.choose_dual_leaving_variable()
+            if tableau.is_dual_unbounded(pivot_row):
+                return False
+            pivot_col = tableau.choose_dual_entering_variable(pivot_row)
+
+            tableau.pivot(pivot_row, pivot_col)
+            self.pivots += 1
+            pivots += 1
+        return True
+
     def _optimize(self, tableau: sstab.Tableau):
         while not tableau.is_optimal():
+            if self.token is not None and self.token.is_cancelled():
+                self.interrupted = True
+                return True
             pivot_col = tableau.choose_entering_variable()
             if tableau.is_unbounded(pivot_col):
                 return False
             pivot_row = tableau.choose_leaving_variable(pivot_col)
 
             tableau.pivot(pivot_row, pivot_col)
+            self.pivots += 1
         return True
 
+    def _refine(self, model: ssmod.Model, tableau: sstab.Tableau):
+        """
+            _refine(model: Model, tableau: Tableau) -> Tableau | None:
+                returns a float64 tableau for the final basis of the given one, recomputed from the augmented model,
+                or None if the basis is singular or infeasible in the full precision
+        """
+        basis = tableau.extract_basis()
+        if -1 in basis:
+            return None
+
+        objective_row = np.array((-1 * model.objective.expression).coefficients(model) + [0.0])
+        table = self._create_tableau(model, objective_row, np.float64, in_memory=True).table
+        try:
+            rows = np.linalg.solve(table[1:, basis], table[1:])
+        except np.linalg.LinAlgError:
+            return None
+        if rows[:, -1].min() < -sstab.eps:
+            return None
+
+        rows[:, basis] = np.eye(len(basis))
+        objective_row = table[0] - table[0, basis] @ rows
+        objective_row[basis] = 0.0
+        return sstab.Tableau(model, np.vstack([objective_row, rows]))
+
+    def _solve_in_full_precision(self, model: ssmod.Model) -> sssol.Solution:
+        solver = Solver(self.token, self.out_of_core, self.memmap_dir, self.block_rows)
+        solution = solver.solve(model)
+        self.interrupted = solver.interrupted
+        self.pivots += solver.pivots
+        self.refinement_pivots = solver.pivots
+        return solution
+
     def _presolve(self, model: ssmod.Model):
         """
             _presolve(model: Model) -> Tableau:
@@ -68,6 +295,8 @@ class Solver:
         tableau = self._presolve_initial_tableau(presolve_model)
 
         self._optimize(tableau)
+        if self.interrupted:
+            return (tableau, False)
 
         if self._artifical_variables_are_positive(tableau):
             return (tableau, False)
@@ -140,20 +369,28 @@ class Solver:
         for var in self._artificial.keys():
             objective_row[var.index] = 1.0
 
-        table = np.array([objective_row] + [c.expression.coefficients(model) + [c.bound] for c in model.constraints])
-
         for c in self._artificial.values():
             constraint = model.constraints[c.index]
             factors_row = np.array(constraint.expression.coefficients(model) + [constraint.bound])
             objective_row -= factors_row
 
-        table = np.array([objective_row] + [c.expression.coefficients(model) + [c.bound] for c in model.constraints])
-        return sstab.Tableau(model, table)
+        return self._create_tableau(model, objective_row)
 
     def _basic_initial_tableau(self, model: ssmod.Model):
         objective_row = np.array((-1 * model.objective.expression).coefficients(model) + [0.0])
-        table = np.array([objective_row] + [c.expression.coefficients(model) + [c.bound] for c in model.constraints])
-        return sstab.Tableau(model, table)
+        return self._create_tableau(model, objective_row)
+
+    def _create_tableau(self,
+                        model: ssmod.Model,
+                        objective_row: np.ndarray,
+                        dtype: np.dtype = None,
+                        in_memory: bool = False) -> sstab.Tableau:
+        dtype = self.dtype if dtype is None else dtype
+        rows = (c.expression.coefficients(model) + [c.bound] for c in model.constraints)
+        if self.out_of_core and not in_memory:
+            return sstab.MemoryMappedTableau.from_rows(model, objective_row, rows, self.block_rows, self.memmap_dir,
+                                                       dtype)
+        return sstab.Tableau(model, np.array([objective_row] + list(rows), dtype=dtype))
 
     def _artifical_variables_are_positive(self, tableau: sstab.Tableau): 
         assignment = tableau.extract_assignment()
@@ -164,22 +401,38 @@ class Solver:
 
 
     def _restore_initial_tableau(self, tableau, model):
+        self._drive_artificial_variables_out(tableau)
         basis = tableau.extract_basis()
         tableau = self._remove_artificial_variables(tableau)
         tableau = self._restore_original_objective_row(tableau, model)
         tableau = self._fix_objective_row_to_the_basis(tableau, basis)
         return tableau
 
+    def _drive_artificial_variables_out(self, tableau: sstab.Tableau):
+        """
+            _drive_artificial_variables_out(tableau: Tableau):
+                pivots the artificial variables left in the basis (at zero level) out of it,
+                the rows without any other nonzero factor are redundant and stay without a basic variable
+        """
+        artificial = set(var.index for var in self._artificial.keys())
+        for (constr_index, col) in enumerate(tableau.extract_basis()):
+            if col not in artificial:
+                continue
+            row = constr_index + 1
+            factors = np.array(tableau.table[row, :-1])
+            candidates = [c for c in np.flatnonzero(np.abs(factors) > tableau.tolerance) if c not in artificial]
+            if len(candidates) > 0:
+                tableau.pivot(row, int(candidates[0]))
+
     def _remove_artificial_variables(self, tableau: sstab.Tableau):
         columns_to_remove = [var.index for var in self._artificial.keys()]
-        table = np.delete(tableau.table, columns_to_remove, 1)
-        return sstab.Tableau(tableau.model, table)
+        return tableau.without_columns(columns_to_remove)
 
     def _restore_original_objective_row(self, tableau: sstab.Tableau, model: ssmod.Model):
         objective_row = np.array((-1 * model.objective.expression).coefficients(model) + [0.0])
-        new_table = np.array(tableau.table)
-        new_table[0] = objective_row
-        return sstab.Tableau(model, new_table)
+        tableau.model = model
+        tableau.set_objective_row(objective_row)
+        return tableau
 
     def _fix_objective_row_to_the_basis(self, tableau: sstab.Tableau, basis: List[int]):
         objective_row = tableau.table[0].copy()
@@ -194,9 +447,8 @@ class Solver:
                 continue
             objective_row -= objective_factor * tableau.table[row]
 
-        new_table = np.array(tableau.table)
-        new_table[0] = objective_row
-        return sstab.Tableau(tableau.model, new_table)
+        tableau.set_objective_row(objective_row)
+        return tableau
 
     def _create_solution(self, assignment: List[float], model: ssmod.Model, initial_tableau: sstab.Tableau, tableau: sstab.Tableau):
         return sssol.Solution.with_assignment(model, assignment, initial_tableau, tableau)
\ No newline at end of file
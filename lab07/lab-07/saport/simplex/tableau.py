@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import List
+from copy import deepcopy
+from typing import Iterable, Iterator, List, Tuple
 from numpy.typing import ArrayLike
 import numpy as np
 import math
+import tempfile
 from . import model as ssmod
 
 eps = 0.000000001
@@ -17,6 +19,10 @@ class Tableau:
             model corresponding to the tableau
         table : numpy.Array
             2d-array with the tableau
+        tolerance : float
+            tolerance of the optimality and basis checks, depends on the precision of the table
+        block_rows : int
+            number of rows updated at once by the pivot operation
 
         Methods
         -------
@@ -35,18 +41,49 @@ class Tableau:
         choose_leaving_variable(col: int) -> int:
             finds index of the variable, that should leave the basis next
         pivot(col: int, row: int):
-            updates tableau using pivot operation with given entering and leaving variables
+            updates tableau in place using pivot operation with given entering and leaving variables,
+            the work buffers are allocated once, so pivoting doesn't allocate memory
+        is_primal_feasible() -> bool:
+            checks whether the basic solution is feasible (all the basic variables are nonnegative)
+        choose_dual_leaving_variable() -> int:
+            finds index of the row, that should leave the basis next in the dual simplex
+        is_dual_unbounded(row: int) -> bool:
+            checks whether the dual problem is unbounded, i.e. the primal one is infeasible
+        choose_dual_entering_variable(row: int) -> int:
+            finds index of the variable, that should enter the basis next in the dual simplex
         extract_assignment() -> List[float]:
             returns assignment corresponding to the tableau
         extract_basis() -> List[int]
             returns list of indexes corresponding to the variables belonging to the basis
+        set_objective_row(objective_row: array):
+            replaces the cost row of the tableau
+        zero_columns(columns: List[int]):
+            zeroes the given (non-basic) columns, so the corresponding variables are fixed at zero
+        without_columns(columns: List[int]) -> Tableau:
+            returns a new tableau (for the same model) with the given columns removed
+        with_bound_row(col: int, is_upper: bool, value: float) -> Tableau:
+            returns a new (in memory) tableau with an extra row `x_col + s = value`
+            (or `-x_col + s = -value` for the lower bound)
+            and its slack column, expressed in the current basis, so the basic solution may become infeasible
+        with_rows(rows: array, bounds: List[float]) -> Tableau:
+            returns a new (in memory) tableau with the extra rows `rows[i] @ x + s_i = bounds[i]`
+            and their slack columns, expressed in the current basis (see `with_bound_row`)
+        without_rows(rows: List[int], columns: List[int]) -> Tableau:
+            returns a new tableau with the given rows and columns removed,
+            e.g. a non-binding constraint and its basic slack
+        copy() -> Tableau:
+            returns an independent copy of the tableau
     """
     model: ssmod.Model
     table: ArrayLike
+    tolerance: float
+    block_rows: int = 1024
 
     def __init__(self, model: ssmod.Model, table: ArrayLike):
         self.model = model
         self.table = table
+        self.tolerance = max(eps, 100 * np.finfo(table.dtype).eps) if np.issubdtype(table.dtype, np.floating) else eps
+        self._buffers = None
 
     def objective_factors(self) -> ArrayLike:
         return self.table[0,:-1] 
@@ -55,7 +92,7 @@ class Tableau:
         return self.table[0, -1]
 
     def is_optimal(self) -> bool:
-        return self.objective_factors().min() >= -eps
+        return self.objective_factors().min() >= -self.tolerance
 
     def choose_entering_variable(self) -> int:
         return self.objective_factors().argmin()
@@ -73,24 +110,48 @@ class Tableau:
         return index
 
     def pivot(self, row: int, col: int):
-        rows_n, cols_n = self.table.shape
-        pivot_factor = self.table[row, col]
+        pivot_row, factors, update = self._pivot_buffers()
+        np.divide(self.table[row], self.table[row, col], out=pivot_row)
+        pivot_row[col] = 1.0
 
-        new_table = self.table.copy()
-        new_table[row] = self.table[row] / pivot_factor
+        for (start, end) in self._blocks():
+            block = self.table[start:end]
+            block_factors, block_update = factors[:end - start], update[:end - start]
+            np.copyto(block_factors, block[:, col])
+            np.multiply.outer(block_factors, pivot_row, out=block_update)
+            block -= block_update
+        self.table[row] = pivot_row
 
-        new_table[:, col] = 0.0
-        new_table[row, col] = 1.0
-        
-        for r in range(rows_n):
-            if r == row:
-                continue
-            for c in range(cols_n):
-                if c == col:
-                    continue 
-                new_table[r,c] = (-self.table[r, col]) * new_table[row, c] + self.table[r,c]
+    def is_primal_feasible(self) -> bool:
+        return self.table[1:, -1].min() >= -self.tolerance
+
+    def choose_dual_leaving_variable(self) -> int:
+        return 1 + self.table[1:, -1].argmin()
+
+    def is_dual_unbounded(self, row: int) -> bool:
+        return self.table[row, :-1].min() >= -self.tolerance
+
+    def choose_dual_entering_variable(self, row: int) -> int:
+        factors = self.table[row, :-1]
+        negative = factors < -self.tolerance
+        costs = np.maximum(self.objective_factors(), 0.0)
+        ratios = np.where(negative, costs / np.where(negative, -factors, 1.0), np.inf)
+        return ratios.argmin()
+
+    def _blocks(self) -> Iterator[Tuple[int, int]]:
+        rows_n = self.table.shape[0]
+        for start in range(0, rows_n, self.block_rows):
+            yield (start, min(start + self.block_rows, rows_n))
 
-        self.table = new_table
+    def _pivot_buffers(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows_n, cols_n = self.table.shape
+        block_rows = min(self.block_rows, rows_n)
+        buffers = self._buffers
+        if buffers is None or buffers[2].shape != (block_rows, cols_n) or buffers[2].dtype != self.table.dtype:
+            self._buffers = (np.empty(cols_n, dtype=self.table.dtype),
+                             np.empty(block_rows, dtype=self.table.dtype),
+                             np.empty((block_rows, cols_n), dtype=self.table.dtype))
+        return self._buffers
 
     def extract_assignment(self) -> List[float]:
         rows_n, cols_n = self.table.shape
@@ -98,7 +159,8 @@ class Tableau:
         basis = self.extract_basis()
         for r in range(1, rows_n):
             var_index = basis[r - 1]
-            assignment[var_index] = self.table[r, -1]
+            if var_index >= 0:
+                assignment[var_index] = self.table[r, -1]
         
         return assignment
     
@@ -107,15 +169,57 @@ class Tableau:
         basis = [-1 for _ in range(rows_n -1)]
         for c in range(cols_n - 1):
             column = self.table[:,c]
-            belongs_to_basis = math.isclose(column.min(), 0.0, abs_tol = eps) \
-                           and math.isclose(column.max(), 1.0, abs_tol = eps) \
-                           and math.isclose(column.sum(), 1.0, abs_tol = eps)
+            belongs_to_basis = math.isclose(column.min(), 0.0, abs_tol = self.tolerance) \
+                           and math.isclose(column.max(), 1.0, abs_tol = self.tolerance) \
+                           and math.isclose(column.sum(), 1.0, abs_tol = self.tolerance)
             if belongs_to_basis:
                 row = np.where(column == 1.0)[0][0]
                 # [row-1] because we ignore the cost variable in the basis
                 basis[row-1] = c
         return basis
 
+    def set_objective_row(self, objective_row: ArrayLike):
+        self.table[0] = objective_row
+
+    def zero_columns(self, columns: List[int]):
+        for (start, end) in self._blocks():
+            self.table[start:end, columns] = 0.0
+
+    def without_columns(self, columns: List[int]) -> Tableau:
+        return Tableau(self.model, np.delete(self.table, columns, 1))
+
+    def with_bound_row(self, col: int, is_upper: bool, value: float) -> Tableau:
+        sign = 1.0 if is_upper else -1.0
+        row = np.zeros(self.table.shape[1] - 1)
+        row[col] = sign
+        return self.with_rows(row[None, :], [sign * value])
+
+    def with_rows(self, rows: ArrayLike, bounds: List[float]) -> Tableau:
+        rows_n, cols_n = self.table.shape
+        added_n = len(bounds)
+        table = np.zeros((rows_n + added_n, cols_n + added_n), dtype=self.table.dtype)
+        table[:rows_n, :cols_n - 1] = self.table[:, :-1]
+        table[:rows_n, -1] = self.table[:, -1]
+        table[rows_n:, :cols_n - 1] = rows
+        table[rows_n:, cols_n - 1:-1] = np.eye(added_n)
+        table[rows_n:, -1] = bounds
+
+        # the basic variables have to be eliminated from the new rows
+        for (constr_index, col) in enumerate(self.extract_basis()):
+            if col < 0:
+                continue
+            factors = table[rows_n:, col].copy()
+            if np.any(factors != 0):
+                table[rows_n:] -= np.multiply.outer(factors, table[constr_index + 1])
+                table[rows_n:, col] = 0.0
+        return Tableau(self.model, table)
+
+    def without_rows(self, rows: List[int], columns: List[int]) -> Tableau:
+        return Tableau(self.model, np.delete(np.delete(self.table, rows, 0), columns, 1))
+
+    def copy(self) -> Tableau:
+        return deepcopy(self)
+
     def __str__(self) -> str:
         def cell(x: float, w: int) -> str:
             return '{0: >{1}}'.format(x, w)
@@ -140,4 +244,137 @@ class Tableau:
         result = cell_sep.join(header) + "\n"
         for row in rows:
             result += cell_sep.join(row) + "\n"
-        return result
\ No newline at end of file
+        return result
+
+class MemoryMappedTableau(Tableau):
+    """
+        A tableau keeping its table in a temporary memory-mapped file, for the problems too big to fit in RAM.
+        The file is removed as soon as the table is garbage collected.
+
+        Pivots and basis extraction stream through the table in blocks of rows,
+        only the objective row and the pivot row are kept in RAM,
+        so the resident memory depends on the number of columns and the block size, not on the number of constraints.
+
+        Attributes
+        ----------
+        block_rows : int
+            number of rows processed at once
+        directory : str | None
+            directory for the memory-mapped files, the system temporary directory if None
+
+        Methods
+        -------
+        __init__(model: Model, table: numpy.memmap, block_rows: int = 1024,
+                 directory: str | None = None) -> MemoryMappedTableau:
+            constructs a new tableau over the given memory-mapped table
+        from_rows(model: Model, objective_row: array, rows: Iterable[array], block_rows: int,
+                  directory: str | None) -> MemoryMappedTableau:
+            writes the objective row and the constraint rows (consumed one at a time) to a new memory-mapped table
+    """
+    block_rows: int
+    directory: str
+
+    def __init__(self, model: ssmod.Model, table: np.memmap, block_rows: int = 1024, directory: str = None):
+        super().__init__(model, table)
+        self.block_rows = block_rows
+        self.directory = directory
+        self._objective = np.array(table[0])
+
+    @staticmethod
+    def from_rows(model: ssmod.Model,
+                  objective_row: ArrayLike,
+                  rows: Iterable[ArrayLike],
+                  block_rows: int = 1024,
+                  directory: str = None,
+                  dtype: np.dtype = np.float64) -> MemoryMappedTableau:
+        table = MemoryMappedTableau._allocate((len(model.constraints) + 1, len(objective_row)), directory, dtype)
+        table[0] = objective_row
+        for (i, row) in enumerate(rows):
+            table[i + 1] = row
+        return MemoryMappedTableau(model, table, block_rows, directory)
+
+    @staticmethod
+    def _allocate(shape: Tuple[int, int], directory: str, dtype: np.dtype) -> np.memmap:
+        # np.memmap maps the descriptor, the anonymous file lives as long as the mapping
+        with tempfile.TemporaryFile(dir=directory) as file:
+            return np.memmap(file, dtype=dtype, mode='w+', shape=shape)
+
+    def _blocks(self) -> Iterator[Tuple[int, int]]:
+        rows_n = self.table.shape[0]
+        for start in range(1, rows_n, self.block_rows):
+            yield (start, min(start + self.block_rows, rows_n))
+
+    def objective_factors(self) -> ArrayLike:
+        return self._objective[:-1]
+
+    def objective_value(self) -> float:
+        return self._objective[-1]
+
+    def is_unbounded(self, col: int) -> bool:
+        return all(self.table[start:end, col].max() <= 0 for (start, end) in self._blocks())
+
+    def choose_leaving_variable(self, col: int) -> int:
+        best_row, best_quotient = -1, np.inf
+        for (start, end) in self._blocks():
+            column = np.array(self.table[start:end, col])
+            positive = column > 0
+            quotients = np.where(positive, self.table[start:end, -1] / np.where(positive, column, 1.0), np.inf)
+            # the same tie-breaking as the in-memory tableau: the last row with the minimal quotient
+            index = len(quotients) - 1 - np.argmin(quotients[::-1])
+            if quotients[index] <= best_quotient and quotients[index] < np.inf:
+                best_row, best_quotient = start + index, quotients[index]
+        return best_row
+
+    def pivot(self, row: int, col: int):
+        # the blocks skip the objective row, it's updated in RAM and written back
+        super().pivot(row, col)
+        pivot_row, _, update = self._pivot_buffers()
+        np.multiply(pivot_row, self._objective[col], out=update[0])
+        self._objective -= update[0]
+        self.table[0] = self._objective
+
+    def extract_basis(self) -> List[int]:
+        rows_n, cols_n = self.table.shape
+        objective = self._objective[:-1]
+        mins, maxs, sums = objective.copy(), objective.copy(), objective.copy()
+        max_rows = np.zeros(cols_n - 1, dtype=int)
+
+        for (start, end) in self._blocks():
+            block = self.table[start:end, :-1]
+            block_maxs = block.max(0)
+            max_rows = np.where(block_maxs > maxs, start + block.argmax(0), max_rows)
+            mins = np.minimum(mins, block.min(0))
+            maxs = np.maximum(maxs, block_maxs)
+            sums += block.sum(0)
+
+        basis = [-1 for _ in range(rows_n - 1)]
+        tolerance = self.tolerance
+        belongs_to_basis = (np.abs(mins) <= tolerance) & (np.abs(maxs - 1.0) <= tolerance)
+        belongs_to_basis &= np.abs(sums - 1.0) <= tolerance
+        for c in np.flatnonzero(belongs_to_basis):
+            basis[max_rows[c] - 1] = int(c)
+        return basis
+
+    def set_objective_row(self, objective_row: ArrayLike):
+        self._objective = np.array(objective_row, dtype=self.table.dtype)
+        self.table[0] = self._objective
+
+    def zero_columns(self, columns: List[int]):
+        super().zero_columns(columns)
+        self._objective[columns] = 0.0
+        self.table[0] = self._objective
+
+    def without_columns(self, columns: List[int]) -> MemoryMappedTableau:
+        rows_n, cols_n = self.table.shape
+        table = self._allocate((rows_n, cols_n - len(set(columns))), self.directory, self.table.dtype)
+        table[0] = np.delete(self._objective, columns)
+        for (start, end) in self._blocks():
+            table[start:end] = np.delete(self.table[start:end], columns, 1)
+        return MemoryMappedTableau(self.model, table, self.block_rows, self.directory)
+
+    def copy(self) -> MemoryMappedTableau:
+        table = self._allocate(self.table.shape, self.directory, self.table.dtype)
+        table[0] = self._objective
+        for (start, end) in self._blocks():
+            table[start:end] = self.table[start:end]
+        return MemoryMappedTableau(deepcopy(self.model), table, self.block_rows, self.directory)
@@ -0,0 +1,171 @@
+from saport.simplex import generators
+from saport.simplex.cancellation import CancellationToken
+from saport.simplex.model import Model
+from saport.simplex.solver import Solver
+from typing import Callable, Dict, List
+import argparse
+import json
+import numpy as np
+import time
+import tracemalloc
+
+# problem families: size -> model, the size is (roughly) the number of constraints
+GENERATORS: Dict[str, Callable[[int, int], Model]] = {
+    "dense": lambda size, seed: generators.dense_lp(size, size // 2, seed),
+    "transportation": lambda size, seed: generators.transportation_lp(size // 2, size - size // 2, seed),
+    "assignment": lambda size, seed: generators.assignment_lp(size // 2, seed),
+    "degenerate": lambda size, seed: generators.degenerate_lp(size, size // 2, seed),
+    "infeasible": lambda size, seed: generators.infeasible_lp(size, size // 2, seed),
+    "unbounded": lambda size, seed: generators.unbounded_lp(size, size // 2, seed),
+}
+
+# solver configurations: token -> solver
+CONFIGURATIONS: Dict[str, Callable[[CancellationToken], Solver]] = {
+    "float64": lambda token: Solver(token),
+    "float32": lambda token: Solver(token, dtype=np.float32),
+    "out_of_core": lambda token: Solver(token, out_of_core=True),
+}
+
+
+class SimplexBenchmark:
+    """
+        Runs every solver configuration on every problem family over a grid of sizes.
+        For each run the wall time (the best of `repeats`), the number of pivots and the peak traced memory
+        (measured in a separate run, since tracing slows down the solver) are recorded.
+        The empirical scaling exponents are the slopes of log(time) and log(time per pivot) against log(size),
+        so a regression of the pivot cost shows up as a higher exponent.
+    """
+    def __init__(self,
+                 sizes: List[int],
+                 generators: Dict[str, Callable[[int, int], Model]] = GENERATORS,
+                 configurations: Dict[str, Callable[[CancellationToken], Solver]] = CONFIGURATIONS,
+                 seed: int = 0,
+                 repeats: int = 1,
+                 timelimit: float = 60,
+                 print_function: Callable = print):
+        self.sizes = sizes
+        self.generators = generators
+        self.configurations = configurations
+        self.seed = seed
+        self.repeats = repeats
+        self.timelimit = timelimit
+        self.print_function = print_function
+
+    def print_table(self, table_to_print):
+        def cell(x, w):
+            return '{0: >{1}}'.format(x, w)
+
+        longest_value = max([len(s) for row in table_to_print for s in row])
+        formatted_table_to_print = [[cell(v, longest_value) for v in row] for row in table_to_print]
+
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+        for row in formatted_table_to_print:
+            self.print_function(" | ".join(row))
+        self.print_function('-' * (longest_value + 1) * (len(table_to_print[0]) + 1))
+
+    def run_once(self, model: Model, configuration: Callable[[CancellationToken], Solver]) -> dict:
+        best_time = None
+        for _ in range(self.repeats):
+            solver = configuration(CancellationToken().limited(self.timelimit))
+            start = time.perf_counter()
+            solution = solver.solve(model)
+            elapsed = time.perf_counter() - start
+            best_time = elapsed if best_time is None else min(best_time, elapsed)
+
+        tracemalloc.start()
+        configuration(CancellationToken().limited(self.timelimit)).solve(model)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if solution.is_interrupted:
+            status = "interrupted"
+        elif not solution.is_feasible:
+            status = "infeasible"
+        elif not solution.is_bounded:
+            status = "unbounded"
+        else:
+            status = "optimal"
+        return {
+            "constraints": len(model.constraints),
+            "variables": len(model.variables),
+            "status": status,
+            "objective": solution.objective_value() if status == "optimal" else None,
+            "time": best_time,
+            "iterations": solver.pivots,
+            "peak_memory": peak_memory,
+        }
+
+    @staticmethod
+    def scaling_exponent(sizes: List[float], values: List[float]) -> float:
+        """ Slope of the least squares line fitted to (log size, log value), None if there are less than 2 points. """
+        points = [(np.log(s), np.log(v)) for (s, v) in zip(sizes, values) if s > 0 and v is not None and v > 0]
+        if len(set(p[0] for p in points)) < 2:
+            return None
+        return float(np.polyfit([p[0] for p in points], [p[1] for p in points], 1)[0])
+
+    def run(self, output: str = None) -> dict:
+        results = []
+        for generator_name, generator in self.generators.items():
+            for size in self.sizes:
+                model = generator(size, self.seed)
+                for configuration_name, configuration in self.configurations.items():
+                    self.print_function(f"* going for {generator_name} {size} {configuration_name}", end='\r')
+                    result = {
+                        "generator": generator_name,
+                        "size": size,
+                        "configuration": configuration_name,
+                        "seed": self.seed
+                    }
+                    result.update(self.run_once(model, configuration))
+                    results.append(result)
+
+        scaling = []
+        for generator_name in self.generators:
+            for configuration_name in self.configurations:
+                runs = [
+                    r for r in results if r["generator"] == generator_name and r["configuration"] == configuration_name
+                ]
+                sizes = [r["size"] for r in runs]
+                pivot_times = [r["time"] / r["iterations"] if r["iterations"] > 0 else None for r in runs]
+                scaling.append({
+                    "generator": generator_name,
+                    "configuration": configuration_name,
+                    "time_exponent": self.scaling_exponent(sizes, [r["time"] for r in runs]),
+                    "pivot_time_exponent": self.scaling_exponent(sizes, pivot_times),
+                })
+
+        self.print_table([["<problem>", "<size>", "<config>", "status", "time", "pivots", "peak memory"]] +
+                         [[r["generator"], str(r["size"]), r["configuration"], r["status"], f"{r['time']:.4f}s",
+                           str(r["iterations"]), f"{r['peak_memory'] / 2**20:.2f}MB"] for r in results])
+
+        def exponent(x):
+            return "--" if x is None else f"{x:.2f}"
+        self.print_table(
+            [["<problem>", "<config>", "time exp.", "pivot time exp."]]
+            + [[s["generator"], s["configuration"],
+                exponent(s["time_exponent"]),
+                exponent(s["pivot_time_exponent"])] for s in scaling])
+
+        report = {
+            "sizes": self.sizes,
+            "seed": self.seed,
+            "repeats": self.repeats,
+            "results": results,
+            "scaling": scaling
+        }
+        if output is not None:
+            with open(output, 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark of the simplex solver configurations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40, 80])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timelimit", type=float, default=60)
+    parser.add_argument("--output", default="simplex_benchmark.json")
+    arguments = parser.parse_args()
+    SimplexBenchmark(arguments.sizes, seed=arguments.seed, repeats=arguments.repeats,
+                     timelimit=arguments.timelimit).run(arguments.output)
@@ -0,0 +1,83 @@
+import itertools
+import os
+import numpy as np
+from saport.integer.model import BooleanModel, Model
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.integer_implicit_enumeration import IntegerImplicitEnumerationSolver
+from saport.knapsack.solvers.integer_linear_relaxation import IntegerLinearRelaxationSolver
+from saport.simplex.expressions.constraint import ConstraintType
+from saport.simplex.expressions.expression import Expression
+
+
+def is_satisfied(constraint, assignment):
+    residual = constraint.expression.evaluate(assignment) - constraint.bound
+    if constraint.type == ConstraintType.EQ:
+        return abs(residual) <= 1e-9
+    return constraint.type.value * residual >= -1e-9
+
+
+def brute_force(model, upper=3):
+    best = best_assignment(model, upper)
+    return None if best is None else model.objective.evaluate(best)
+
+
+def best_assignment(model, upper=3):
+    best, best_value = None, None
+    for assignment in itertools.product(range(upper + 1), repeat=len(model.variables)):
+        if all(is_satisfied(c, list(assignment)) for c in model.constraints):
+            value = model.objective.evaluate(list(assignment))
+            if best is None or (value < best_value if model.objective.type.value < 0 else value > best_value):
+                best, best_value = list(assignment), value
+    return best
+
+
+def random_model(seed, boolean=False, variables_n=5, upper=3, minimize=None, packing=False):
+    """
+    a random model over `variables_n` variables, bounded by `upper` unless `boolean`;
+    `minimize` defaults to every third seed, `packing` keeps only nonnegative <= rows
+    (plus a covering row when minimizing), so the model is always feasible
+    """
+    rng = np.random.default_rng(seed)
+    minimize = seed % 3 == 0 if minimize is None else minimize
+    model = (BooleanModel if boolean else Model)(f"random {seed}")
+    vars = [model.create_variable(f"x{i}") for i in range(variables_n)]
+    if packing:
+        for _ in range(3):
+            coefficients = rng.integers(1, 10, variables_n).astype(float).tolist()
+            model.add_constraint(Expression.from_vectors(vars, coefficients) <= float(rng.integers(10, 25)))
+    else:
+        for _ in range(rng.integers(2, 5)):
+            coefficients = rng.integers(-6, 10, variables_n).astype(float)
+            coefficients[rng.random(variables_n) < 0.3] = 0.0
+            expression = Expression.from_vectors(vars, coefficients.tolist())
+            kind = rng.integers(0, 3)
+            if kind == 0:
+                model.add_constraint(expression <= float(rng.integers(-3, 15)))
+            elif kind == 1:
+                model.add_constraint(expression >= float(rng.integers(-10, 6)))
+            else:
+                model.add_constraint(expression == float(rng.integers(0, 8)))
+    if not boolean:
+        for var in vars:
+            model.add_constraint(Expression.from_vectors([var], [1.0]) <= upper)
+    if packing:
+        costs = rng.integers(1, 10, variables_n).astype(float).tolist()
+        if minimize:
+            model.add_constraint(Expression.from_vectors(vars, [1.0] * variables_n) >= 1.5)
+    else:
+        # a pair of parallel rows
+        model.add_constraint(Expression.from_vectors(vars[:2], [2.0, 3.0]) <= 4)
+        model.add_constraint(Expression.from_vectors(vars[:2], [4.0, 6.0]) <= 9)
+        costs = rng.integers(-5, 10, variables_n).astype(float).tolist()
+    objective = Expression.from_vectors(vars, costs)
+    if minimize:
+        model.minimize(objective)
+    else:
+        model.maximize(objective)
+    return model
+
+
+def knapsack_model(name, boolean=False):
+    problem = Problem.from_path(os.path.join("knapsack_problems", name))
+    solver = IntegerImplicitEnumerationSolver if boolean else IntegerLinearRelaxationSolver
+    return solver(problem, 30)._create_model()
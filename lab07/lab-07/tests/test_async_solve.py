@@ -0,0 +1,91 @@
+import asyncio
+import gc
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from saport.integer.async_solve import solve_async as integer_solve_async
+from saport.integer.model import BooleanModel
+from saport.integer.solvers.implicit_enumeration import ImplicitEnumerationSolver
+from saport.simplex.async_solve import _cancellation_token, _managers, run_cancellable, solve_async
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.model import Model
+
+
+def _test_model(model_builder=Model):
+    model = model_builder("test")
+    vars = [model.create_variable(f"x_{i}") for i in range(3)]
+    model.add_constraint(Expression.from_vectors(vars, [4.0, 5.0, 2.0]) <= 9)
+    model.add_constraint(Expression.from_vectors(vars, [1.0, 1.0, 1.0]) >= 1)
+    model.maximize(Expression.from_vectors(vars, [5.0, 6.0, 3.0]))
+    return model
+
+
+def _wait_for_cancellation(started: list, token):
+    started.append(time.time())
+    deadline = time.time() + 10
+    while not token.is_cancelled() and time.time() < deadline:
+        time.sleep(0.001)
+    return token.is_cancelled()
+
+
+def test_async_solve_should_match_blocking_solve():
+    expected = _test_model().solve().objective_value()
+    got = asyncio.run(solve_async(_test_model(), timeout=30))
+    assert got.objective_value() == pytest.approx(expected)
+
+
+def test_async_solve_should_work_in_process_pool():
+    async def solve_all():
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            return await asyncio.gather(*[solve_async(_test_model(), executor=executor) for _ in range(3)])
+
+    expected = _test_model().solve().objective_value()
+    assert [s.objective_value() for s in asyncio.run(solve_all())] == pytest.approx([expected] * 3)
+
+
+def test_async_integer_solve_should_find_optimum():
+    solution = asyncio.run(integer_solve_async(_test_model(BooleanModel), ImplicitEnumerationSolver(), timeout=30))
+    assert solution.assignment == [1, 1, 0]
+
+
+def test_cancelling_task_should_stop_the_worker():
+    async def cancel_after_start():
+        started = []
+        task = asyncio.ensure_future(run_cancellable(_wait_for_cancellation, started))
+        while len(started) == 0:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.time() - started[0]
+
+    assert asyncio.run(cancel_after_start()) < 5
+
+
+def test_limiter_should_cap_in_flight_solves():
+    async def run_all():
+        limiter = asyncio.Semaphore(2)
+        started = []
+        tasks = [asyncio.ensure_future(run_cancellable(_wait_for_cancellation, started, timeout=0.05, limiter=limiter))
+                 for _ in range(4)]
+        await asyncio.sleep(0.02)
+        in_flight = len(started)
+        await asyncio.gather(*tasks)
+        return in_flight
+
+    assert asyncio.run(run_all()) == 2
+
+
+def test_manager_should_be_shut_down_with_the_process_pool():
+    executor = ProcessPoolExecutor(max_workers=1)
+    _cancellation_token(executor)
+    manager = _managers[executor]
+    _cancellation_token(executor)
+    assert _managers[executor] is manager
+    process = manager._process
+    del manager
+    executor.shutdown()
+    del executor
+    gc.collect()
+    process.join(5)
+    assert not process.is_alive()
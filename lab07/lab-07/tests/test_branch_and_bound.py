@@ -0,0 +1,99 @@
+import math
+import pytest
+from saport.integer.model import Model
+from saport.integer.nodes import (BestBoundSelection, BestEstimateSelection, BoundChange, DepthFirstSelection,
+                                  HybridSelection, Node)
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.simplex.expressions.expression import Expression
+from helpers import brute_force, random_model
+
+SELECTIONS = [BestBoundSelection, DepthFirstSelection, BestEstimateSelection, HybridSelection]
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("minimize", [False, True])
+def test_every_selection_rule_should_find_the_optimum(selection, seed, minimize):
+    model = random_model(seed, variables_n=4, minimize=minimize, packing=True)
+    solver = LinearRelaxationSolver(selection())
+    solution = solver.solve(model, 30)
+
+    assert solution.is_optimal
+    assert solution.objective_value() == pytest.approx(brute_force(model))
+    assert solver.gap() == pytest.approx(0.0, abs=1e-9)
+    assert solver.upper_bound() == pytest.approx(solver.lower_bound())
+
+
+@pytest.mark.parametrize("values, weights, capacity, expected, nodes", [
+    ([5.0, 6.0, 3.0], [4.0, 5.0, 2.0], 9, [1, 1, 0], 5),
+    ([16.0, 19.0, 23.0, 28.0], [2.0, 3.0, 4.0, 5.0], 7, [1, 0, 0, 1], 9),
+    ([8.0, 10.0, 15.0, 4.0], [4.0, 5.0, 8.0, 3.0], 11, [0, 0, 1, 1], 13)])
+def test_branch_and_bound_should_prune_the_tree(values, weights, capacity, expected, nodes):
+    model = Model("knapsack")
+    x = [model.create_variable(f"x{i}") for i in range(len(values))]
+    model.add_constraint(Expression.from_vectors(x, weights) <= capacity)
+    for var in x:
+        model.add_constraint(Expression.from_vectors([var], [1.0]) <= 1)
+    model.maximize(Expression.from_vectors(x, values))
+    solver = LinearRelaxationSolver()
+    solution = solver.solve(model, 30)
+    assert solution.assignment == expected
+    assert 0 < solver.nodes <= nodes
+
+
+def test_best_bound_should_not_process_more_nodes_than_depth_first():
+    nodes = dict()
+    for selection in [BestBoundSelection, DepthFirstSelection]:
+        solver = LinearRelaxationSolver(selection())
+        solver.solve(random_model(7, variables_n=6, upper=5, minimize=False, packing=True), 30)
+        nodes[selection] = solver.nodes
+    assert nodes[BestBoundSelection] <= nodes[DepthFirstSelection]
+
+
+def test_interrupted_search_should_report_valid_bounds():
+    model = random_model(3, variables_n=6, upper=5, minimize=False, packing=True)
+    optimum = LinearRelaxationSolver().solve(model, 30).objective_value()
+
+    solver = LinearRelaxationSolver(DepthFirstSelection())
+    solver.solve(model, -1)
+    assert solver.interrupted
+    assert solver.upper_bound() >= optimum - 1e-9 and solver.gap() == math.inf
+
+
+def test_infeasible_model_should_be_reported():
+    model = Model("infeasible")
+    x = model.create_variable("x")
+    model.add_constraint(Expression.from_vectors([x], [2.0]) == 3)
+    model.maximize(Expression.from_vectors([x], [1.0]))
+    solution = LinearRelaxationSolver().solve(model, 30)
+    assert not solution.is_feasible and not solution.has_assignment()
+
+
+def test_node_should_merge_bound_changes():
+    root = Node(math.inf, math.inf)
+    child = Node(10, 9, 1, BoundChange(0, True, 3), root)
+    grandchild = Node(9, 8, 2, BoundChange(0, True, 2), child)
+    leaf = Node(8, 7, 3, BoundChange(1, False, 1), grandchild)
+    assert leaf.changes() == [BoundChange(0, True, 3), BoundChange(0, True, 2), BoundChange(1, False, 1)]
+    assert leaf.bounds() == {0: (-math.inf, 2), 1: (1, math.inf)}
+
+
+def test_hybrid_selection_should_switch_to_best_bound_after_incumbent():
+    selection = HybridSelection()
+    shallow, deep = Node(10, 0, 1), Node(5, 0, 3)
+    selection.push(shallow)
+    selection.push(deep)
+    selection.incumbent_found()
+    assert selection.pop() is shallow
+    selection.prune(6)
+    assert len(selection) == 0
+
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_warm_started_nodes_should_match_cold_solves_with_fewer_pivots(minimize):
+    model = random_model(11, variables_n=6, upper=5, minimize=minimize, packing=True)
+    warm, cold = LinearRelaxationSolver(warm_start=True), LinearRelaxationSolver(warm_start=False)
+    warm_solution, cold_solution = warm.solve(model, 30), cold.solve(model, 30)
+
+    assert warm_solution.objective_value() == pytest.approx(cold_solution.objective_value())
+    assert warm.lp_pivots / warm.nodes < cold.lp_pivots / cold.nodes
@@ -0,0 +1,108 @@
+import math
+import pytest
+from saport.integer.branching import (FirstFractionalBranching, MostFractionalBranching, PseudoCostBranching,
+                                      StrongBranching)
+from saport.integer.model import BooleanModel
+from saport.integer.nodes import Node
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.integer.solvers.parallel_linear_relaxation import ParallelLinearRelaxationSolver
+from saport.simplex.cancellation import CancellationToken
+from saport.simplex.expressions.expression import Expression
+from helpers import brute_force, is_satisfied, random_model
+
+
+def _rules():
+    return [
+        FirstFractionalBranching(),
+        MostFractionalBranching(),
+        PseudoCostBranching(reliability=1, candidates=2),
+        StrongBranching()
+    ]
+
+
+def _root(model):
+    solver = LinearRelaxationSolver()
+    solver.model = model
+    solver.token = CancellationToken()
+    solver._start_search()
+    node = Node(math.inf, math.inf, 0)
+    return solver, node, solver._relaxation(node, None)
+
+
+def _two_rows_model():
+    model = BooleanModel("two rows")
+    x = [model.create_variable(f"x{i}") for i in range(4)]
+    model.add_constraint(Expression.from_vectors(x, [4.0, 6.0, 5.0, 3.0]) <= 9)
+    model.add_constraint(Expression.from_vectors(x, [5.0, 2.0, 6.0, 4.0]) <= 8)
+    model.maximize(Expression.from_vectors(x, [6.0, 7.0, 8.0, 4.0]))
+    return model
+
+
+@pytest.mark.parametrize("seed", range(16))
+def test_branching_rules_should_keep_the_optimum(seed):
+    boolean = seed % 2 == 0
+    model = random_model(seed, boolean, variables_n=7)
+    expected = brute_force(model, 1 if boolean else 3)
+    for rule in _rules():
+        solution = LinearRelaxationSolver(branching=rule).solve(model, 30)
+        if expected is None:
+            assert not solution.has_assignment()
+            continue
+        assert all(is_satisfied(c, solution.assignment) for c in model.constraints)
+        assert solution.objective_value() == pytest.approx(expected)
+
+
+def test_probes_should_bound_the_children():
+    model = _two_rows_model()
+    solver, node, solution = _root(model)
+    bound = solution.tableau.objective_value()
+    for var in model.variables:
+        value = solution.value(var)
+        if abs(value - round(value)) < 1e-9:
+            continue
+        for (is_upper, limit) in [(True, math.floor(value)), (False, math.ceil(value))]:
+            child = solver._lp_solver().reoptimize_with_bound(model, solution.tableau, var.index, is_upper, limit)
+            for max_pivots in [0, 1, 100]:
+                probe = solver._lp_solver().probe_bound(solution.tableau, var.index, is_upper, limit, max_pivots)
+                assert probe <= bound + 1e-9
+                if child.is_feasible:
+                    # the dual simplex never goes below the optimum of the child
+                    assert probe >= child.tableau.objective_value() - 1e-9
+                else:
+                    assert max_pivots < 100 or math.isinf(probe)
+
+
+def test_most_fractional_branching_should_pick_the_half_integral_variable():
+    model = _two_rows_model()
+    solver, node, solution = _root(model)
+    candidates = solver._fractional_variables(solution)
+    assert len(candidates) > 1
+    assignment = solution.assignment(model)
+    chosen = MostFractionalBranching().select(solver, node, solution, candidates)
+    assert all(abs(assignment[chosen] % 1 - 0.5) <= abs(assignment[j] % 1 - 0.5) + 1e-9 for j in candidates)
+    assert FirstFractionalBranching().select(solver, node, solution, candidates) == candidates[0]
+
+
+def test_probing_rules_should_probe_and_learn():
+    model = random_model(10, True, variables_n=25)
+    plain = LinearRelaxationSolver()
+    expected = plain.solve(model, 30).objective_value()
+    strong, pseudo_cost = StrongBranching(), PseudoCostBranching()
+    for rule in [strong, pseudo_cost]:
+        solver = LinearRelaxationSolver(branching=rule)
+        assert solver.solve(model, 30).objective_value() == pytest.approx(expected)
+        assert solver.nodes < plain.nodes
+    assert strong.probes > 0 and pseudo_cost.probes > 0
+    # the reliable variables aren't probed anymore
+    assert pseudo_cost.probes < strong.probes
+    assert any(pseudo_cost._is_reliable(j) for j in range(len(model.variables)))
+
+    pseudo_cost.reset()
+    assert pseudo_cost.probes == 0 and not pseudo_cost._is_reliable(0)
+
+
+def test_parallel_solver_should_branch_with_the_rule():
+    model = random_model(3, False, variables_n=12)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+    solver = ParallelLinearRelaxationSolver(workers=2, deterministic=True, branching=PseudoCostBranching())
+    assert solver.solve(model, 30).objective_value() == pytest.approx(expected)
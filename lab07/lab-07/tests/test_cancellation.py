@@ -0,0 +1,77 @@
+import threading
+import time
+import pytest
+from saport.integer.model import BooleanModel
+from saport.integer.solvers.implicit_enumeration import ImplicitEnumerationSolver
+from saport.simplex.cancellation import CancellationToken
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.model import Model
+
+
+def _test_model(bound_type):
+    model = Model("test")
+    x, y = model.create_variable("x"), model.create_variable("y")
+    model.add_constraint(x + 2 * y <= 10)
+    model.add_constraint(3 * x + y <= 15)
+    model.add_constraint(x + y >= 1 if bound_type == "GE" else x + y <= 7)
+    model.maximize(2 * x + 3 * y)
+    return model
+
+
+def test_cancelled_solve_should_return_last_feasible_basis():
+    token = CancellationToken()
+    token.cancel()
+    model = _test_model("LE")
+    solution = model.solve(token=token)
+
+    assert solution.is_interrupted and solution.has_assignment()
+    assert solution.assignment() == [0.0, 0.0]
+    assert not model.solve().is_interrupted
+
+
+def test_solve_cancelled_in_first_phase_should_have_no_assignment():
+    solution = _test_model("GE").solve(timelimit=-1)
+    assert solution.is_interrupted and not solution.has_assignment()
+
+
+def test_derived_token_should_share_cancellation_and_keep_tighter_deadline():
+    token = CancellationToken(time.time() + 1000)
+    limited = token.limited(10)
+    assert limited.deadline < token.deadline and not limited.is_cancelled()
+    token.cancel()
+    assert limited.is_cancelled()
+
+
+def test_integer_solver_should_stop_on_cancelled_token():
+    model = BooleanModel("test")
+    vars = [model.create_variable(f"x_{i}") for i in range(3)]
+    model.add_constraint(Expression.from_vectors(vars, [4.0, 5.0, 2.0]) <= 9)
+    model.maximize(Expression.from_vectors(vars, [5.0, 6.0, 3.0]))
+    token = CancellationToken()
+    token.cancel()
+
+    solver = ImplicitEnumerationSolver()
+    solver.solve(model, 30, token)
+    assert solver.interrupted
+
+
+class _CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.checks = 0
+
+    def is_set(self):
+        self.checks += 1
+        return super().is_set()
+
+
+def test_token_should_poll_the_event_once_per_interval():
+    event = _CountingEvent()
+    token = CancellationToken(event=event, poll_interval=60).limited(60)
+    assert not any(token.is_cancelled() for _ in range(1000))
+    assert event.checks == 1
+    # another token sees the cancellation only at its next poll, the cancelling one at once
+    CancellationToken(event=event).cancel()
+    assert not token.is_cancelled()
+    token.cancel()
+    assert token.is_cancelled()
@@ -0,0 +1,65 @@
+import itertools
+import pytest
+from saport.decomposition.column_generation import Column, ColumnGenerationSolver, PricingOracle
+from saport.decomposition.pricing import CuttingStockPricingOracle
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.model import Model
+
+
+def _cutting_stock_master(demands, patterns):
+    model = Model("cutting stock")
+    vars = [model.create_variable(f"p_{j}") for j in range(len(patterns))]
+    for i, d in enumerate(demands):
+        model.add_constraint(Expression.from_vectors(vars, [p[i] for p in patterns]) >= d)
+    model.minimize(Expression.from_vectors(vars, [1.0] * len(patterns)))
+    return model
+
+
+@pytest.mark.parametrize("widths, roll_width, demands", [
+    ([3, 4, 5, 7], 15, [25, 18, 14, 9]),
+    ([2, 3, 5], 11, [12, 7, 9])])
+def test_column_generation_should_reach_the_full_master_optimum(widths, roll_width, demands):
+    initial_patterns = [[roll_width // w if k == i else 0 for k in range(len(widths))] for i, w in enumerate(widths)]
+    all_patterns = [p for p in itertools.product(*[range(roll_width // w + 1) for w in widths])
+                    if any(p) and sum(n * w for n, w in zip(p, widths)) <= roll_width]
+
+    solver = ColumnGenerationSolver(_cutting_stock_master(demands, initial_patterns),
+                                    CuttingStockPricingOracle(widths, roll_width))
+    got = solver.solve()
+    expected = _cutting_stock_master(demands, all_patterns).solve()
+
+    assert got.objective_value() == pytest.approx(expected.objective_value()), \
+        f"column generation stopped before reaching the optimum:" +\
+        f"\n- got: {got.objective_value()}" +\
+        f"\n- expected: {expected.objective_value()}"
+    assert len(got.assignment()) == len(initial_patterns) + len(solver.generated)
+    duals = solver.duals()
+    assert all(1.0 - duals @ p >= -1e-6 for p in all_patterns), \
+        f"some pattern still has a negative reduced cost for duals: {duals}"
+    assert 1 < solver.iterations <= len(solver.generated) + 1
+
+
+class _FixedColumnOracle(PricingOracle):
+    def __init__(self, column):
+        self.column = column
+
+    def __call__(self, duals):
+        return [self.column]
+
+
+def test_column_generation_should_price_a_master_with_a_redundant_row():
+    model = Model("redundant master")
+    p = [model.create_variable(f"p_{j}") for j in range(2)]
+    model.add_constraint(Expression.from_vectors(p, [1.0, 1.0]) == 4)
+    # the duplicated linking row leaves a tableau row without a basic variable
+    model.add_constraint(Expression.from_vectors(p, [2.0, 2.0]) == 8)
+    model.add_constraint(Expression.from_vectors(p[:1], [1.0]) <= 3)
+    model.minimize(Expression.from_vectors(p, [3.0, 3.0]))
+
+    solver = ColumnGenerationSolver(model, _FixedColumnOracle(Column(cost=1.0, coefficients=[1.0, 2.0, 0.0])))
+    solution = solver.solve()
+    assert solution.objective_value() == pytest.approx(4.0)
+    assert len(solver.generated) == 1
+    duals = solver.duals()
+    assert min(abs(duals[0]), abs(duals[1])) == pytest.approx(0.0)
+    assert duals[0] + 2 * duals[1] == pytest.approx(1.0)
@@ -0,0 +1,85 @@
+import itertools
+import numpy as np
+import pytest
+from saport.integer.covers import KnapsackRow, cover_cuts, knapsack_rows, separate_cover
+from saport.integer.model import BooleanModel
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from helpers import knapsack_model
+
+
+def _row(weights, capacity, complemented=None):
+    weights = np.array(weights, dtype=float)
+    complemented = np.zeros(len(weights), dtype=bool) if complemented is None else np.array(complemented)
+    return KnapsackRow(np.arange(len(weights)), weights, float(capacity), complemented)
+
+
+def _feasible_points(row):
+    for point in itertools.product([0, 1], repeat=len(row.weights)):
+        point = np.array(point, dtype=float)
+        if row.weights @ row.values(point) <= row.capacity:
+            yield point
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_cover_cut_should_be_valid_and_violated(seed):
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 20, 7)
+    complemented = rng.random(7) < 0.3
+    row = _row(weights, weights.sum() // 2, complemented)
+    assignment = rng.random(7)
+
+    cut = separate_cover(row, assignment)
+    if cut is None:
+        return
+    assert cut.coefficients @ assignment > cut.bound
+    assert all(cut.coefficients @ point <= cut.bound + 1e-9 for point in _feasible_points(row))
+
+
+def test_lifting_should_give_the_exact_coefficients():
+    # cover {0, 1, 2}: x0 + x1 + x2 <= 2, x3 (weight 8) lifts to 2, since it fits only alone
+    row = _row([3, 3, 3, 8], 8)
+    cut = separate_cover(row, np.array([0.9, 0.9, 0.9, 0.0]))
+    assert cut is not None
+    assert list(cut.coefficients) == [1, 1, 1, 2]
+    assert cut.bound == 2
+
+
+def test_cover_cuts_should_come_most_violated_first():
+    rows = [_row([4, 4, 4], 8), _row([5, 5], 6)]
+    cuts = cover_cuts(rows, np.array([0.7, 0.7, 0.7]), 10)
+    violations = [cut.coefficients @ np.array([0.7, 0.7, 0.7]) - cut.bound for cut in cuts]
+    assert len(cuts) == 2
+    assert violations == sorted(violations, reverse=True)
+
+
+def test_knapsack_rows_should_skip_the_redundant_constraints():
+    model = BooleanModel("redundant")
+    x = [model.create_variable(f"x{i}") for i in range(3)]
+    model.add_constraint(x[0] + x[1] + x[2] <= 3)
+    model.add_constraint(2 * x[0] + 2 * x[1] <= 3)
+    model.add_constraint(x[0] + x[2] >= 1)
+    model.maximize(x[0] + x[1] + x[2])
+    rows = knapsack_rows(model)
+    assert len(rows) == 2
+    assert list(rows[1].complemented) == [True, True]
+    assert rows[1].capacity == 1
+
+
+@pytest.mark.parametrize("name", ["ks_4_0", "ks_lecture_dp_1", "ks_lecture_dp_2"])
+def test_cover_cuts_should_not_change_the_optimum(name):
+    model = knapsack_model(name, boolean=True)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+    solver = LinearRelaxationSolver(cut_rounds=10)
+    solver.gomory_cuts = False
+    solution = solver.solve(model, 30)
+    assert solution.is_optimal
+    assert solution.objective_value() == pytest.approx(expected)
+    assert sum(r.covers for r in solver.cut_statistics) > 0
+
+
+def test_root_gap_closed_should_be_a_fraction():
+    model = knapsack_model("ks_19_0", boolean=True)
+    solver = LinearRelaxationSolver(cut_rounds=5)
+    solver.solve(model, 60)
+    assert 0 < solver.root_gap_closed() <= 1
+    assert LinearRelaxationSolver().root_gap_closed() is None
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from saport.integer.cuts import Cut, CutPool, gomory_cuts, integer_columns
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.simplex.solver import Solver
+from helpers import knapsack_model, random_model
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("minimize", [False, True])
+def test_cuts_should_not_change_the_optimum(seed, minimize):
+    model = random_model(seed, variables_n=6, upper=5, minimize=minimize, packing=True)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+    for solver in [LinearRelaxationSolver(cut_rounds=10), LinearRelaxationSolver(cut_rounds=5, node_cut_rounds=2)]:
+        solution = solver.solve(model, 30)
+        assert solution.is_optimal
+        assert solution.objective_value() == pytest.approx(expected)
+
+
+def test_root_rounds_should_tighten_the_bound_monotonically():
+    model = knapsack_model("ks_4_0")
+    optimum = LinearRelaxationSolver().solve(model, 30).objective_value()
+    root_bound = Solver().solve(model).objective_value()
+
+    solver = LinearRelaxationSolver(cut_rounds=10)
+    solver.solve(model, 30)
+    bounds = [root_bound] + [r.bound for r in solver.cut_statistics]
+    assert len(solver.cut_statistics) > 1
+    assert all(r.depth == 0 and r.added > 0 for r in solver.cut_statistics)
+    assert all(b1 >= b2 - 1e-9 for (b1, b2) in zip(bounds, bounds[1:]))
+    assert bounds[-1] >= optimum - 1e-9
+    assert sum(r.improvement for r in solver.cut_statistics) == pytest.approx(root_bound - bounds[-1])
+
+
+def test_branch_and_cut_should_process_fewer_nodes():
+    model = knapsack_model("ks_19_0")
+    plain, cutting = LinearRelaxationSolver(), LinearRelaxationSolver(cut_rounds=5, node_cut_rounds=2)
+    assert plain.solve(model, 60).objective_value() == pytest.approx(cutting.solve(model, 60).objective_value())
+    assert cutting.nodes < plain.nodes
+
+
+def test_gomory_cuts_should_cut_off_the_fractional_vertex():
+    model = knapsack_model("ks_4_0")
+    solution = Solver().solve(model)
+    tableau = solution.tableau
+    generated = gomory_cuts(tableau, integer_columns(model, tableau), 10)
+    assignment = np.array(tableau.extract_assignment())
+    assert len(generated) > 0
+    assert all(cut.coefficients @ assignment > cut.bound for cut in generated)
+
+
+def test_pool_should_filter_duplicates():
+    pool = CutPool(3, 2)
+    cut = Cut(np.array([1.0, 2.0, 0.0, 5.0]), 4.0)
+    scaled = Cut(np.array([2.0, 4.0, 0.0, 1.0]), 8.0)
+    other = Cut(np.array([1.0, 0.0, 2.0]), 4.0)
+    assert pool.filter([cut, scaled, other]) == [cut, other]
+    assert pool.filter([cut]) == []
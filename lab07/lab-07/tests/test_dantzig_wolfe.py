@@ -0,0 +1,48 @@
+import random
+import pytest
+from saport.decomposition.dantzig_wolfe import DantzigWolfeSolver, detect_blocks
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.model import Model
+
+
+def _sites_model(sites_n, seed, maximize):
+    rnd = random.Random(seed)
+    model = Model("sites")
+    site_vars = []
+    for k in range(sites_n):
+        vars = [model.create_variable(f"x_{k}_{i}") for i in range(3)]
+        site_vars += vars
+        for _ in range(2):
+            model.add_constraint(
+                Expression.from_vectors(vars, [rnd.randint(1, 5) for _ in vars]) <= rnd.randint(10, 20))
+    model.add_constraint(Expression.from_vectors(site_vars, [rnd.randint(1, 3) for _ in site_vars]) <= 6 * sites_n)
+    model.add_constraint(
+        Expression.from_vectors(site_vars, [1 if i % 3 == 0 else 0 for i in range(len(site_vars))]) >= sites_n)
+    objective = Expression.from_vectors(site_vars, [rnd.randint(1, 9) for _ in site_vars])
+    model.maximize(objective) if maximize else model.minimize(objective)
+    return model
+
+
+@pytest.mark.parametrize("sites_n", [2, 4])
+def test_detected_linking_constraints_should_split_model_into_sites(sites_n):
+    model = _sites_model(sites_n, 0, True)
+    linking = detect_blocks(model)
+    assert [c.index for c in linking] == [2 * sites_n, 2 * sites_n + 1]
+    assert len(DantzigWolfeSolver(model, linking, processes=1).blocks) == sites_n
+
+
+@pytest.mark.parametrize("sites_n, seed, maximize, processes", [
+    (2, 0, True, 1), (2, 0, False, 1), (5, 1, True, 1), (5, 2, False, 1), (3, 3, True, 2)])
+def test_dantzig_wolfe_should_find_the_monolithic_optimum(sites_n, seed, maximize, processes):
+    expected = _sites_model(sites_n, seed, maximize).solve()
+    model = _sites_model(sites_n, seed, maximize)
+    got = DantzigWolfeSolver(model, processes=processes).solve()
+
+    assert got.objective_value() == pytest.approx(expected.objective_value()), \
+        f"decomposition found a different optimum:" +\
+        f"\n- got: {got.objective_value()}" +\
+        f"\n- expected: {expected.objective_value()}"
+    for c in model.constraints:
+        value = c.expression.evaluate(got.assignment())
+        assert value <= c.bound + 1e-6 if c.type.value < 0 else value >= c.bound - 1e-6, \
+            f"assignment violates constraint {c}"
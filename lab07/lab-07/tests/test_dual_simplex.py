@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from saport.simplex import generators
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.model import Model
+from saport.simplex.solver import Solver
+
+
+def _diet_model():
+    model = Model("diet")
+    x, y, z = model.create_variable("x"), model.create_variable("y"), model.create_variable("z")
+    model.add_constraint(2 * x + y + z >= 8)
+    model.add_constraint(x + 2 * y + 3 * z == 6)
+    model.add_constraint(-1 * x + y <= -2)
+    model.minimize(2 * x + 3 * y + 4 * z)
+    return model
+
+
+def _with_bound(model, index, is_upper, value):
+    bounded = Model(model.name)
+    for var in model.variables:
+        bounded.create_variable(var.name)
+    for constraint in model.constraints:
+        bounded.add_constraint(constraint)
+    bounded.objective = model.objective
+    bound = Expression.from_vectors([bounded.variables[index]], [1.0])
+    bounded.add_constraint(bound <= value if is_upper else bound >= value)
+    return bounded
+
+
+@pytest.mark.parametrize("model", [_diet_model(), generators.dense_lp(6, 4, 1), generators.transportation_lp(3, 3, 2)])
+@pytest.mark.parametrize("is_upper", [True, False])
+def test_reoptimized_bound_should_match_solving_from_scratch(model, is_upper):
+    parent = Solver().solve(model)
+    value = parent.value(model.variables[0])
+    bound = np.floor(value) if is_upper else np.floor(value) + 1
+
+    solver = Solver()
+    warm = solver.reoptimize_with_bound(model, parent.tableau, 0, is_upper, bound)
+    cold = Solver().solve(_with_bound(model, 0, is_upper, bound))
+
+    assert warm.is_feasible == cold.is_feasible
+    if cold.has_assignment():
+        assert warm.objective_value() == pytest.approx(cold.objective_value())
+        value = warm.value(model.variables[0])
+        assert value <= bound + 1e-9 if is_upper else value >= bound - 1e-9
+
+
+def test_reoptimization_should_detect_infeasibility_and_keep_the_tableau():
+    model = _diet_model()
+    parent = Solver().solve(model)
+    table = parent.tableau.table.copy()
+
+    solution = Solver().reoptimize_with_bound(model, parent.tableau, 1, False, 100)
+    assert not solution.is_feasible and not solution.has_assignment()
+    assert np.array_equal(parent.tableau.table, table)
+
+
+def test_reoptimization_should_take_fewer_pivots_than_solving_from_scratch():
+    model = generators.dense_lp(30, 20, 3)
+    parent = Solver().solve(model)
+    variable = max(range(len(model.variables)), key=lambda i: parent.value(model.variables[i]))
+    bound = np.floor(parent.value(model.variables[variable]) / 2)
+
+    warm_solver, cold_solver = Solver(), Solver()
+    warm = warm_solver.reoptimize_with_bound(model, parent.tableau, variable, True, bound)
+    cold = cold_solver.solve(_with_bound(model, variable, True, bound))
+    assert warm.objective_value() == pytest.approx(cold.objective_value())
+    assert warm_solver.pivots < cold_solver.pivots
@@ -0,0 +1,68 @@
+import time
+import numpy as np
+import pytest
+from saport.integer.model import BooleanModel
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.matrix import MatrixModel
+from saport.simplex.model import Model
+
+
+def _test_model():
+    model = Model("test")
+    x, y, z = model.create_variable("x"), model.create_variable("y"), model.create_variable("z")
+    model.add_constraint(x + 2 * y + z <= 10)
+    model.add_constraint(3 * x + y >= 3)
+    model.add_constraint(x + y + z == 6)
+    model.minimize(2 * x + 3 * y + z + x)
+    return model
+
+
+def test_evaluate_batch_should_match_expression_evaluation():
+    model = _test_model()
+    assignments = np.random.default_rng(0).uniform(-1, 6, (50, 3))
+    assignments[0] = [1.0, 0.0, 5.0]
+    objective_values, slacks, feasible = model.evaluate_batch(assignments)
+
+    for (i, assignment) in enumerate(assignments.tolist()):
+        assert objective_values[i] == pytest.approx(model.objective.evaluate(assignment))
+        lhs = [c.expression.evaluate(assignment) for c in model.constraints]
+        assert list(slacks[i]) == pytest.approx([10 - lhs[0], lhs[1] - 3, -abs(lhs[2] - 6)])
+        assert feasible[i] == (min(assignment) >= 0 and lhs[0] <= 10 and lhs[1] >= 3 and abs(lhs[2] - 6) <= 1e-9)
+    assert feasible[0]
+
+
+def test_evaluate_batch_should_score_many_candidates_quickly():
+    model = BooleanModel("knapsack")
+    rng = np.random.default_rng(1)
+    vars = [model.create_variable(f"x{i}") for i in range(30)]
+    model.add_constraint(Expression.from_vectors(vars, list(rng.integers(1, 20, 30).astype(float))) <= 100)
+    model.maximize(Expression.from_vectors(vars, list(rng.integers(1, 20, 30).astype(float))))
+    candidates = rng.integers(0, 2, (100_000, 30))
+
+    start = time.perf_counter()
+    objective_values, slacks, feasible = model.evaluate_batch(candidates)
+    assert time.perf_counter() - start < 1.0
+
+    assert objective_values.shape == (100_000,) and slacks.shape == (100_000, 1)
+    assert feasible.any() and not feasible.all()
+
+
+def test_evaluate_batch_should_match_the_dense_matrix():
+    rng = np.random.default_rng(2)
+    dense = rng.integers(-3, 4, (12, 9)).astype(float)
+    dense[rng.random(dense.shape) < 0.6] = 0.0
+    dense[[0, 4, 11]] = 0.0
+    model = Model("sparse")
+    vars = [model.create_variable(f"x{i}") for i in range(9)]
+    for (i, row) in enumerate(dense):
+        expression = Expression.from_vectors(vars, row.tolist())
+        constraints = [expression <= 2.0, expression >= -1.0, expression == 0.0]
+        model.add_constraint(constraints[i % 3])
+    model.maximize(Expression.from_vectors(vars, [1.0] * 9))
+    matrix = MatrixModel.from_model(model)
+    assignments = rng.uniform(-1, 3, (257, 9))
+
+    # a small chunk splits the assignments into uneven batches
+    assert matrix._products(assignments, chunk=50) == pytest.approx(assignments @ matrix.dense().T)
+    _, slacks, _ = matrix.evaluate_batch(assignments)
+    assert slacks[:, [0, 4]] == pytest.approx(np.repeat([[2.0, 1.0]], len(assignments), axis=0))
@@ -0,0 +1,125 @@
+import time
+import numpy as np
+import pytest
+from saport.integer.model import BooleanModel, Model as IntegerModel
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.simplex.exceptions import ModelFormatError
+from saport.simplex.expressions.constraint import ConstraintType
+from saport.simplex.formats import read_lp, read_mps, write_lp, write_mps
+from saport.simplex.matrix import MatrixModel
+from saport.simplex.model import Model
+
+
+def _test_model():
+    model = Model("test")
+    x, y, z = [model.create_variable(name) for name in ["x", "y", "z"]]
+    model.add_constraint(x + 2 * y - z <= 10)
+    model.add_constraint(x + y >= 2)
+    model.add_constraint(3 * x - y == -1)
+    model.add_constraint(z <= 4.5)
+    model.maximize(x + 3 * y + 0.25 * z)
+    return model
+
+
+@pytest.mark.parametrize("write, read, extension", [(write_mps, read_mps, "mps"), (write_lp, read_lp, "lp")])
+def test_written_model_should_be_read_back_unchanged(tmp_path, write, read, extension):
+    model = _test_model()
+    path = str(tmp_path / f"test.{extension}")
+    write(model, path)
+    got = read(path).to_model()
+
+    assert [v.name for v in got.variables] == [v.name for v in model.variables]
+    assert got.objective.is_equivalent(model.objective, model)
+    for (c1, c2) in zip(got.constraints, model.constraints):
+        assert c1.is_equivalent(c2, model), f"constraint changed after reading:\n- got: {c1}\n- expected: {c2}"
+    assert got.solve().objective_value() == pytest.approx(model.solve().objective_value())
+
+
+def test_lp_reader_should_translate_bounds_into_constraints(tmp_path):
+    path = tmp_path / "bounds.lp"
+    path.write_text("\\ comment\n"
+                    "Minimize\n cost: 3x1 + 2 x2\n   - x3\n"
+                    "Subject To\n c1: x1 + x2 >= 2\n -x1+x2<=\n   -1\n c3: 2 x1 + x3 - 4 <= 0\n"
+                    "Bounds\n x3 <= 5\n 1 <= x2 <= 8\n 0 <= x1 <= 3\n"
+                    "End\n")
+    got = read_lp(str(path))
+
+    assert got.variables == ["x1", "x2", "x3"]
+    assert got.constraints == ["c1", "R1", "c3", "x3_ub", "x2_lb", "x2_ub", "x1_ub"]
+    assert list(got.rhs) == [2, -1, 4, 5, 1, 8, 3]
+    assert [ConstraintType(s) for s in got.senses[:3]] == [ConstraintType.GE, ConstraintType.LE, ConstraintType.LE]
+    assert got.to_model().solve().objective_value() == pytest.approx(8.0)
+
+
+def test_lp_reader_should_read_a_long_constraint_in_linear_time(tmp_path):
+    n = 40_000
+    path = tmp_path / "long.lp"
+    lines = [" ".join(f"+ {i % 7 + 1} x{i}" for i in range(k, k + 8)) for k in range(0, n, 8)]
+    path.write_text("Maximize\n obj: x0\nSubject To\n c0: " + "\n ".join(lines) + " <= 10\n c1: x1 <= 1\nEnd\n")
+
+    start = time.perf_counter()
+    got = read_lp(str(path))
+    assert time.perf_counter() - start < 2.0
+
+    assert got.constraints == ["c0", "c1"]
+    assert list(got.indptr) == [0, n, n + 1]
+    assert list(got.data[:n]) == [i % 7 + 1 for i in range(n)]
+
+
+def test_lp_reader_should_report_the_line_of_the_broken_constraint(tmp_path):
+    path = tmp_path / "broken.lp"
+    path.write_text("Maximize\n obj: x + y\nSubject To\n c1: x +\n y <= 4 c2: 2 3\n >= 1\nEnd\n")
+    with pytest.raises(ModelFormatError) as error:
+        read_lp(str(path))
+    assert error.value.line == 5
+
+
+@pytest.mark.parametrize("content", [
+    "NAME test\nROWS\n N obj\n L c0\nCOLUMNS\n    x obj 1 c0 1\nRHS\n    RHS c0 1\nBOUNDS\n FR BND x\nENDATA\n",
+    "NAME test\nROWS\n N obj\n L c0\nCOLUMNS\n    x obj 1 c0 1\nRANGES\n    RNG c0 4\nENDATA\n",
+    "NAME test\nROWS\n N obj\nCOLUMNS\n    x obj 1 c0 1\nENDATA\n"])
+def test_mps_reader_should_reject_unsupported_files(tmp_path, content):
+    path = tmp_path / "unsupported.mps"
+    path.write_text(content)
+    with pytest.raises(ModelFormatError):
+        read_mps(str(path))
+
+
+def test_model_snapshot_should_be_loaded_back_unchanged(tmp_path):
+    model = _test_model()
+    path = str(tmp_path / "test.saport")
+    model.save(path)
+    got = Model.load(path)
+
+    assert type(got) is Model and got.name == model.name
+    assert [v.name for v in got.variables] == [v.name for v in model.variables]
+    assert got.objective.is_equivalent(model.objective, model)
+    for (c1, c2) in zip(got.constraints, model.constraints):
+        assert c1.is_equivalent(c2, model), f"constraint changed after loading:\n- got: {c1}\n- expected: {c2}"
+
+
+@pytest.mark.parametrize("model_type", [IntegerModel, BooleanModel])
+def test_integer_snapshot_should_be_loaded_as_the_same_model_type(tmp_path, model_type):
+    model = model_type("knapsack")
+    x, y, z = [model.create_variable(name) for name in ["x", "y", "z"]]
+    model.add_constraint(2 * x + 3 * y + 4 * z <= 5)
+    model.add_constraint(x <= 1)
+    model.maximize(3 * x + 4 * y + 5 * z)
+    path = str(tmp_path / "knapsack.saport")
+    model.save(path)
+    got = model_type.load(path)
+
+    assert type(got) is model_type
+    assert LinearRelaxationSolver().solve(got, 30).objective_value() == pytest.approx(7.0)
+
+
+def test_memory_mapped_snapshot_should_share_the_file(tmp_path):
+    path = str(tmp_path / "test.saport")
+    MatrixModel.from_model(_test_model()).save(path)
+    got = MatrixModel.load(path, mmap=True)
+
+    for array in [got.indptr, got.indices, got.data, got.rhs, got.senses, got.objective]:
+        assert isinstance(array, np.memmap) and not array.flags.writeable
+    copied = MatrixModel.load(path, mmap=False)
+    assert not any(isinstance(a, np.memmap) for a in [copied.indptr, copied.indices, copied.data, copied.rhs])
+    assert np.array_equal(got.dense(), MatrixModel.from_model(_test_model()).dense())
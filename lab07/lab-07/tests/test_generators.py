@@ -0,0 +1,41 @@
+import json
+import pytest
+from saport.simplex import generators
+from simplex_benchmark import SimplexBenchmark
+
+
+@pytest.mark.parametrize("generator, expected", [
+    (lambda seed: generators.dense_lp(8, 5, seed), "optimal"),
+    (lambda seed: generators.transportation_lp(3, 4, seed), "optimal"),
+    (lambda seed: generators.assignment_lp(4, seed), "optimal"),
+    (lambda seed: generators.degenerate_lp(8, 5, seed), "optimal"),
+    (lambda seed: generators.infeasible_lp(8, 5, seed), "infeasible"),
+    (lambda seed: generators.unbounded_lp(8, 5, seed), "unbounded"),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_generated_models_should_have_expected_status(generator, expected, seed):
+    solution = generator(seed).solve()
+    status = "infeasible" if not solution.is_feasible else "unbounded" if not solution.is_bounded else "optimal"
+    assert status == expected
+
+
+def test_generators_should_be_deterministic():
+    assert str(generators.transportation_lp(3, 4, 7)) == str(generators.transportation_lp(3, 4, 7))
+    assert str(generators.dense_lp(5, 5, 1)) != str(generators.dense_lp(5, 5, 2))
+
+
+def test_assignment_lp_should_have_integral_optimum():
+    assignment = generators.assignment_lp(5, 3).solve().assignment()
+    assert sorted(round(v, 9) for v in assignment) == [0.0] * 20 + [1.0] * 5
+
+
+def test_benchmark_should_save_results_and_scaling(tmp_path):
+    output = tmp_path / "benchmark.json"
+    benchmark = SimplexBenchmark([4, 8], generators={"dense": lambda size, seed: generators.dense_lp(size, size, seed)},
+                                 print_function=lambda *args, **kwargs: None)
+    benchmark.run(str(output))
+    report = json.loads(output.read_text())
+
+    assert len(report["results"]) == 2 * len(benchmark.configurations)
+    assert all(r["status"] == "optimal" and r["iterations"] > 0 and r["peak_memory"] > 0 for r in report["results"])
+    assert all(s["time_exponent"] is not None for s in report["scaling"])
@@ -0,0 +1,105 @@
+import math
+import numpy as np
+import pytest
+from saport.integer.heuristics import (CoefficientDiving, FeasibilityPump, FractionalDiving, RandomizedRounding,
+                                       SimpleRounding, default_heuristics, locks)
+from saport.integer.nodes import DepthFirstSelection, Node
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.integer.solvers.parallel_linear_relaxation import ParallelLinearRelaxationSolver
+from saport.simplex.cancellation import CancellationToken
+from saport.simplex.expressions.expression import Expression
+from saport.simplex import matrix as ssmat
+from helpers import brute_force, knapsack_model, random_model
+
+
+def _root(model, heuristic):
+    solver = LinearRelaxationSolver(heuristics=[heuristic])
+    solver.model = model
+    solver.timelimit = 30
+    solver.token = CancellationToken()
+    solver.start_timer()
+    solver._start_search()
+    root = Node(math.inf, math.inf)
+    return (solver, root, solver._relaxation(root))
+
+
+def _is_feasible(model, assignment):
+    return all(float(v).is_integer() and v >= 0 for v in assignment) and \
+        all(c.type.value * (c.expression.evaluate(assignment) - c.bound) >= -1e-9 for c in model.constraints)
+
+
+@pytest.mark.parametrize(
+    "heuristic", [SimpleRounding(),
+                  RandomizedRounding(),
+                  FractionalDiving(),
+                  CoefficientDiving(),
+                  FeasibilityPump()],
+    ids=lambda h: h.name)
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("minimize", [False, True])
+def test_heuristic_solutions_should_be_feasible_and_beat_the_cutoff(heuristic, seed, minimize):
+    model = random_model(seed, minimize=minimize, packing=True)
+    solver, root, solution = _root(model, heuristic)
+    found = heuristic.run(solver, root, solution, -math.inf)
+    if found is None:
+        return
+    assert _is_feasible(model, found)
+    objective = model.objective.evaluate(found)
+    assert solver._sense * objective <= solver._sense * solution.objective_value() + 1e-9
+    better = heuristic.run(solver, root, solution, solver._sense * objective)
+    assert better is None or solver._sense * model.objective.evaluate(better) > solver._sense * objective
+
+
+def test_diving_should_find_a_solution_on_the_knapsack():
+    model = knapsack_model("ks_19_0", boolean=True)
+    for heuristic in [FractionalDiving(), CoefficientDiving()]:
+        solver, root, solution = _root(model, heuristic)
+        found = heuristic.run(solver, root, solution, -math.inf)
+        assert found is not None
+        assert all(v in (0, 1) for v in found)
+        assert _is_feasible(model, found)
+
+
+def test_locks_should_count_the_rows_limiting_the_direction():
+    model = random_model(0, variables_n=4, minimize=True, packing=True)
+    x = model.variables
+    model.add_constraint(Expression.from_vectors([x[0], x[1]], [1.0, -1.0]) == 0)
+    down, up = locks(ssmat.MatrixModel.from_model(model))
+    # 3 knapsack rows and the upper bound limit the increase, the cover row the decrease, the equality both
+    assert list(down[:2]) == [2, 2]
+    assert list(up[:2]) == [5, 5]
+    assert list(down[2:]) == [1, 1, 1][:len(down) - 2]
+    assert list(up[2:]) == [4, 4, 4][:len(up) - 2]
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("minimize", [False, True])
+def test_heuristics_should_not_change_the_optimum(seed, minimize):
+    model = random_model(seed, minimize=minimize, packing=True)
+    solver = LinearRelaxationSolver(DepthFirstSelection(), heuristics=default_heuristics(seed))
+    solver.heuristic_frequency = 2
+    solution = solver.solve(model, 30)
+    assert solution.is_optimal
+    assert solution.objective_value() == pytest.approx(brute_force(model))
+    assert solver.incumbents[-1].objective == pytest.approx(solution.objective_value())
+    assert sum(s.incumbents for s in solver.heuristic_statistics.values()) == \
+        len([r for r in solver.incumbents if r.source != "branching"])
+
+
+def test_heuristic_statistics_should_credit_the_incumbent():
+    model = knapsack_model("ks_19_0", boolean=True)
+    solver = LinearRelaxationSolver(DepthFirstSelection(), heuristics=[CoefficientDiving()])
+    solver.solve(model, 60)
+    statistics = solver.heuristic_statistics["coefficient diving"]
+    assert solver.incumbents[0].source == "coefficient diving"
+    assert solver.incumbents[0].node == 1
+    assert statistics.calls > 0 and statistics.incumbents > 0 and statistics.pruned > 0
+    assert statistics.solutions >= statistics.incumbents
+
+
+def test_parallel_solver_should_run_the_heuristics():
+    model = random_model(3, minimize=False, packing=True)
+    solver = ParallelLinearRelaxationSolver(2, deterministic=True, heuristics=default_heuristics())
+    solution = solver.solve(model, 60)
+    assert solution.objective_value() == pytest.approx(brute_force(model))
+    assert solver.heuristic_statistics["simple rounding"].calls > 0
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+import sys
+from copy import deepcopy
+from saport.integer.model import BooleanModel
+from saport.integer.solvers.implicit_enumeration import ImplicitEnumerationSolver, _Slacks
+from saport.simplex.expressions.expression import Expression
+from helpers import brute_force, random_model
+
+
+def _enum_solver(model):
+    solver = ImplicitEnumerationSolver()
+    solver._enum_model = solver._preprocess_model(deepcopy(model))
+    return solver
+
+
+def _infeasibility(model, assignment):
+    return sum(max(c.expression.evaluate(assignment) - c.bound, 0.0) for c in model.constraints)
+
+
+def _is_satisfiable(model, partial_assignment):
+    # the free variables with the negative coefficients are set to 1, the rest to 0
+    for constraint in model.constraints:
+        optimistic = [0] * len(model.variables)
+        for atom in constraint.expression.atoms:
+            optimistic[atom.var.index] = partial_assignment.get(atom.var.index, int(atom.coefficient < 0))
+        if constraint.expression.evaluate(optimistic) > constraint.bound:
+            return False
+    return True
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_slacks_should_match_the_partial_assignment(seed):
+    model = random_model(2 * seed, True, variables_n=6)
+    enum_model = _enum_solver(model)._enum_model
+    n = len(enum_model.variables)
+    slacks = _Slacks(enum_model)
+    rng = np.random.default_rng(seed)
+    partial_assignment = dict()
+    for _ in range(30):
+        j = int(rng.integers(n))
+        if j in partial_assignment:
+            partial_assignment.pop(j)
+            slacks.release(j)
+        else:
+            partial_assignment[j] = int(rng.integers(2))
+            slacks.fix(j, partial_assignment[j])
+
+        assignment = [partial_assignment.get(j, 0) for j in range(n)]
+        assert slacks.assignment() == assignment
+        assert slacks.objective == pytest.approx(enum_model.objective.evaluate(assignment))
+        assert slacks.is_satisfiable() == _is_satisfiable(enum_model, partial_assignment)
+        assert slacks.infeasibility() == pytest.approx(_infeasibility(enum_model, assignment))
+        free = [j for j in range(n) if j not in partial_assignment]
+        if len(free) > 0:
+            # the least infeasibility when set to 1, the smallest index on a tie
+            set_to_one = {j: assignment[:j] + [1] + assignment[j + 1:] for j in free}
+            expected = min(free, key=lambda j: (_infeasibility(enum_model, set_to_one[j]), j))
+            assert slacks.branching_variable() == expected
+
+
+@pytest.mark.parametrize("seed", range(0, 40, 2))
+def test_implicit_enumeration_should_find_the_optimum(seed):
+    model = random_model(seed, True, variables_n=7)
+    expected = brute_force(model, 1)
+    solution = ImplicitEnumerationSolver().solve(model, 30)
+    if expected is None:
+        assert not solution.has_assignment()
+    else:
+        assert solution.objective_value() == pytest.approx(expected)
+
+
+def test_implicit_enumeration_should_search_deeper_than_the_recursion_limit():
+    n = sys.getrecursionlimit() // 2 + 100
+    model = BooleanModel("chain")
+    x = [model.create_variable(f"x{i}") for i in range(n)]
+    model.add_constraint(Expression.from_vectors(x[:1], [1.0]) >= 1)
+    # x_i <= x_{i + 1}, so the only solution sets all the variables, one level of the tree at a time
+    for i in range(n - 1):
+        model.add_constraint(Expression.from_vectors(x[i:i + 2], [1.0, -1.0]) <= 0)
+    model.minimize(Expression.from_vectors(x, [1.0] * n))
+    solution = ImplicitEnumerationSolver().solve(model, 60)
+    assert solution.is_optimal
+    assert solution.assignment == [1] * n
+
+
+@pytest.mark.parametrize("values, weights, capacity, expected, nodes", [
+    ([5.0, 6.0, 3.0], [4.0, 5.0, 2.0], 9, [1, 1, 0], 7),
+    ([16.0, 19.0, 23.0, 28.0], [2.0, 3.0, 4.0, 5.0], 7, [1, 0, 0, 1], 13),
+    ([8.0, 10.0, 15.0, 4.0], [4.0, 5.0, 8.0, 3.0], 11, [0, 0, 1, 1], 13)])
+def test_implicit_enumeration_should_prune_the_tree(values, weights, capacity, expected, nodes):
+    model = BooleanModel("knapsack")
+    x = [model.create_variable(f"x{i}") for i in range(len(values))]
+    model.add_constraint(Expression.from_vectors(x, weights) <= capacity)
+    model.maximize(Expression.from_vectors(x, values))
+    solver = ImplicitEnumerationSolver()
+    solver.leaf_size = 0
+    solution = solver.solve(model, 30)
+    assert solution.assignment == expected
+    assert 0 < solver.nodes <= nodes < 2 ** (len(values) + 1) - 1
+
+
+@pytest.mark.parametrize("seed", range(0, 20, 2))
+def test_leaf_enumeration_should_match_the_search(seed):
+    model = random_model(seed, True, variables_n=10)
+    expected = brute_force(model, 1)
+    for (leaf_size, leaf_chunk) in [(0, 1 << 20), (4, 1 << 20), (10, 1 << 20), (10, 7)]:
+        solver = ImplicitEnumerationSolver()
+        solver.leaf_size, solver.leaf_chunk = leaf_size, leaf_chunk
+        solution = solver.solve(model, 30)
+        if expected is None:
+            assert not solution.has_assignment()
+        else:
+            assert solution.objective_value() == pytest.approx(expected)
+        assert leaf_size > 0 or solver.leaf_enumerations == 0
+
+
+def test_leaf_enumeration_should_replace_the_bottom_of_the_tree():
+    model = BooleanModel("knapsack")
+    x = [model.create_variable(f"x{i}") for i in range(8)]
+    model.add_constraint(Expression.from_vectors(x, [4.0, 5.0, 8.0, 3.0, 6.0, 7.0, 2.0, 9.0]) <= 20)
+    model.maximize(Expression.from_vectors(x, [8.0, 10.0, 15.0, 4.0, 11.0, 12.0, 3.0, 16.0]))
+    solver = ImplicitEnumerationSolver()
+    solver.leaf_size = 8
+    solution = solver.solve(model, 30)
+    assert solver.leaf_enumerations == 1 and solver.nodes == 1
+    assert solution.objective_value() == brute_force(model, 1)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from saport.simplex.exceptions import MissingObjectiveError
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.expressions.objective import Objective, ObjectiveType
+from saport.simplex.model import Model
+from saport.simplex.solver import Solver
+
+
+def _production_model():
+    model = Model("production")
+    x, y, z = model.create_variable("x"), model.create_variable("y"), model.create_variable("z")
+    model.add_constraint(x + y + z <= 10)
+    model.add_constraint(x + 2 * y <= 12)
+    model.add_constraint(x + z >= 2)
+    return model, (x, y, z)
+
+
+def _sequential_optimum(model, objectives):
+    # the manual approach: fixing the previous optima with the additional constraints
+    values = []
+    for objective in objectives:
+        model.objective = objective
+        value = model.solve().objective_value()
+        values.append(value)
+        if objective.type == ObjectiveType.MAX:
+            model.add_constraint(objective.expression >= value - 1e-9)
+        else:
+            model.add_constraint(objective.expression <= value + 1e-9)
+    return values
+
+
+def test_lexicographic_solve_should_optimize_objectives_in_priority_order():
+    model, (x, y, z) = _production_model()
+    objectives = [Objective(x + y + z, ObjectiveType.MAX),
+                  Objective(1 * y, ObjectiveType.MAX),
+                  Objective(1 * x, ObjectiveType.MIN)]
+    solutions = model.solve_lexicographic(objectives)
+
+    assert [s.objective_value() for s in solutions] == pytest.approx([10.0, 6.0, 0.0])
+    assert solutions[-1].assignment() == pytest.approx([0.0, 6.0, 4.0])
+    assert [s.model.objective for s in solutions] == objectives
+    assert model.constraints[0].expression.evaluate(solutions[-1].assignment()) <= 10 + 1e-9
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lexicographic_solve_should_match_sequential_solves(seed):
+    rng = np.random.default_rng(seed)
+    model = Model("random")
+    vars = [model.create_variable(f"x{i}") for i in range(6)]
+    for _ in range(5):
+        model.add_constraint(
+            Expression.from_vectors(vars, list(rng.integers(1, 5, 6).astype(float))) <= float(rng.integers(10, 20)))
+    # a degenerate first objective, so the later stages have something to choose from
+    objectives = [Objective(Expression.from_vectors(vars, [1.0] * 6), ObjectiveType.MAX)] + \
+                 [Objective(Expression.from_vectors(vars, list(rng.integers(-3, 4, 6).astype(float))), ObjectiveType(t))
+                  for t in [1, -1, 1]]
+
+    solutions = model.solve_lexicographic(objectives)
+    assignment = solutions[-1].assignment()
+
+    assert [s.objective_value() for s in solutions] == pytest.approx(_sequential_optimum(model, objectives))
+    assert [o.evaluate(assignment) for o in objectives] == pytest.approx([s.objective_value() for s in solutions])
+
+
+def test_lexicographic_solve_should_stop_at_unbounded_stage():
+    model = Model("unbounded")
+    x, y = model.create_variable("x"), model.create_variable("y")
+    model.add_constraint(x <= 4)
+    solutions = Solver().solve_lexicographic(model, [Objective(1 * x, ObjectiveType.MAX),
+                                                     Objective(1 * y, ObjectiveType.MAX),
+                                                     Objective(1 * x, ObjectiveType.MIN)])
+    assert len(solutions) == 2 and solutions[0].objective_value() == pytest.approx(4.0) and not solutions[1].is_bounded
+
+
+def test_lexicographic_solve_should_require_objectives():
+    model, _ = _production_model()
+    with pytest.raises(MissingObjectiveError):
+        model.solve_lexicographic([])
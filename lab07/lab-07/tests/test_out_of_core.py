@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from saport.simplex import generators
+from saport.simplex.model import Model
+from saport.simplex.solver import Solver
+
+
+def _two_phase_model():
+    model = Model("two phase")
+    x, y, z = model.create_variable("x"), model.create_variable("y"), model.create_variable("z")
+    model.add_constraint(x + 2 * y + z <= 10)
+    model.add_constraint(3 * x + y >= 3)
+    model.add_constraint(x + y + z == 6)
+    model.add_constraint(y - z >= -2)
+    model.minimize(2 * x + 3 * y + z)
+    return model
+
+
+@pytest.mark.parametrize(
+    "builder", [_two_phase_model, lambda: generators.dense_lp(40, 15, 1), lambda: generators.dense_lp(40, 15, 2)])
+@pytest.mark.parametrize("block_rows", [1, 3, 1024])
+def test_out_of_core_solve_should_match_in_memory_solve(builder, block_rows, tmp_path):
+    expected = Solver().solve(builder())
+    solution = Solver(out_of_core=True, memmap_dir=str(tmp_path), block_rows=block_rows).solve(builder())
+
+    assert isinstance(solution.tableau.table, np.memmap)
+    assert solution.objective_value() == pytest.approx(expected.objective_value())
+    assert solution.assignment() == pytest.approx(expected.assignment())
+
+
+def test_out_of_core_solve_should_detect_infeasibility_and_unboundedness():
+    infeasible = Model("infeasible")
+    x = infeasible.create_variable("x")
+    infeasible.add_constraint(x <= 1)
+    infeasible.add_constraint(x >= 2)
+    infeasible.maximize(x)
+    assert not Solver(out_of_core=True).solve(infeasible).is_feasible
+
+    unbounded = Model("unbounded")
+    x, y = unbounded.create_variable("x"), unbounded.create_variable("y")
+    unbounded.add_constraint(x - y <= 1)
+    unbounded.maximize(x + y)
+    assert not Solver(out_of_core=True).solve(unbounded).is_bounded
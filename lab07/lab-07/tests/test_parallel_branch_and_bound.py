@@ -0,0 +1,77 @@
+import math
+import multiprocessing
+import pytest
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.integer.solvers.parallel_linear_relaxation import ParallelLinearRelaxationSolver
+from helpers import knapsack_model, random_model
+
+
+@pytest.mark.parametrize("deterministic", [False, True])
+@pytest.mark.parametrize("name", ["ks_4_0", "ks_lecture_dp_1", "ks_lecture_dp_2"])
+def test_parallel_search_should_find_the_knapsack_optimum(name, deterministic):
+    model = knapsack_model(name)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+
+    solver = ParallelLinearRelaxationSolver(2, deterministic)
+    solution = solver.solve(model, 30)
+    assert solution.is_optimal
+    assert solution.objective_value() == pytest.approx(expected)
+    assert solver.gap() == pytest.approx(0.0, abs=1e-9)
+
+
+@pytest.mark.parametrize("minimize", [False, True])
+def test_parallel_search_should_match_the_sequential_one(minimize):
+    model = random_model(5, variables_n=6, upper=5, minimize=minimize, packing=True)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+    assert ParallelLinearRelaxationSolver(3).solve(model, 30).objective_value() == pytest.approx(expected)
+
+
+def test_deterministic_search_should_be_reproducible():
+    model = random_model(3, variables_n=6, upper=5, minimize=True, packing=True)
+    runs = []
+    for _ in range(2):
+        solver = ParallelLinearRelaxationSolver(3, deterministic=True)
+        solution = solver.solve(model, 30)
+        runs.append((solution.assignment, solver.nodes, solver.lp_pivots))
+    assert runs[0] == runs[1]
+
+
+def test_interrupted_parallel_search_should_keep_valid_bounds():
+    model = random_model(7, variables_n=6, upper=5, minimize=False, packing=True)
+    optimum = LinearRelaxationSolver().solve(model, 30).objective_value()
+
+    solver = ParallelLinearRelaxationSolver(2)
+    solver.solve(model, -1)
+    assert solver.interrupted
+    assert solver.upper_bound() >= optimum - 1e-9 and solver.gap() == math.inf
+
+
+def test_parallel_search_should_propagate_the_node_bounds():
+    model = random_model(5, variables_n=6, upper=5, minimize=False, packing=True)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+    solver = ParallelLinearRelaxationSolver(2, deterministic=True, propagation=True)
+    assert solver.solve(model, 30).objective_value() == pytest.approx(expected)
+
+
+def test_main_process_should_not_lower_the_shared_incumbent():
+    model = knapsack_model("ks_4_0")
+    solver = ParallelLinearRelaxationSolver(2)
+    solution = solver.solve(model, 30)
+    shared = multiprocessing.Value('d', solution.objective_value() + 5)
+    solver._publish(shared)
+    assert shared.value == solution.objective_value() + 5
+    shared.value = -math.inf
+    solver._publish(shared)
+    assert shared.value == solution.objective_value()
+
+
+@pytest.mark.parametrize("timelimit", [0.2, 0.5])
+def test_timed_out_parallel_search_should_apply_the_started_nodes(timelimit):
+    model = knapsack_model("ks_19_0")
+    optimum = LinearRelaxationSolver().solve(model, 30).objective_value()
+    solver = ParallelLinearRelaxationSolver(2)
+    solution = solver.solve(model, timelimit)
+    assert solver.upper_bound() >= optimum - 1e-9
+    assert not solution.has_assignment() or solution.objective_value() <= optimum + 1e-9
+    # every open node has been either processed or returned to the frontier
+    assert solver._active == [] and (solver.interrupted or solver.gap() == pytest.approx(0.0, abs=1e-9))
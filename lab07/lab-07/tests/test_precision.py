@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from saport.simplex import generators
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.solver import Solver
+
+
+def _dense_model(seed, constraints_n=30, variables_n=20):
+    # a covering row forces the first phase
+    model = generators.dense_lp(constraints_n, variables_n, seed)
+    model.add_constraint(Expression.from_vectors(model.variables, [1.0] * variables_n) >= 1)
+    return model
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("out_of_core", [False, True])
+def test_float32_solve_should_be_refined_to_float64_optimum(seed, out_of_core):
+    expected = Solver().solve(_dense_model(seed))
+    solver = Solver(dtype=np.float32, out_of_core=out_of_core)
+    solution = solver.solve(_dense_model(seed))
+
+    assert solution.tableau.table.dtype == np.float64
+    assert solution.objective_value() == pytest.approx(expected.objective_value(), rel=1e-12)
+    assert solution.assignment() == pytest.approx(expected.assignment(), abs=1e-9)
+    assert solver.refinement_pivots < solver.pivots
+
+
+def test_pivot_should_update_table_in_place():
+    solver = Solver(dtype=np.float32)
+    tableau = solver._basic_initial_tableau(solver._augment_model(_dense_model(0, 5, 3)))
+    table = tableau.table
+    tableau.pivot(2, 1)
+
+    assert tableau.table is table and table.dtype == np.float32
+    assert list(table[:, 1]) == [0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0]
@@ -0,0 +1,113 @@
+import itertools
+import pytest
+from saport.integer.model import BooleanModel, Model
+from saport.integer.presolve import Presolve
+from saport.integer.solution import Solution
+from saport.integer.solvers.implicit_enumeration import ImplicitEnumerationSolver
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.simplex.expressions.constraint import ConstraintType
+from saport.simplex.expressions.expression import Expression
+from helpers import best_assignment, brute_force, is_satisfied, random_model
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_presolve_should_keep_the_optimum(seed):
+    boolean = seed % 2 == 0
+    upper = 1 if boolean else 3
+    model = random_model(seed, boolean)
+    expected = brute_force(model, upper)
+    presolved = Presolve(model)
+    if presolved.is_infeasible:
+        assert expected is None
+    elif len(presolved.model.variables) == 0:
+        assert presolved.fixed_solution().objective_value() == expected
+    else:
+        best = best_assignment(presolved.model, upper)
+        if expected is None:
+            assert best is None
+        else:
+            solution = presolved.postsolve(Solution.with_assignment(presolved.model, best, True))
+            assert all(is_satisfied(c, solution.assignment) for c in model.constraints)
+            assert solution.objective_value() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_solvers_should_map_the_presolved_solution_back(seed):
+    boolean = seed % 2 == 0
+    model = random_model(seed, boolean)
+    expected = brute_force(model, 1 if boolean else 3)
+    solvers = [LinearRelaxationSolver(presolve=True)] + ([ImplicitEnumerationSolver(presolve=True)] if boolean else [])
+    for solver in solvers:
+        solution = solver.solve(model, 30)
+        assert solver.presolve_statistics is not None
+        if expected is None:
+            assert not solution.has_assignment()
+            continue
+        assert solution.model is model
+        assert len(solution.assignment) == len(model.variables)
+        assert all(is_satisfied(c, solution.assignment) for c in model.constraints)
+        assert solution.objective_value() == pytest.approx(expected)
+
+
+def test_presolve_should_fix_the_variables_exceeding_the_row():
+    model = BooleanModel("fixing")
+    x = [model.create_variable(f"x{i}") for i in range(3)]
+    model.add_constraint(Expression.from_vectors(x, [5.0, 1.0, 2.0]) <= 3)
+    model.add_constraint(Expression.from_vectors(x, [1.0, 1.0, 1.0]) <= 5)
+    model.maximize(Expression.from_vectors(x, [10.0, 1.0, 1.0]))
+    presolved = Presolve(model)
+    # x0 is fixed to 0, the rows become redundant and x1, x2 are left free
+    assert [v.name for v in presolved.model.variables] == ["x1", "x2"]
+    assert len(presolved.model.constraints) == 0
+    assert presolved.statistics.fixed_variables == 1
+    assert presolved.statistics.removed_rows == 2
+
+
+def test_presolve_should_tighten_the_bounds_and_the_coefficients():
+    model = Model("bounds")
+    x = [model.create_variable(f"x{i}") for i in range(2)]
+    model.add_constraint(Expression.from_vectors(x, [3.0, 2.0]) <= 10)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0]))
+    presolved = Presolve(model)
+    bounds = {(tuple(c.expression.coefficients(presolved.model)), c.type, c.bound) for c in presolved.model.constraints}
+    assert ((1.0, 0.0), ConstraintType.LE, 3) in bounds
+    assert ((0.0, 1.0), ConstraintType.LE, 5) in bounds
+
+    boolean = BooleanModel("coefficients")
+    y = [boolean.create_variable(f"y{i}") for i in range(3)]
+    boolean.add_constraint(Expression.from_vectors(y, [4.0, 5.0, 2.0]) <= 9)
+    boolean.maximize(Expression.from_vectors(y, [5.0, 6.0, 3.0]))
+    presolved = Presolve(boolean)
+    assert presolved.statistics.tightened_coefficients > 0
+    row = presolved.model.constraints[0]
+    # any two items fit, so the row becomes 2 * (y0 + y1 + y2) <= 4
+    assert row.expression.coefficients(presolved.model) == [2.0, 2.0, 2.0]
+    assert row.bound == 4
+    # the tightened row has the same boolean solutions
+    for assignment in itertools.product([0, 1], repeat=3):
+        assert is_satisfied(row, list(assignment)) == is_satisfied(boolean.constraints[0], list(assignment))
+
+
+def test_presolve_should_remove_the_parallel_rows():
+    model = Model("parallel")
+    x = [model.create_variable(f"x{i}") for i in range(3)]
+    model.add_constraint(Expression.from_vectors(x, [2.0, 3.0, 4.0]) <= 13)
+    model.add_constraint(Expression.from_vectors(x, [4.0, 6.0, 8.0]) <= 25)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0, 1.0]))
+    presolved = Presolve(model)
+    rows = [c for c in presolved.model.constraints if len(c.expression.atoms) > 1]
+    assert presolved.statistics.parallel_rows == 1
+    assert len(rows) == 1
+    # the second row is tighter: 2 * x0 + 3 * x1 + 4 * x2 <= 12.5
+    assert rows[0].bound == 25
+
+
+def test_presolve_should_detect_the_infeasibility():
+    model = BooleanModel("infeasible")
+    x = [model.create_variable(f"x{i}") for i in range(2)]
+    model.add_constraint(Expression.from_vectors(x, [1.0, 1.0]) >= 3)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0]))
+    solver = LinearRelaxationSolver(presolve=True)
+    solution = solver.solve(model, 30)
+    assert Presolve(model).is_infeasible
+    assert not solution.is_feasible
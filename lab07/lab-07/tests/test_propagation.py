@@ -0,0 +1,116 @@
+import math
+import pytest
+from saport.integer.model import BooleanModel, Model
+from saport.integer.propagation import Propagator
+from saport.integer.solvers.implicit_enumeration import ImplicitEnumerationSolver
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.matrix import MatrixModel
+from helpers import brute_force, is_satisfied, random_model
+
+
+def _propagator(model, upper):
+    n = len(model.variables)
+    return Propagator(MatrixModel.from_model(model), [0] * n, [upper] * n)
+
+
+def test_propagator_should_fix_the_implied_variables():
+    model = BooleanModel("implied")
+    x = [model.create_variable(f"x{i}") for i in range(3)]
+    model.add_constraint(Expression.from_vectors(x, [5.0, 4.0, 2.0]) <= 6)
+    model.add_constraint(Expression.from_vectors(x, [1.0, 1.0, 1.0]) >= 1)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0, 1.0]))
+    propagator = _propagator(model, 1)
+    assert propagator.propagate()
+    assert propagator.changes(0) == []
+
+    mark = propagator.mark()
+    assert propagator.fix(0, 1) and propagator.propagate()
+    # x0 leaves no room for x1 nor x2
+    assert propagator.upper == [1, 0, 0]
+    assert propagator.tightenings == 2
+
+    propagator.undo(mark)
+    assert propagator.lower == [0, 0, 0] and propagator.upper == [1, 1, 1]
+    assert propagator.fix(0, 0) and propagator.fix(1, 0) and propagator.propagate()
+    # the covering row forces the last one
+    assert propagator.lower == [0, 0, 1]
+
+
+def test_propagator_should_tighten_the_general_integer_bounds():
+    model = Model("bounds")
+    x = [model.create_variable(f"x{i}") for i in range(2)]
+    model.add_constraint(Expression.from_vectors(x, [3.0, 2.0]) <= 10)
+    model.add_constraint(Expression.from_vectors(x, [1.0, -1.0]) >= 1)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0]))
+    propagator = _propagator(model, math.inf)
+    assert propagator.propagate()
+    assert propagator.lower == [1, 0]
+    assert propagator.upper == [3, 2]
+    mark = propagator.mark()
+    assert propagator.set_lower(1, 1) and propagator.propagate()
+    assert propagator.lower == [2, 1] and propagator.upper == [2, 1]
+    propagator.undo(mark)
+    assert propagator.lower == [1, 0] and propagator.upper == [3, 2]
+
+
+def test_propagator_should_detect_the_conflicts():
+    model = BooleanModel("conflict")
+    x = [model.create_variable(f"x{i}") for i in range(3)]
+    model.add_constraint(Expression.from_vectors(x, [1.0, 1.0, 1.0]) == 2)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0, 1.0]))
+    propagator = _propagator(model, 1)
+    assert propagator.propagate()
+    mark = propagator.mark()
+    assert propagator.fix(0, 0) and propagator.propagate()
+    assert propagator.lower == [0, 1, 1]
+    propagator.undo(mark)
+    assert propagator.fix(0, 1) and propagator.fix(1, 1) and propagator.propagate()
+    assert propagator.upper == [1, 1, 0]
+    propagator.undo(mark)
+    # the last variable would have to be 2
+    assert propagator.fix(0, 0) and propagator.fix(1, 0)
+    assert not propagator.propagate()
+    assert propagator.conflicts == 1
+    propagator.undo(mark)
+    assert not propagator.fix(0, 2)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_solvers_with_propagation_should_keep_the_optimum(seed):
+    boolean = seed % 2 == 0
+    model = random_model(seed, boolean)
+    expected = brute_force(model, 1 if boolean else 3)
+    solvers = [LinearRelaxationSolver(propagation=True), LinearRelaxationSolver(warm_start=False, propagation=True)]
+    solvers += [ImplicitEnumerationSolver(), ImplicitEnumerationSolver(propagation=True)] if boolean else []
+    for solver in solvers:
+        solution = solver.solve(model, 30)
+        if expected is None:
+            assert not solution.has_assignment()
+            continue
+        assert all(is_satisfied(c, solution.assignment) for c in model.constraints)
+        assert solution.objective_value() == pytest.approx(expected)
+
+
+def test_propagation_should_prune_the_infeasible_nodes():
+    model = BooleanModel("pruning")
+    x = [model.create_variable(f"x{i}") for i in range(4)]
+    model.add_constraint(Expression.from_vectors(x, [2.0, 2.0, 2.0, 2.0]) == 3)
+    model.maximize(Expression.from_vectors(x, [1.0, 1.0, 1.0, 1.0]))
+    plain = LinearRelaxationSolver()
+    propagated = LinearRelaxationSolver(propagation=True)
+    assert not plain.solve(model, 30).has_assignment()
+    assert not propagated.solve(model, 30).has_assignment()
+    # fixing two of the variables decides the parity of the row
+    assert propagated.propagated_nodes > 0
+    assert propagated.nodes < plain.nodes
+
+    model = BooleanModel("knapsack")
+    x = [model.create_variable(f"x{i}") for i in range(4)]
+    model.add_constraint(Expression.from_vectors(x, [6.0, 5.0, 4.0, 3.0]) <= 9)
+    model.add_constraint(Expression.from_vectors(x[:2], [1.0, 1.0]) >= 1)
+    model.maximize(Expression.from_vectors(x, [7.0, 6.0, 5.0, 3.0]))
+    plain = LinearRelaxationSolver()
+    propagated = LinearRelaxationSolver(propagation=True)
+    assert plain.solve(model, 30).objective_value() == propagated.solve(model, 30).objective_value()
+    assert propagated.nodes <= plain.nodes
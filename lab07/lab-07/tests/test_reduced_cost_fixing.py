@@ -0,0 +1,88 @@
+import itertools
+import math
+import pytest
+from saport.integer.nodes import BoundChange, Node
+from saport.integer.solvers.linear_relaxation import LinearRelaxationSolver
+from saport.integer.solvers.parallel_linear_relaxation import ParallelLinearRelaxationSolver
+from saport.simplex.cancellation import CancellationToken
+from helpers import brute_force, is_satisfied, knapsack_model, random_model
+
+
+def test_children_should_inherit_the_fixings():
+    root = Node(math.inf, math.inf)
+    fixings = (BoundChange(2, True, 0), BoundChange(3, False, 1))
+    child = Node(10, 9, 1, BoundChange(0, True, 3), root, fixings)
+    leaf = Node(9, 8, 2, BoundChange(1, False, 1), child)
+    assert leaf.changes() == [
+        BoundChange(2, True, 0),
+        BoundChange(3, False, 1),
+        BoundChange(0, True, 3),
+        BoundChange(1, False, 1)
+    ]
+    assert leaf.bounds() == {0: (-math.inf, 3), 1: (1, math.inf), 2: (-math.inf, 0), 3: (1, math.inf)}
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_reduced_cost_bounds_should_keep_the_better_solutions(seed):
+    boolean = seed % 2 == 0
+    upper = 1 if boolean else 3
+    model = random_model(seed, boolean, variables_n=6)
+    expected = brute_force(model, upper)
+    solver = LinearRelaxationSolver()
+    solver.model = model
+    solver.token = CancellationToken()
+    solver._start_search()
+    root = Node(math.inf, math.inf)
+    solution = solver._relaxation(root, None)
+    if expected is None or not solution.is_feasible:
+        return
+    bound = solver._sense * solution.objective_value()
+    cutoff = solver._sense * expected - 0.5
+    fixings, _ = solver._reduced_cost_bounds(root, solution.tableau, bound - cutoff)
+    for assignment in itertools.product(range(upper + 1), repeat=len(model.variables)):
+        assignment = list(assignment)
+        if solver._sense * model.objective.evaluate(assignment) <= cutoff:
+            continue
+        if not all(is_satisfied(c, assignment) for c in model.constraints):
+            continue
+        for change in fixings:
+            value = assignment[change.variable]
+            assert value <= change.value if change.is_upper else value >= change.value
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_reduced_cost_fixing_should_keep_the_optimum(seed):
+    boolean = seed % 2 == 0
+    model = random_model(seed, boolean, variables_n=7)
+    expected = brute_force(model, 1 if boolean else 3)
+    solvers = [
+        LinearRelaxationSolver(reduced_cost_fixing=True),
+        LinearRelaxationSolver(warm_start=False, reduced_cost_fixing=True),
+        LinearRelaxationSolver(propagation=True, reduced_cost_fixing=True)
+    ]
+    for solver in solvers:
+        solution = solver.solve(model, 30)
+        if expected is None:
+            assert not solution.has_assignment()
+            continue
+        assert all(is_satisfied(c, solution.assignment) for c in model.constraints)
+        assert solution.objective_value() == pytest.approx(expected)
+
+
+def test_reduced_cost_fixing_should_avoid_branches():
+    model = knapsack_model("ks_4_0", boolean=True)
+    plain = LinearRelaxationSolver()
+    fixing = LinearRelaxationSolver(reduced_cost_fixing=True)
+    expected = plain.solve(model, 30).objective_value()
+    assert fixing.solve(model, 30).objective_value() == expected == brute_force(model, 1)
+    assert plain.reduced_cost_fixings == 0 and plain.avoided_branches == 0
+    assert fixing.reduced_cost_fixings > 0 and fixing.avoided_branches > 0
+    assert fixing.nodes < plain.nodes
+
+
+def test_parallel_search_should_fix_the_reduced_costs():
+    model = knapsack_model("ks_4_0", boolean=True)
+    expected = LinearRelaxationSolver().solve(model, 30).objective_value()
+    solver = ParallelLinearRelaxationSolver(2, deterministic=True, reduced_cost_fixing=True)
+    assert solver.solve(model, 30).objective_value() == pytest.approx(expected)
+    assert solver.avoided_branches > 0
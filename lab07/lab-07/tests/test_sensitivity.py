@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.model import Model
+
+
+def _wyndor_model(rhs=(4, 12, 18), costs=(3, 5)):
+    model = Model("wyndor")
+    x, y = model.create_variable("x"), model.create_variable("y")
+    model.add_constraint(1 * x <= rhs[0])
+    model.add_constraint(2 * y <= rhs[1])
+    model.add_constraint(3 * x + 2 * y <= rhs[2])
+    model.maximize(costs[0] * x + costs[1] * y)
+    return model
+
+
+def _diet_model(rhs=(8, 6, -2), costs=(2, 3, 4)):
+    # minimization with GE, EQ and negative bound constraints
+    model = Model("diet")
+    x, y, z = model.create_variable("x"), model.create_variable("y"), model.create_variable("z")
+    model.add_constraint(2 * x + y + z >= rhs[0])
+    model.add_constraint(x + 2 * y + 3 * z == rhs[1])
+    model.add_constraint(-1 * x + y <= rhs[2])
+    model.minimize(costs[0] * x + costs[1] * y + costs[2] * z)
+    return model
+
+
+def test_sensitivity_should_match_textbook_values():
+    solution = _wyndor_model().solve()
+
+    assert solution.duals() == pytest.approx([0.0, 1.5, 1.0])
+    assert solution.reduced_costs() == pytest.approx([0.0, 0.0])
+    rhs_ranges = [(r.lower, r.upper) for r in solution.rhs_ranges()]
+    assert rhs_ranges == pytest.approx([(2.0, np.inf), (6.0, 18.0), (12.0, 24.0)])
+    assert [(r.lower, r.upper) for r in solution.objective_ranges()] == pytest.approx([(0.0, 7.5), (2.0, np.inf)])
+
+
+@pytest.mark.parametrize("builder, rhs, costs", [(_wyndor_model, (4, 12, 18), (3, 5)),
+                                                 (_diet_model, (8, 6, -2), (2, 3, 4))])
+def test_duals_and_ranges_should_predict_resolves(builder, rhs, costs):
+    solution = builder(rhs, costs).solve()
+    value = solution.objective_value()
+
+    for (i, (dual, bound_range)) in enumerate(zip(solution.duals(), solution.rhs_ranges())):
+        for bound in [bound_range.lower, bound_range.upper]:
+            if not np.isfinite(bound):
+                continue
+            # anywhere within the range the objective changes linearly with the dual price
+            changed = list(rhs)
+            changed[i] = (bound + rhs[i]) / 2
+            resolved = builder(changed, costs).solve().objective_value()
+            assert resolved == pytest.approx(value + dual * (changed[i] - rhs[i]))
+
+    for (j, cost_range) in enumerate(solution.objective_ranges()):
+        for cost in [cost_range.lower, cost_range.upper]:
+            if not np.isfinite(cost):
+                continue
+            changed = list(costs)
+            changed[j] = (cost + costs[j]) / 2
+            assert builder(rhs, changed).solve().assignment() == pytest.approx(solution.assignment())
+
+
+def test_reduced_costs_should_be_nonzero_for_nonbasic_variables():
+    solution = _diet_model().solve()
+    reduced_costs = solution.reduced_costs()
+    assignment = solution.assignment()
+    assert all(abs(d) < 1e-9 for (d, v) in zip(reduced_costs, assignment) if v > 1e-9)
+    # minimization: raising the cost of a variable kept at zero never helps
+    assert all(d >= -1e-9 for d in reduced_costs)
+
+
+def test_sensitivity_should_be_unavailable_without_optimum():
+    model = Model("unbounded")
+    x = model.create_variable("x")
+    model.add_constraint(-1 * x <= 1)
+    model.maximize(1 * x)
+    solution = model.solve()
+    assert solution.duals() is None and solution.objective_ranges() is None
+
+
+def test_sensitivity_should_handle_redundant_constraints():
+    model = Model("redundant")
+    x, y = model.create_variable("x"), model.create_variable("y")
+    model.add_constraint(x + y == 2)
+    model.add_constraint(2 * x + 2 * y == 4)
+    model.add_constraint(1 * x <= 3)
+    model.maximize(x + 2 * y)
+    solution = model.solve()
+    assert solution.objective_value() == pytest.approx(4.0)
+
+    duals = solution.duals()
+    # one of the equalities is redundant, its dual price is zero and the other one carries the whole price
+    assert min(abs(duals[0]), abs(duals[1])) == pytest.approx(0.0)
+    assert duals[0] + 2 * duals[1] == pytest.approx(2.0)
+    assert duals[2] == pytest.approx(0.0)
+    redundant = 0 if abs(duals[0]) < 1e-9 else 1
+    bound_range = solution.rhs_ranges()[redundant]
+    assert bound_range.lower == pytest.approx(bound_range.value)
+    assert bound_range.upper == pytest.approx(bound_range.value)
+    assert [(r.lower, r.upper) for r in solution.objective_ranges()] == pytest.approx([(-np.inf, 2.0), (1.0, np.inf)])